@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Optional
 # from ..core.fault_tolerance import ResourceFailureHandler
-from ..models.node import NodeStatus, NodeResources
+from ..models.node import NodeResources
 from ..core.node_manager import NodeManager
+from ..core.heartbeat import HeartbeatReceiver
+from ..utils.redis_client import RedisClient
 from pydantic import BaseModel
+from ..utils.executors import run_blocking
 
 router = APIRouter()
 node_manager = NodeManager()
+redis_client = RedisClient.get_instance()
+# Heartbeats are written straight through unless a flush window is configured
+heartbeat_receiver = HeartbeatReceiver.get_instance()
+heartbeat_buffer = heartbeat_receiver.buffer
+heartbeat_schedule = heartbeat_receiver.schedule
 # resource_handler = ResourceFailureHandler()
 
 
@@ -26,22 +34,69 @@ class ClusterHealth(BaseModel):
 
 
 class HeartbeatRequest(BaseModel):
-    resources: NodeResources
+    # Omitted by nodes whose metrics have not changed since the last report
+    resources: Optional[NodeResources] = None
     status: str = "online"
 
 
+def _cluster_health(include_nodes: bool) -> ClusterHealth:
+    """Build the cluster health report from the cached running aggregates"""
+    cluster_state = redis_client.get_cluster_state()
+    summary = cluster_state.get_cluster_summary()
+    nodes_utilization = {}
+    if include_nodes:
+        nodes_utilization = {
+            node_id: ResourceUtilization(
+                cpu_utilization=cpu, memory_utilization=memory
+            )
+            for node_id, (cpu, memory) in cluster_state.get_nodes_utilization().items()
+        }
+    return ClusterHealth(
+        total_nodes=summary["total_nodes"],
+        online_nodes=summary["online_nodes"],
+        total_cpu_cores=summary["total_cpu_cores"],
+        total_memory_gb=summary["total_memory"] / (1024**3),
+        average_cpu_utilization=summary["average_cpu_utilization"],
+        average_memory_utilization=summary["average_memory_utilization"],
+        nodes_utilization=nodes_utilization,
+    )
+
+
+@router.get("/cluster", response_model=ClusterHealth)
+async def get_cluster_health(include_nodes: bool = Query(False)):
+    """Get cluster totals and allocation-based utilisation
+
+    Answered from running aggregates; per-node utilisation is only listed
+    when include_nodes is set, since it grows with the cluster.
+    """
+    try:
+        return await run_blocking(_cluster_health, include_nodes)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get cluster health: {str(e)}"
+        )
+
+
 @router.post("/heartbeat/{node_id}")
 async def send_heartbeat(node_id: str, heartbeat: HeartbeatRequest):
     """Receive node heartbeat with resource metrics"""
     try:
-        node = node_manager.update_node_resources(node_id, heartbeat.resources)
-        if not node:
+        slot = await run_blocking(
+            heartbeat_receiver.receive, node_id, heartbeat.resources, heartbeat.status
+        )
+        if slot is None:
             raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
 
-        if heartbeat.status == "online":
-            node_manager.update_node_status(node_id, NodeStatus.ONLINE)
-
-        return {"received": True, "message": "Resource metrics updated successfully"}
+        # Tell the node when to report next so heartbeats stay evenly spread
+        interval, next_heartbeat_in = slot
+        return {
+            "received": True,
+            "message": "Resource metrics updated successfully",
+            "interval": interval,
+            "next_heartbeat_in": next_heartbeat_in,
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to process heartbeat: {str(e)}"
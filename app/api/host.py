@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from ..models.host import HostResource
 from ..utils.redis_client import RedisClient, RedisHostResourceMonitor
 from pydantic import BaseModel
+from ..utils.executors import run_blocking
 
 router = APIRouter()
 redis_client = RedisClient.get_instance()
@@ -19,7 +20,7 @@ class HostLimits(BaseModel):
 async def get_host_resources():
     """Get current host system resource metrics"""
     redis_host_monitor = RedisHostResourceMonitor(redis_client=redis_client)
-    host_resources = redis_host_monitor.get_latest_resources()
+    host_resources = await run_blocking(redis_host_monitor.get_latest_resources)
 
     if not host_resources:
         raise HTTPException(status_code=404, detail="Host resources not found")
@@ -48,8 +49,10 @@ async def update_host_limits(limits: HostLimits):
             raise HTTPException(status_code=400, detail="Memory limit cannot be zero")
 
 
-        redis_host_monitor.update_limits(
-            limits.cpu_limit_percent, limits.memory_limit_percent
+        await run_blocking(
+            redis_host_monitor.update_limits,
+            limits.cpu_limit_percent,
+            limits.memory_limit_percent,
         )
         return limits
     except Exception as e:
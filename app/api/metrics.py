@@ -0,0 +1,56 @@
+# Serves utilisation history recorded from node heartbeats and the host
+# monitor. Node series are keyed by node ID; the host series is "host".
+
+import re
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from pydantic import BaseModel
+from ..utils.redis_client import RedisClient
+from ..utils.executors import run_blocking
+
+router = APIRouter()
+redis_client = RedisClient.get_instance()
+
+RANGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class MetricsPoint(BaseModel):
+    timestamp: float
+    samples: int
+    cpu_avg: Optional[float] = None
+    cpu_max: Optional[float] = None
+    memory_avg: Optional[float] = None
+    memory_max: Optional[float] = None
+
+
+class MetricsSeries(BaseModel):
+    node_id: str
+    range_seconds: int
+    resolution: int  # Bucket size in seconds, 0 for raw samples
+    points: List[MetricsPoint]
+
+
+def parse_range(value: str) -> int:
+    """Parse a range like "90", "15m", "6h" or "7d" into seconds"""
+    match = re.fullmatch(r"(\d+)([smhd]?)", value.strip())
+    if not match or int(match.group(1)) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid range '{value}', expected e.g. 15m, 6h or 7d",
+        )
+    return int(match.group(1)) * RANGE_UNITS[match.group(2)]
+
+
+@router.get("/{node_id}", response_model=MetricsSeries)
+async def get_node_metrics(
+    node_id: str, time_range: str = Query("1h", alias="range")
+):
+    """Get CPU and memory utilisation history for a node, or for "host\""""
+    range_seconds = parse_range(time_range)
+    try:
+        series = await run_blocking(redis_client.metrics.query, node_id, range_seconds)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to retrieve metrics: {str(e)}"
+        )
+    return MetricsSeries(node_id=node_id, range_seconds=range_seconds, **series)
@@ -1,13 +1,23 @@
+import os
 from fastapi import APIRouter, HTTPException
 from typing import List, Optional
-from ..models.node import Node, NodeRegistration, NodeResources, NodeStatus
+from ..models.node import (
+    Node,
+    NodeBatchRegistration,
+    NodeRegistration,
+    NodeResources,
+    NodeStatus,
+)
 from ..models.pod import Pod
 from ..core.node_manager import NodeManager
 from pydantic import BaseModel
 from ..utils.cleanup import CleanupManager
+from ..utils.executors import run_blocking, run_docker
 
 router = APIRouter()
-node_manager = NodeManager()
+node_manager = NodeManager(
+    warm_pool_size=int(os.environ.get("NODE_WARM_POOL_SIZE", "0"))
+)
 cleanup_manager = CleanupManager()
 
 
@@ -16,12 +26,18 @@ class ContainerCreationRequest(BaseModel):
     memory_mb: Optional[int] = None
 
 
+class NodeBatchResult(BaseModel):
+    nodes: List[Node]
+    errors: List[str]
+
+
 @router.post("/", response_model=Node, status_code=201)
 async def register_node(registration: NodeRegistration):
     """Register a new node with the cluster by creating a Docker container"""
     try:
         # Create the node container
-        result = node_manager.create_node_container(
+        result = await run_docker(
+            node_manager.create_node_container,
             cpu_count=registration.cpu_count,
             memory_mb=getattr(registration, "memory_mb", None),
         )
@@ -32,11 +48,36 @@ async def register_node(registration: NodeRegistration):
         )
 
 
+@router.post("/batch", response_model=NodeBatchResult, status_code=201)
+async def register_nodes(batch: NodeBatchRegistration):
+    """Register several nodes at once, starting their containers in parallel"""
+    try:
+        results = await run_docker(
+            node_manager.create_node_containers,
+            [(node.cpu_count, node.memory_mb) for node in batch.nodes],
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to register nodes: {str(e)}"
+        )
+
+    nodes = [result["node"] for result in results if "node" in result]
+    if not nodes:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to register nodes: {results[0]['error']}",
+        )
+    return NodeBatchResult(
+        nodes=nodes,
+        errors=[result["error"] for result in results if "error" in result],
+    )
+
+
 @router.get("/", response_model=List[Node])
 async def list_nodes():
     """List all registered nodes"""
     try:
-        nodes = node_manager.get_all_nodes()
+        nodes = await run_blocking(node_manager.get_all_nodes)
         return nodes
     except Exception as e:
         raise HTTPException(
@@ -47,7 +88,7 @@ async def list_nodes():
 @router.get("/{node_id}", response_model=Node)
 async def get_node(node_id: str):
     """Get details of a specific node"""
-    node = node_manager.get_node(node_id)
+    node = await run_blocking(node_manager.get_node, node_id)
     if not node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
     return node
@@ -56,7 +97,7 @@ async def get_node(node_id: str):
 @router.put("/{node_id}/status", response_model=Node)
 async def update_node_status(node_id: str, status: NodeStatus):
     """Update a node's status"""
-    updated_node = node_manager.update_node_status(node_id, status)
+    updated_node = await run_blocking(node_manager.update_node_status, node_id, status)
     if not updated_node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
     return updated_node
@@ -66,7 +107,9 @@ async def update_node_status(node_id: str, status: NodeStatus):
 async def update_node_resources(node_id: str, resources: NodeResources):
     """Update a node's resource metrics"""
     # Get allocated resources first
-    allocated = node_manager.redis_client.get_allocated_resources(node_id)
+    allocated = await run_blocking(
+        node_manager.redis_client.get_allocated_resources, node_id
+    )
     if allocated:
         # Respect the originally allocated CPU count
         resources.cpu_count = allocated.get("cpu_count", resources.cpu_count)
@@ -76,7 +119,9 @@ async def update_node_resources(node_id: str, resources: NodeResources):
         if resources.memory_available > resources.memory_total:
             resources.memory_available = resources.memory_total
     
-    updated_node = node_manager.update_node_resources(node_id, resources)
+    updated_node = await run_blocking(
+        node_manager.update_node_resources, node_id, resources
+    )
     if not updated_node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
     return updated_node
@@ -86,7 +131,7 @@ async def update_node_resources(node_id: str, resources: NodeResources):
 async def shutdown_node(node_id: str):
     """Handle graceful node shutdown"""
     try:
-        if cleanup_manager.cleanup_node(node_id):
+        if await run_blocking(cleanup_manager.cleanup_node, node_id):
             return {"message": f"Node {node_id} shutdown handled successfully"}
         else:
             raise HTTPException(
@@ -102,12 +147,12 @@ async def shutdown_node(node_id: str):
 async def delete_all_nodes():
     """Delete all nodes and their containers"""
     try:
-        nodes = node_manager.get_all_nodes()
+        nodes = await run_blocking(node_manager.get_all_nodes)
         success_count = 0
         failed_nodes = []
         
         for node in nodes:
-            if node_manager.delete_node(node.id):
+            if await run_docker(node_manager.delete_node, node.id):
                 success_count += 1
             else:
                 failed_nodes.append(node.id)
@@ -129,7 +174,7 @@ async def delete_all_nodes():
 async def stop_node(node_id: str):
     """Stop a node's container"""
     try:
-        if node_manager.stop_node(node_id):
+        if await run_docker(node_manager.stop_node, node_id):
             return {"message": f"Node {node_id} stopped successfully"}
         raise HTTPException(
             status_code=404, detail=f"Node {node_id} not found"
@@ -144,7 +189,7 @@ async def stop_node(node_id: str):
 async def restart_node(node_id: str):
     """Restart a node's container"""
     try:
-        if node_manager.restart_node(node_id):
+        if await run_docker(node_manager.restart_node, node_id):
             return {"message": f"Node {node_id} restarted successfully"}
         raise HTTPException(
             status_code=404, detail=f"Node {node_id} not found"
@@ -159,7 +204,7 @@ async def restart_node(node_id: str):
 async def delete_node(node_id: str):
     """Delete a node and its container"""
     try:
-        if node_manager.delete_node(node_id):
+        if await run_docker(node_manager.delete_node, node_id):
             return {"message": f"Node {node_id} deleted successfully"}
         raise HTTPException(
             status_code=404, detail=f"Node {node_id} not found"
@@ -173,27 +218,25 @@ async def delete_node(node_id: str):
 @router.get("/{node_id}/pods", response_model=List[Pod])
 async def list_node_pods(node_id: str):
     """List all pods running on a specific node"""
-    node = node_manager.get_node(node_id)
+    node = await run_blocking(node_manager.get_node, node_id)
     if not node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
     
-    pods = node_manager.redis_client.get_node_pods(node_id)
+    pods = await run_blocking(node_manager.redis_client.get_node_pods, node_id)
     return pods
 
 
 @router.get("/{node_id}/resources")
 async def get_node_available_resources(node_id: str):
     """Get available resources on a specific node"""
-    node = node_manager.get_node(node_id)
+    node = await run_blocking(node_manager.get_node, node_id)
     if not node:
         raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
     
-    # Get all pods on this node to calculate used resources
-    pods = node_manager.redis_client.get_node_pods(node_id)
-    
-    # Calculate used resources
-    used_cpu = sum(pod.resources.cpu_cores for pod in pods)
-    used_memory = sum(pod.resources.memory_mb * 1024 * 1024 for pod in pods)
+    # Get resources reserved by pods on this node
+    usage = await run_blocking(node_manager.redis_client.get_node_usage, node_id)
+    used_cpu = usage["cpu"]
+    used_memory = usage["memory"]
     
     # Correctly calculate available resources based on the node's actual resources
     available_memory = node.resources.memory_total - used_memory
@@ -206,7 +249,8 @@ async def get_node_available_resources(node_id: str):
         "used_cpu": used_cpu,
         "used_memory": used_memory,
         "cpu_utilization_percent": (used_cpu / node.resources.cpu_count * 100) if node.resources.cpu_count > 0 else 0,
-        "memory_utilization_percent": (used_memory / node.resources.memory_total * 100) if node.resources.memory_total > 0 else 0
+        "memory_utilization_percent": (used_memory / node.resources.memory_total * 100) if node.resources.memory_total > 0 else 0,
+        "measured_cpu_utilization_percent": node.resources.cpu_utilization,
     }
     
     return available_resources
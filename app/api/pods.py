@@ -1,44 +1,79 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List
-from ..models.pod import Pod, PodCreation, PodStatus
+from ..models.pod import Pod, PodBatchCreation, PodCreation, PodStatus
+from ..core.policies import get_policy
 from ..core.scheduler import Scheduler
 from ..utils.redis_client import RedisClient
+from ..utils.executors import run_blocking
 
 router = APIRouter()
 scheduler = Scheduler()
 redis_client = RedisClient.get_instance()
 
 
+def validate_policy(name):
+    """Reject a pod that names an unknown scheduling policy"""
+    if name:
+        try:
+            get_policy(name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/", response_model=Pod, status_code=201)
-async def launch_pod(pod_creation: PodCreation):
-    """Launch a new pod with specified CPU and memory requirements"""
+async def launch_pod(pod_creation: PodCreation, response: Response):
+    """Launch a new pod with specified CPU and memory requirements
+
+    Returns 201 if the pod was placed, or 202 if it was queued as pending
+    until a node has room for it.
+    """
+    validate_policy(pod_creation.scheduling_policy)
     try:
         # Create a new pod instance
-        pod = Pod(name=pod_creation.name, resources=pod_creation.resources)
-
-        # Use the scheduler to find a suitable node
-        assigned_node = scheduler.schedule_pod(pod)
-        if assigned_node:
-            pod.node_id = assigned_node.id
-            pod.status = PodStatus.RUNNING
-            redis_client.store_pod(pod)
-            return pod
-        else:
-            pod.status = PodStatus.PENDING
-            redis_client.store_pod(pod)
-            raise HTTPException(
-                status_code=503,
-                detail="No nodes available with sufficient CPU and memory",
-            )
+        pod = Pod(
+            name=pod_creation.name,
+            resources=pod_creation.resources,
+            scheduling_policy=pod_creation.scheduling_policy,
+        )
+
+        # Place the pod and reserve its node atomically
+        await run_blocking(scheduler.place_pods, [pod])
+        if pod.status != PodStatus.RUNNING:
+            response.status_code = 202
+        return pod
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to launch pod: {str(e)}")
 
 
+@router.post("/batch", response_model=List[Pod], status_code=201)
+async def launch_pods(batch: PodBatchCreation):
+    """Launch a batch of pods, packing them onto nodes together"""
+    for pod_creation in batch.pods:
+        validate_policy(pod_creation.scheduling_policy)
+    try:
+        pods = [
+            Pod(
+                name=pod_creation.name,
+                resources=pod_creation.resources,
+                scheduling_policy=pod_creation.scheduling_policy,
+            )
+            for pod_creation in batch.pods
+        ]
+
+        # Pack the whole batch and reserve the placements atomically
+        await run_blocking(scheduler.place_pods, pods)
+        return pods
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to launch pods: {str(e)}"
+        )
+
+
 @router.get("/", response_model=List[Pod])
 async def list_pods():
     """List all pods in the cluster"""
     try:
-        pods = redis_client.get_all_pods()
+        pods = await run_blocking(redis_client.get_all_pods)
         return pods
     except Exception as e:
         raise HTTPException(
@@ -49,7 +84,7 @@ async def list_pods():
 @router.get("/{pod_id}", response_model=Pod)
 async def get_pod(pod_id: str):
     """Get details of a specific pod"""
-    pod = redis_client.get_pod(pod_id)
+    pod = await run_blocking(redis_client.get_pod, pod_id)
     if not pod:
         raise HTTPException(status_code=404, detail=f"Pod {pod_id} not found")
     return pod
@@ -58,9 +93,6 @@ async def get_pod(pod_id: str):
 @router.delete("/{pod_id}", status_code=204)
 async def delete_pod(pod_id: str):
     """Delete a pod and free its resources"""
-    pod = redis_client.get_pod(pod_id)
-    if not pod:
+    if not await run_blocking(redis_client.delete_pod, pod_id):
         raise HTTPException(status_code=404, detail=f"Pod {pod_id} not found")
-
-    redis_client.delete_pod(pod_id)
     return None
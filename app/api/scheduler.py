@@ -0,0 +1,68 @@
+# Exposes the cluster-wide scheduling policy. Pods can still pick their own
+# policy when they are launched.
+
+from fastapi import APIRouter, HTTPException
+from typing import List
+from pydantic import BaseModel
+from ..core.policies import POLICIES
+from ..utils.executors import run_blocking
+from .pods import scheduler
+
+router = APIRouter()
+
+
+class PolicyInfo(BaseModel):
+    name: str
+    description: str
+
+
+class ClusterPolicy(BaseModel):
+    policy: str
+    available: List[PolicyInfo]
+
+
+class PolicyUpdate(BaseModel):
+    policy: str
+
+
+def cluster_policy(name: str) -> ClusterPolicy:
+    return ClusterPolicy(
+        policy=name,
+        available=[
+            PolicyInfo(name=policy.name, description=policy.description)
+            for policy in POLICIES.values()
+        ],
+    )
+
+
+@router.get("/policy", response_model=ClusterPolicy)
+async def get_cluster_policy():
+    """Get the cluster-wide scheduling policy and the policies available"""
+    try:
+        policy = await run_blocking(scheduler.get_cluster_policy)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to retrieve scheduling policy: {str(e)}"
+        )
+    return cluster_policy(policy.name)
+
+
+@router.put("/policy", response_model=ClusterPolicy)
+async def set_cluster_policy(update: PolicyUpdate):
+    """Set the scheduling policy used for pods that do not name one
+
+    Other API workers pick up the change within the scheduler's policy
+    refresh interval.
+    """
+    if update.policy not in POLICIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown scheduling policy '{update.policy}', expected one of: {', '.join(POLICIES)}",
+        )
+    try:
+        policy = await run_blocking(scheduler.set_cluster_policy, update.policy)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to set scheduling policy: {str(e)}"
+        )
+    return cluster_policy(policy.name)
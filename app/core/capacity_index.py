@@ -0,0 +1,85 @@
+"""
+Capacity Index Module
+
+Sorted index of free node capacity used for best-fit pod placement.
+Nodes are bucketed by free CPU cores, and each bucket is kept sorted by
+free memory, so the tightest node that fits a pod is found with binary
+searches instead of a scan over every node.
+
+Key Features:
+- Buckets keyed by free CPU cores
+- Free memory ordering within each bucket
+- Best-fit lookup over both CPU and memory
+- Incremental updates as usage changes
+"""
+
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+
+class CapacityIndex:
+    """
+    Free-capacity index over schedulable nodes.
+
+    Best fit means the least free CPU left after placement, with the least
+    free memory as the tie-breaker.
+
+    Attributes:
+        buckets: Sorted (free_memory, node_id) entries keyed by free CPU
+        cpu_keys: Sorted list of the free CPU values that have a bucket
+        entries: (free_cpu, free_memory) keyed by node ID
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, List[Tuple[int, str]]] = {}
+        self.cpu_keys: List[int] = []
+        self.entries: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.entries
+
+    def update(self, node_id: str, free_cpu: int, free_memory: int):
+        """Insert a node or move it to its new free capacity"""
+        if self.entries.get(node_id) == (free_cpu, free_memory):
+            return
+        self.remove(node_id)
+
+        bucket = self.buckets.get(free_cpu)
+        if bucket is None:
+            bucket = self.buckets[free_cpu] = []
+            bisect.insort(self.cpu_keys, free_cpu)
+        bisect.insort(bucket, (free_memory, node_id))
+        self.entries[node_id] = (free_cpu, free_memory)
+
+    def remove(self, node_id: str):
+        """Remove a node from the index"""
+        entry = self.entries.pop(node_id, None)
+        if entry is None:
+            return
+        free_cpu, free_memory = entry
+
+        bucket = self.buckets[free_cpu]
+        del bucket[bisect.bisect_left(bucket, (free_memory, node_id))]
+        if not bucket:
+            del self.buckets[free_cpu]
+            del self.cpu_keys[bisect.bisect_left(self.cpu_keys, free_cpu)]
+
+    def best_fit(self, cpu: int, memory: int) -> Optional[str]:
+        """Find the node with the tightest fit for the requested resources
+
+        Args:
+            cpu: CPU cores required
+            memory: Memory required in bytes
+
+        Returns:
+            The ID of the best-fit node, or None if no node has room
+        """
+        for i in range(bisect.bisect_left(self.cpu_keys, cpu), len(self.cpu_keys)):
+            bucket = self.buckets[self.cpu_keys[i]]
+            position = bisect.bisect_left(bucket, (memory, ""))
+            if position < len(bucket):
+                return bucket[position][1]
+        return None
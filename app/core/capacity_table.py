@@ -0,0 +1,158 @@
+"""
+Capacity Table Module
+
+Columnar table of node capacity for vectorized scheduling. Every node owns
+a slot, and each capacity figure is a NumPy array indexed by slot, so fit
+checks and policy scores over the whole cluster are single array
+expressions.
+
+Key Features:
+- One contiguous float64 column per capacity figure, so scoring needs no
+  integer conversions (byte counts stay exact below 2**53)
+- Stable slots per node, reused after a node is removed
+- In-place row updates as nodes and usage change
+- Online mask so offline nodes and free slots are never chosen
+"""
+
+import heapq
+from typing import Dict, List, Optional
+import numpy as np
+
+COLUMNS = (
+    "cpu_count",
+    "memory_total",
+    "used_cpu",
+    "used_memory",
+    "free_cpu",
+    "free_memory",
+    "pod_count",
+)
+
+
+class NodeCapacityTable:
+    """
+    Slot-indexed capacity columns for every cached node.
+
+    Column properties return views over the slots in use, without copying.
+    A view stays live until the table next grows. Slots of removed nodes are
+    zeroed, marked offline and handed to the next new node.
+
+    Attributes:
+        slots: Slot keyed by node ID
+        node_ids: Node ID per slot, None for a free slot
+        size: Number of slots in use, including free ones below the highest
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize an empty table.
+
+        Args:
+            capacity: Slots allocated up front; the table doubles when full
+                (default: 64)
+        """
+        self.slots: Dict[str, int] = {}
+        self.node_ids: List[Optional[str]] = []
+        self.free_slots: List[int] = []
+        self.size = 0
+        self.data = np.zeros((len(COLUMNS), capacity), dtype=np.float64)
+        self.online_mask = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.slots
+
+    @property
+    def cpu_count(self) -> np.ndarray:
+        return self.data[0, : self.size]
+
+    @property
+    def memory_total(self) -> np.ndarray:
+        return self.data[1, : self.size]
+
+    @property
+    def used_cpu(self) -> np.ndarray:
+        return self.data[2, : self.size]
+
+    @property
+    def used_memory(self) -> np.ndarray:
+        return self.data[3, : self.size]
+
+    @property
+    def free_cpu(self) -> np.ndarray:
+        return self.data[4, : self.size]
+
+    @property
+    def free_memory(self) -> np.ndarray:
+        return self.data[5, : self.size]
+
+    @property
+    def pod_count(self) -> np.ndarray:
+        return self.data[6, : self.size]
+
+    @property
+    def online(self) -> np.ndarray:
+        return self.online_mask[: self.size]
+
+    def update(
+        self,
+        node_id: str,
+        online: bool,
+        cpu_count: int,
+        memory_total: int,
+        used_cpu: int,
+        used_memory: int,
+        free_cpu: int,
+        free_memory: int,
+        pod_count: int,
+    ):
+        """Insert a node or overwrite its row"""
+        slot = self.slots.get(node_id)
+        if slot is None:
+            slot = self._allocate(node_id)
+        self.data[:, slot] = (
+            cpu_count,
+            memory_total,
+            used_cpu,
+            used_memory,
+            free_cpu,
+            free_memory,
+            pod_count,
+        )
+        self.online_mask[slot] = online
+
+    def remove(self, node_id: str):
+        """Remove a node and free its slot"""
+        slot = self.slots.pop(node_id, None)
+        if slot is None:
+            return
+        self.data[:, slot] = 0
+        self.online_mask[slot] = False
+        self.node_ids[slot] = None
+        heapq.heappush(self.free_slots, slot)
+
+    def fits(self, cpu: int, memory: int) -> np.ndarray:
+        """Get a mask of the online nodes with room for the requested resources"""
+        return self.online & (self.free_cpu >= cpu) & (self.free_memory >= memory)
+
+    def _allocate(self, node_id: str) -> int:
+        """Give a node a free slot, growing the columns if none is left"""
+        if self.free_slots:
+            # Lowest slot first, so first-fit order stays close to registration order
+            slot = heapq.heappop(self.free_slots)
+            self.node_ids[slot] = node_id
+        else:
+            slot = self.size
+            if slot == self.data.shape[1]:
+                capacity = max(1, slot) * 2
+                data = np.zeros((len(COLUMNS), capacity), dtype=np.float64)
+                data[:, :slot] = self.data
+                online_mask = np.zeros(capacity, dtype=bool)
+                online_mask[:slot] = self.online_mask
+                self.data, self.online_mask = data, online_mask
+            self.node_ids.append(node_id)
+            self.size += 1
+        self.slots[node_id] = slot
+        return slot
@@ -0,0 +1,339 @@
+"""
+Cluster State Module
+
+Keeps an in-memory view of cluster nodes and per-node resource usage so the
+scheduler can place pods without querying Redis for every candidate node.
+
+Key Features:
+- Node lookup by ID
+- Per-node used CPU and memory totals
+- Free-capacity index for best-fit lookups
+- Columnar capacity table for vectorized policy scoring
+- Running cluster totals and utilisation aggregates
+- Incremental updates from the Redis write paths
+- Full reload from Redis on demand
+"""
+
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..models.node import Node, NodeResources, NodeStatus
+from .capacity_index import CapacityIndex
+from .capacity_table import NodeCapacityTable
+
+# Free memory gains below this, such as noise in reported available memory,
+# do not count as new capacity for pending pods
+CAPACITY_MEMORY_STEP = 64 * 1024 * 1024
+
+
+class ClusterStateCache:
+    """
+    In-memory cache of nodes and their allocated resources.
+
+    The cache is owned by RedisClient and updated by its write paths
+    (store_node, delete_node, store_pod, delete_pod), so reads stay coherent
+    with the writes made by this process. State written by other processes is
+    picked up by calling load() again.
+
+    Attributes:
+        nodes: Cached nodes keyed by node ID
+        used_cpu: CPU cores allocated to pods, keyed by node ID
+        used_memory: Memory in bytes allocated to pods, keyed by node ID
+        pod_allocations: (node_id, cpu_cores, memory_bytes) keyed by pod ID
+        pod_counts: Number of pods assigned, keyed by node ID
+        capacity_index: Free capacity of online nodes for best-fit lookups
+        capacity_table: Capacity columns of every node for vectorized scoring
+        capacity_version: Incremented when a node comes online or frees CPU or
+            at least CAPACITY_MEMORY_STEP bytes of memory
+        node_utilization: (cpu %, memory %) allocated on each online node
+        totals: Running cluster aggregates, see get_cluster_summary()
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.nodes: Dict[str, Node] = {}
+        self.used_cpu: Dict[str, int] = {}
+        self.used_memory: Dict[str, int] = {}
+        self.pod_allocations: Dict[str, Tuple[str, int, int]] = {}
+        self.pod_counts: Dict[str, int] = {}
+        self.capacity_index = CapacityIndex()
+        self.capacity_table = NodeCapacityTable()
+        self.capacity_version = 0
+        self.node_contributions: Dict[str, Tuple[bool, int, int]] = {}
+        self.node_utilization: Dict[str, Tuple[float, float]] = {}
+        self.totals = self._empty_totals()
+        self.loaded = False
+
+    def load(self, nodes: List[Node], pods: list):
+        """Replace the cached state with the given nodes and pods"""
+        with self.lock:
+            self.nodes = {}
+            self.used_cpu = {}
+            self.used_memory = {}
+            self.pod_allocations = {}
+            self.pod_counts = {}
+            self.capacity_index = CapacityIndex()
+            self.capacity_table = NodeCapacityTable(max(64, len(nodes)))
+            self.capacity_version += 1
+            self.node_contributions = {}
+            self.node_utilization = {}
+            self.totals = self._empty_totals()
+            # Sorted so every API worker lays out its capacity table alike
+            for node in sorted(nodes, key=lambda node: node.id):
+                self.upsert_node(node)
+            for pod in pods:
+                self.add_pod(pod)
+            self.loaded = True
+
+    def is_loaded(self) -> bool:
+        """Check if the cache has been populated"""
+        return self.loaded
+
+    def invalidate(self):
+        """Force a reload from Redis on next use"""
+        self.loaded = False
+
+    def upsert_node(self, node: Node):
+        """Add or replace a node"""
+        with self.lock:
+            self.nodes[node.id] = node.model_copy()
+            self.used_cpu.setdefault(node.id, 0)
+            self.used_memory.setdefault(node.id, 0)
+            self._reindex(node.id)
+
+    def apply_heartbeat(
+        self,
+        node_id: str,
+        resources: NodeResources,
+        status: str,
+        last_heartbeat: datetime,
+    ):
+        """Update a cached node with the fields written by a heartbeat"""
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if not node:
+                return
+            self.nodes[node_id] = node.model_copy(
+                update={
+                    "resources": resources,
+                    "status": NodeStatus(status),
+                    "last_heartbeat": last_heartbeat,
+                }
+            )
+            self._reindex(node_id)
+
+    def remove_node(self, node_id: str):
+        """Remove a node and its usage totals"""
+        with self.lock:
+            self.nodes.pop(node_id, None)
+            self.used_cpu.pop(node_id, None)
+            self.used_memory.pop(node_id, None)
+            self.pod_counts.pop(node_id, None)
+            self.capacity_index.remove(node_id)
+            self.capacity_table.remove(node_id)
+            self._update_totals(node_id)
+
+    def add_pod(self, pod):
+        """Account for a pod's resources on its assigned node"""
+        with self.lock:
+            self.remove_pod(pod.id)
+            if not pod.node_id:
+                return
+            cpu = pod.resources.cpu_cores
+            memory = pod.resources.memory_mb * 1024 * 1024
+            self.pod_allocations[pod.id] = (pod.node_id, cpu, memory)
+            self.pod_counts[pod.node_id] = self.pod_counts.get(pod.node_id, 0) + 1
+            self.used_cpu[pod.node_id] = self.used_cpu.get(pod.node_id, 0) + cpu
+            self.used_memory[pod.node_id] = (
+                self.used_memory.get(pod.node_id, 0) + memory
+            )
+            self._reindex(pod.node_id)
+
+    def remove_pod(self, pod_id: str):
+        """Release a pod's resources from its node"""
+        with self.lock:
+            allocation = self.pod_allocations.pop(pod_id, None)
+            if not allocation:
+                return
+            node_id, cpu, memory = allocation
+            if node_id in self.pod_counts:
+                self.pod_counts[node_id] -= 1
+            if node_id in self.used_cpu:
+                self.used_cpu[node_id] -= cpu
+                self.used_memory[node_id] -= memory
+                self._reindex(node_id)
+
+    def get_node(self, node_id: str) -> Optional[Node]:
+        """Get a cached node by its ID"""
+        return self.nodes.get(node_id)
+
+    def node_count(self) -> int:
+        """Get the number of cached nodes"""
+        with self.lock:
+            return len(self.nodes)
+
+    def get_online_nodes(self) -> List[Node]:
+        """Get all cached nodes that are online"""
+        with self.lock:
+            return [
+                node for node in self.nodes.values() if node.status == NodeStatus.ONLINE
+            ]
+
+    def get_used_resources(self, node_id: str) -> Tuple[int, int]:
+        """Get (used CPU cores, used memory bytes) for a node"""
+        with self.lock:
+            return self.used_cpu.get(node_id, 0), self.used_memory.get(node_id, 0)
+
+    def set_used_resources(self, node_id: str, used_cpu: int, used_memory: int):
+        """Overwrite a node's usage totals with authoritative values"""
+        with self.lock:
+            if node_id not in self.nodes:
+                return
+            self.used_cpu[node_id] = used_cpu
+            self.used_memory[node_id] = used_memory
+            self._reindex(node_id)
+
+    def get_free_resources(self, node_id: str) -> Tuple[int, int]:
+        """Get (free CPU cores, free memory bytes) for a node
+
+        Free memory is bounded both by the memory the node last reported as
+        available and by its total memory minus what pods have reserved. Free
+        CPU is likewise bounded by the whole cores the node last reported busy,
+        when it reports utilisation.
+        """
+        with self.lock:
+            node = self.nodes.get(node_id)
+            if not node:
+                return 0, 0
+            used_cpu, used_memory = self.get_used_resources(node_id)
+            free_cpu = node.resources.cpu_count - used_cpu
+            if node.resources.cpu_utilization is not None:
+                busy = math.floor(
+                    node.resources.cpu_count * node.resources.cpu_utilization / 100
+                )
+                free_cpu = min(free_cpu, node.resources.cpu_count - busy)
+            free_memory = min(
+                node.resources.memory_available,
+                node.resources.memory_total - used_memory,
+            )
+            return free_cpu, free_memory
+
+    def get_cluster_summary(self) -> Dict[str, float]:
+        """Get cluster totals and average utilisation in constant time
+
+        Totals cover every cached node. Averages are over online nodes and
+        based on the resources allocated to pods.
+        """
+        with self.lock:
+            totals = self.totals
+            online = totals["online_nodes"]
+            return {
+                "total_nodes": totals["total_nodes"],
+                "online_nodes": online,
+                "total_cpu_cores": totals["cpu_count"],
+                "total_memory": totals["memory_total"],
+                "average_cpu_utilization": (
+                    max(0.0, totals["cpu_utilization"] / online) if online else 0.0
+                ),
+                "average_memory_utilization": (
+                    max(0.0, totals["memory_utilization"] / online) if online else 0.0
+                ),
+            }
+
+    def get_nodes_utilization(self) -> Dict[str, Tuple[float, float]]:
+        """Get (cpu %, memory %) allocated on each online node"""
+        with self.lock:
+            return dict(self.node_utilization)
+
+    def find_best_fit(self, cpu: int, memory: int) -> Optional[Node]:
+        """Find the online node with the tightest fit for a CPU/memory request"""
+        with self.lock:
+            node_id = self.capacity_index.best_fit(cpu, memory)
+            return self.nodes.get(node_id) if node_id else None
+
+    def _empty_totals(self) -> Dict[str, float]:
+        return {
+            "total_nodes": 0,
+            "online_nodes": 0,
+            "cpu_count": 0,
+            "memory_total": 0,
+            "cpu_utilization": 0.0,
+            "memory_utilization": 0.0,
+        }
+
+    def _update_totals(self, node_id: str):
+        """Replace a node's contribution to the running cluster totals"""
+        totals = self.totals
+        previous = self.node_contributions.pop(node_id, None)
+        if previous:
+            online, cpu_count, memory_total = previous
+            totals["total_nodes"] -= 1
+            totals["cpu_count"] -= cpu_count
+            totals["memory_total"] -= memory_total
+            if online:
+                cpu, memory = self.node_utilization.pop(node_id)
+                totals["online_nodes"] -= 1
+                totals["cpu_utilization"] -= cpu
+                totals["memory_utilization"] -= memory
+
+        node = self.nodes.get(node_id)
+        if not node:
+            return
+        resources = node.resources
+        online = node.status == NodeStatus.ONLINE
+        self.node_contributions[node_id] = (
+            online,
+            resources.cpu_count,
+            resources.memory_total,
+        )
+        totals["total_nodes"] += 1
+        totals["cpu_count"] += resources.cpu_count
+        totals["memory_total"] += resources.memory_total
+        if online:
+            used_cpu, used_memory = self.get_used_resources(node_id)
+            cpu = used_cpu / resources.cpu_count * 100 if resources.cpu_count else 0.0
+            memory = (
+                used_memory / resources.memory_total * 100
+                if resources.memory_total
+                else 0.0
+            )
+            self.node_utilization[node_id] = (cpu, memory)
+            totals["online_nodes"] += 1
+            totals["cpu_utilization"] += cpu
+            totals["memory_utilization"] += memory
+
+    def _reindex(self, node_id: str):
+        """Refresh a node's totals and its rows in the capacity index and table"""
+        self._update_totals(node_id)
+        node = self.nodes.get(node_id)
+        if not node:
+            self.capacity_index.remove(node_id)
+            self.capacity_table.remove(node_id)
+            return
+
+        free_cpu, free_memory = self.get_free_resources(node_id)
+        online = node.status == NodeStatus.ONLINE
+        self.capacity_table.update(
+            node_id,
+            online,
+            node.resources.cpu_count,
+            node.resources.memory_total,
+            self.used_cpu.get(node_id, 0),
+            self.used_memory.get(node_id, 0),
+            free_cpu,
+            free_memory,
+            self.pod_counts.get(node_id, 0),
+        )
+        if not online:
+            self.capacity_index.remove(node_id)
+            return
+
+        previous = self.capacity_index.entries.get(node_id)
+        if (
+            previous is None
+            or free_cpu > previous[0]
+            or free_memory >= previous[1] + CAPACITY_MEMORY_STEP
+        ):
+            self.capacity_version += 1
+        self.capacity_index.update(node_id, free_cpu, free_memory)
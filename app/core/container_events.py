@@ -0,0 +1,138 @@
+"""
+Container Events Module
+
+Follows the Docker events stream so node status tracks container state as
+soon as it changes, rather than when heartbeats stop arriving.
+
+Key Features:
+- Single subscription for all node containers
+- Immediate offline marking and pod eviction when a container dies or
+  runs out of memory
+- Nodes brought back online as soon as their container starts
+- Automatic reconnection without losing events
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from ..utils.cleanup import CleanupManager
+from ..utils.docker_utils import DockerNodeManager, NODE_NAME_PREFIX, NODE_ROLE_LABEL
+from ..utils.redis_client import RedisClient
+
+WATCHED_EVENTS = ["die", "oom", "start", "stop"]
+
+
+class ContainerEventWatcher:
+    """
+    Background subscriber to Docker container events.
+
+    A die, oom or stop event marks the node offline and evicts its pods
+    through the cleanup manager. A start event records a heartbeat, which
+    brings the node back online. Events for containers that are not
+    registered nodes, such as warm pool containers, are ignored.
+
+    Attributes:
+        running: Whether the watcher thread should keep running
+        last_event_time: Timestamp of the last event seen, used to resume
+    """
+
+    def __init__(
+        self,
+        docker_manager: Optional[DockerNodeManager] = None,
+        redis_client: Optional[RedisClient] = None,
+        cleanup_manager: Optional[CleanupManager] = None,
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            docker_manager: Optional DockerNodeManager instance
+            redis_client: Optional RedisClient instance
+            cleanup_manager: Optional CleanupManager instance
+        """
+        self.docker_manager = docker_manager or DockerNodeManager()
+        self.redis_client = redis_client or RedisClient.get_instance()
+        self.cleanup_manager = cleanup_manager or CleanupManager(
+            redis_client=self.redis_client
+        )
+        self.running = False
+        self.last_event_time: Optional[int] = None
+        self.stream = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start following container events on a daemon thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(
+            target=self._run, name="nexuscore-docker-events", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Stop following container events"""
+        self.running = False
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        """Consume the events stream, reconnecting with backoff on errors"""
+        delay = 1.0
+        while self.running:
+            try:
+                self.stream = self.docker_manager.client.events(
+                    decode=True,
+                    since=self.last_event_time,
+                    filters={"type": "container", "event": WATCHED_EVENTS},
+                )
+                for event in self.stream:
+                    delay = 1.0
+                    self.last_event_time = event.get("time", self.last_event_time)
+                    try:
+                        self.handle_event(event)
+                    except Exception as e:
+                        logging.error(f"Error handling container event: {str(e)}")
+            except Exception as e:
+                if not self.running:
+                    break
+                logging.error(f"Docker events stream failed: {str(e)}")
+            if self.running:
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    def handle_event(self, event: Dict):
+        """Apply a single container event to the node it belongs to"""
+        action = event.get("Action") or event.get("status")
+        actor = event.get("Actor", {})
+        attributes = actor.get("Attributes", {})
+        if not self._is_node_container(attributes):
+            return
+
+        node_id = actor.get("ID") or event.get("id")
+        node = self.redis_client.get_node(node_id)
+        if not node or self.redis_client.is_node_deleting(node_id):
+            return
+
+        if action == "start":
+            self.redis_client.record_heartbeat(node_id)
+            logging.info(f"Node {node_id} container started - marked online")
+        elif action == "oom":
+            logging.warning(f"Node {node_id} container ran out of memory")
+            self.cleanup_manager.cleanup_node(node_id)
+        else:
+            # NodeManager.stop_node may already have marked the node offline
+            # without evicting, so evict whatever the stored status says
+            logging.warning(f"Node {node_id} container {action} - marking as OFFLINE")
+            self.cleanup_manager.cleanup_node(node_id)
+
+    def _is_node_container(self, attributes: Dict) -> bool:
+        """Check the role label, falling back to the name for older containers"""
+        role = attributes.get(NODE_ROLE_LABEL)
+        if role is not None:
+            return role == "node"
+        return attributes.get("name", "").startswith(NODE_NAME_PREFIX)
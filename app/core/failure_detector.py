@@ -0,0 +1,137 @@
+"""
+Failure Detector Module
+
+Phi-accrual failure detection for node heartbeats. Instead of a fixed
+cutoff, each node's heartbeat inter-arrival times are tracked and the
+suspicion level (phi) grows with how unlikely the current silence is given
+that history.
+
+Key Features:
+- Per-node ring buffer of heartbeat intervals
+- Running mean and variance in constant time per heartbeat
+- Adaptive suspicion level that tolerates jittery nodes
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional
+
+
+class HeartbeatHistory:
+    """
+    Fixed-size ring buffer of heartbeat inter-arrival times.
+
+    Attributes:
+        intervals: Interval samples in seconds
+        count: Number of samples currently held
+        last_heartbeat: Timestamp of the most recent heartbeat
+    """
+
+    def __init__(self, window_size: int, last_heartbeat: float):
+        self.intervals = array("d", bytes(8 * window_size))
+        self.count = 0
+        self.position = 0
+        self.total = 0.0
+        self.squared_total = 0.0
+        self.last_heartbeat = last_heartbeat
+
+    def add(self, interval: float):
+        """Record an interval, evicting the oldest one when the buffer is full"""
+        if self.count == len(self.intervals):
+            evicted = self.intervals[self.position]
+            self.total -= evicted
+            self.squared_total -= evicted * evicted
+        else:
+            self.count += 1
+        self.intervals[self.position] = interval
+        self.position = (self.position + 1) % len(self.intervals)
+        self.total += interval
+        self.squared_total += interval * interval
+
+    def mean(self) -> float:
+        return self.total / self.count
+
+    def std_deviation(self) -> float:
+        mean = self.mean()
+        return math.sqrt(max(self.squared_total / self.count - mean * mean, 0.0))
+
+
+class PhiAccrualFailureDetector:
+    """
+    Phi-accrual failure detector over node heartbeats.
+
+    Phi is -log10 of the probability that a heartbeat arrives later than the
+    current silence, assuming normally distributed intervals. A phi of 1
+    means a 10% chance the node is still alive, 2 means 1%, and so on.
+
+    Attributes:
+        window_size: Intervals kept per node
+        min_std_deviation: Lower bound on the interval deviation in seconds
+        acceptable_pause: Extra silence in seconds tolerated before suspicion
+        first_heartbeat_estimate: Assumed interval before real samples exist
+        expected_interval: Heartbeat interval currently assigned to nodes; the
+            mean interval is never taken to be shorter than this
+    """
+
+    def __init__(
+        self,
+        window_size: int = 100,
+        min_std_deviation: float = 1.0,
+        acceptable_pause: float = 5.0,
+        first_heartbeat_estimate: float = 30.0,
+    ):
+        self.window_size = window_size
+        self.min_std_deviation = min_std_deviation
+        self.acceptable_pause = acceptable_pause
+        self.first_heartbeat_estimate = first_heartbeat_estimate
+        self.expected_interval = 0.0
+        self.histories: Dict[str, HeartbeatHistory] = {}
+
+    def heartbeat(self, node_id: str, timestamp: float) -> bool:
+        """Record a heartbeat arrival
+
+        Returns:
+            False if the timestamp is not newer than the last one recorded
+        """
+        history = self.histories.get(node_id)
+        if history is None:
+            history = self.histories[node_id] = HeartbeatHistory(
+                self.window_size, timestamp
+            )
+            # Seed with the expected interval so phi is meaningful immediately
+            deviation = self.first_heartbeat_estimate / 4
+            history.add(self.first_heartbeat_estimate - deviation)
+            history.add(self.first_heartbeat_estimate + deviation)
+            return True
+
+        if timestamp <= history.last_heartbeat:
+            return False
+        history.add(timestamp - history.last_heartbeat)
+        history.last_heartbeat = timestamp
+        return True
+
+    def phi(self, node_id: str, now: float) -> Optional[float]:
+        """Get the suspicion level for a node, or None if it is not tracked"""
+        history = self.histories.get(node_id)
+        if history is None:
+            return None
+
+        elapsed = now - history.last_heartbeat
+        # A freshly lengthened interval is not yet reflected in the history
+        mean = max(history.mean(), self.expected_interval) + self.acceptable_pause
+        std_deviation = max(history.std_deviation(), self.min_std_deviation)
+
+        # Logistic approximation of the normal CDF, clamped to avoid overflow
+        y = (elapsed - mean) / std_deviation
+        e = math.exp(max(-700.0, min(700.0, -y * (1.5976 + 0.070566 * y * y))))
+        if elapsed > mean:
+            return max(0.0, -math.log10(e / (1.0 + e)))
+        return max(0.0, -math.log10(1.0 - 1.0 / (1.0 + e)))
+
+    def remove(self, node_id: str):
+        """Stop tracking a node"""
+        self.histories.pop(node_id, None)
+
+    def tracked_nodes(self) -> List[str]:
+        """Get the IDs of all tracked nodes"""
+        return list(self.histories)
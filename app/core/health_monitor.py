@@ -8,17 +8,23 @@ Key Features:
 - Node heartbeat monitoring
 - Resource utilization tracking
 - Health status management
-- Failure detection
+- Phi-accrual failure detection with a fixed timeout as backstop
 """
 
 import time
 import threading
 import logging
-from datetime import datetime
 from typing import Set
 from ..models.node import NodeStatus
 from ..utils.redis_client import RedisClient
 from .node_manager import NodeManager
+from .failure_detector import PhiAccrualFailureDetector
+from .heartbeat import HeartbeatSchedule
+from .rescheduler import PodRescheduler
+
+# Re-read heartbeats this many seconds before the last one seen, so writes
+# that land slightly out of order are not missed
+HEARTBEAT_READ_LAG = 5.0
 
 
 class HealthMonitorService:
@@ -30,41 +36,147 @@ class HealthMonitorService:
     
     Attributes:
         check_interval: Time between health checks in seconds
+        reconcile_interval: Time between usage counter reconciliations in seconds
+        heartbeat_timeout: Seconds without a heartbeat before a node is offline
+        suspect_threshold: Phi at which a node is marked suspect
+        offline_threshold: Phi at which a node is marked offline
+        failure_detector: Phi-accrual detector fed from the heartbeat index
+        heartbeat_schedule: Source of the heartbeat interval nodes are told to use
         failed_nodes: Set of node IDs that have failed
+        suspected_nodes: Set of node IDs currently marked suspect
+        offline_nodes: Set of node IDs marked offline by the failure detector
     """
     
-    def __init__(self, check_interval=60):
+    def __init__(
+        self,
+        check_interval=60,
+        reconcile_interval=600,
+        heartbeat_timeout=300,
+        suspect_threshold=3.0,
+        offline_threshold=8.0,
+        failure_detector=None,
+        rescheduler=None,
+        heartbeat_schedule=None,
+        redis_client=None,
+        node_manager=None,
+        clock=time.time,
+    ):
         """
         Initialize health monitor service.
         
         Args:
             check_interval: Seconds between health checks (default: 60)
+            reconcile_interval: Seconds between usage counter reconciliations
+                (default: 600)
+            heartbeat_timeout: Seconds without a heartbeat before a node is
+                marked offline regardless of phi (default: 300)
+            suspect_threshold: Phi at which a node is marked suspect (default: 3)
+            offline_threshold: Phi at which a node is marked offline (default: 8)
+            failure_detector: Optional PhiAccrualFailureDetector instance
+            rescheduler: Optional PodRescheduler for pods on failed nodes
+            heartbeat_schedule: Optional HeartbeatSchedule handing out node
+                heartbeat intervals
+            redis_client: Optional RedisClient instance
+            node_manager: Optional NodeManager instance
+            clock: Epoch time source in seconds (default: time.time)
         """
         self.check_interval = check_interval
-        self.redis_client = RedisClient.get_instance()
-        self.node_manager = NodeManager(redis_client=self.redis_client)
+        self.reconcile_interval = reconcile_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.suspect_threshold = suspect_threshold
+        self.offline_threshold = offline_threshold
+        self.failure_detector = failure_detector or PhiAccrualFailureDetector()
+        self.rescheduler = rescheduler or PodRescheduler.get_instance()
+        self.heartbeat_schedule = heartbeat_schedule or HeartbeatSchedule()
+        self.clock = clock
+        self.heartbeat_cursor = clock() - heartbeat_timeout
+        self.last_reconcile = clock()
+        self.redis_client = redis_client or RedisClient.get_instance()
+        self.node_manager = node_manager or NodeManager(redis_client=self.redis_client)
         self.lock = threading.Lock()
         self.failed_nodes: Set[str] = set()
+        self.suspected_nodes: Set[str] = set()
+        self.offline_nodes: Set[str] = set()
         self.is_running = False
 
+    def observe_heartbeats(self):
+        """Feed heartbeats recorded since the last check into the failure detector"""
+        heartbeats = self.redis_client.get_heartbeats_since(
+            self.heartbeat_cursor - HEARTBEAT_READ_LAG
+        )
+        for node_id, timestamp in heartbeats:
+            if self.failure_detector.heartbeat(node_id, timestamp):
+                # The heartbeat itself has already set the node back online
+                self.offline_nodes.discard(node_id)
+            self.heartbeat_cursor = max(self.heartbeat_cursor, timestamp)
+
     def check_nodes_health(self):
-        """Check health of all nodes based on heartbeats"""
-        current_time = datetime.now()
-        nodes = self.node_manager.get_all_nodes()
-
-        for node in nodes:
-            if node.status != NodeStatus.OFFLINE and node.last_heartbeat:
-                # If heartbeat is older than 5 minutes, mark as offline
-                time_diff = (current_time - node.last_heartbeat).total_seconds()
-                if time_diff > 300:  # 5 minutes
-                    print(f"Node {node.id} missed heartbeat - marking as OFFLINE")
-                    self.node_manager.update_node_status(node.id, NodeStatus.OFFLINE)
-
-                    with self.lock:
-                        self.failed_nodes.add(node.id)
-
-    def check_node_resource_health(self, node) -> bool:
-        """Check if node resources are healthy and within limits"""
+        """Update node status from heartbeat suspicion levels and timeouts"""
+        now = self.clock()
+        self.observe_heartbeats()
+        cluster_state = self.redis_client.get_cluster_state()
+        self.failure_detector.expected_interval = self.heartbeat_schedule.interval(
+            cluster_state.node_count()
+        )
+
+        for node_id in self.failure_detector.tracked_nodes():
+            if cluster_state.get_node(node_id) is None:
+                # Deleted nodes leave the heartbeat index, so the backstop below
+                # never reports them
+                self._forget_node(node_id)
+                continue
+            if node_id in self.offline_nodes:
+                continue
+            phi = self.failure_detector.phi(node_id, now)
+            if phi >= self.offline_threshold:
+                logging.warning(
+                    f"Node {node_id} heartbeat phi {phi:.1f} - marking as OFFLINE"
+                )
+                self._mark_offline(node_id)
+            elif phi >= self.suspect_threshold:
+                if node_id not in self.suspected_nodes:
+                    logging.warning(f"Node {node_id} heartbeat phi {phi:.1f} - suspect")
+                    self.node_manager.update_node_status(node_id, NodeStatus.SUSPECT)
+                    self.suspected_nodes.add(node_id)
+            else:
+                # A fresh heartbeat has already set the node back online
+                self.suspected_nodes.discard(node_id)
+
+        # Backstop for nodes the detector has no history for. Nodes it already
+        # marked offline are only dropped from tracking here.
+        for node_id in self.redis_client.pop_stale_nodes(now - self.heartbeat_timeout):
+            if node_id not in self.offline_nodes:
+                logging.warning(f"Node {node_id} missed heartbeat - marking as OFFLINE")
+                self._mark_offline(node_id)
+            self.failure_detector.remove(node_id)
+            self.offline_nodes.discard(node_id)
+
+    def _mark_offline(self, node_id: str):
+        """Mark a node offline and move its pods to other nodes"""
+        self.node_manager.update_node_status(node_id, NodeStatus.OFFLINE)
+        self.suspected_nodes.discard(node_id)
+        self.offline_nodes.add(node_id)
+        self.rescheduler.evict_node(node_id)
+
+        with self.lock:
+            self.failed_nodes.add(node_id)
+
+    def _forget_node(self, node_id: str):
+        """Drop all failure detection state for a node that no longer exists"""
+        self.failure_detector.remove(node_id)
+        self.suspected_nodes.discard(node_id)
+        self.offline_nodes.discard(node_id)
+
+        with self.lock:
+            self.failed_nodes.discard(node_id)
+
+    def check_node_resource_health(self, node, usage=None) -> bool:
+        """Check if node resources are healthy and within limits
+
+        Args:
+            node: Node to check
+            usage: Optional pre-fetched usage from RedisClient.get_node_usage
+        """
         try:
             # Get current host resource limits
             host_resources = self.redis_client.get_connection().get("host:resources")
@@ -75,16 +187,13 @@ class HealthMonitorService:
 
             host_limits = HostResource.model_validate_json(host_resources)
 
-            # Get node's current pods and calculate resource usage
-            pods = self.redis_client.get_node_pods(node.id)
-            total_cpu_used = sum(pod.resources.cpu_cores for pod in pods)
-            total_memory_mb_used = sum(pod.resources.memory_mb for pod in pods)
+            # Get resources reserved by the node's pods
+            if usage is None:
+                usage = self.redis_client.get_node_usage(node.id)
 
             # Calculate utilization percentages
-            cpu_utilization = (total_cpu_used / node.resources.cpu_count) * 100
-            memory_utilization = (
-                total_memory_mb_used * 1024 * 1024 / node.resources.memory_total
-            ) * 100
+            cpu_utilization = (usage["cpu"] / node.resources.cpu_count) * 100
+            memory_utilization = (usage["memory"] / node.resources.memory_total) * 100
 
             # Check against limits
             if cpu_utilization > host_limits.cpu_limit_percent:
@@ -110,14 +219,27 @@ class HealthMonitorService:
             self.check_nodes_health()
             nodes = self.node_manager.get_all_nodes()
 
+            # Periodically repair drift in the per-node usage counters
+            if self.clock() - self.last_reconcile >= self.reconcile_interval:
+                corrected = self.redis_client.reconcile_node_usage()
+                if corrected:
+                    logging.warning(f"Corrected usage counters for nodes: {corrected}")
+                self.last_reconcile = self.clock()
+
+            # Resync the scheduler's in-memory view with writes from other processes
+            self.redis_client.refresh_cluster_state()
+
             # Calculate cluster-wide metrics
             online_nodes = [node for node in nodes if node.status == NodeStatus.ONLINE]
             if not online_nodes:
                 logging.warning("No online nodes found in cluster")
                 return
 
+            nodes_usage = self.redis_client.get_nodes_usage(
+                node.id for node in online_nodes
+            )
             for node in online_nodes:
-                if not self.check_node_resource_health(node):
+                if not self.check_node_resource_health(node, nodes_usage[node.id]):
                     logging.warning(f"Node {node.id} has resource issues")
         except Exception as e:
             logging.error(f"Error checking cluster health: {str(e)}")
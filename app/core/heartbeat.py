@@ -0,0 +1,244 @@
+"""
+Heartbeat Module
+
+Ingestion path for node heartbeats. Heartbeats can be written straight
+through, or buffered for a short window and flushed to Redis together. The
+control plane also decides when each node should send its next heartbeat.
+
+Key Features:
+- Single entry point for heartbeats from the API and simulated nodes
+- Per-node coalescing of buffered heartbeats
+- Batched flushes in a single pipelined round trip
+- Thread-safe submission from API worker threads
+- Per-node heartbeat phases spread evenly over the interval
+- Longer intervals as the cluster grows past the target heartbeat rate
+
+Environment Variables:
+    HEARTBEAT_FLUSH_INTERVAL: Seconds heartbeats are buffered before being
+        written together (default: 0, write through)
+    HEARTBEAT_INTERVAL: Heartbeat interval for small clusters (default: 30)
+    HEARTBEAT_MAX_INTERVAL: Longest heartbeat interval (default: 120)
+    HEARTBEAT_TARGET_RATE: Heartbeats per second the control plane aims to
+        receive (default: 100)
+"""
+
+import math
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+from ..models.node import NodeResources
+from ..utils.redis_client import RedisClient
+
+
+class HeartbeatBuffer:
+    """
+    Coalesces node heartbeats and flushes them to Redis in batches.
+
+    Only the latest heartbeat per node is kept between flushes, except that a
+    buffered resource report is not dropped by a later liveness-only
+    heartbeat from the same node.
+
+    Attributes:
+        flush_interval: Seconds between flushes; 0 disables buffering
+        pending: Latest (resources, status) per node since the last flush
+    """
+
+    def __init__(
+        self, redis_client: Optional[RedisClient] = None, flush_interval: float = 0.0
+    ):
+        """
+        Initialize the heartbeat buffer.
+
+        Args:
+            redis_client: Optional RedisClient instance
+            flush_interval: Seconds between flushes (default: 0, write through)
+        """
+        self.redis_client = redis_client or RedisClient.get_instance()
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending: Dict[str, Tuple[Optional[NodeResources], str]] = {}
+
+    def is_enabled(self) -> bool:
+        """Check if heartbeats are buffered rather than written through"""
+        return self.flush_interval > 0
+
+    def submit(
+        self, node_id: str, resources: Optional[NodeResources], status: str
+    ) -> bool:
+        """Record a heartbeat, buffering it if buffering is enabled
+
+        Returns:
+            False if the node is unknown
+        """
+        if not self.is_enabled():
+            return self.redis_client.record_heartbeat(node_id, resources, status)
+
+        if not self._is_known(node_id):
+            return False
+
+        with self.lock:
+            if resources is None and node_id in self.pending:
+                resources = self.pending[node_id][0]
+            self.pending[node_id] = (resources, status)
+        return True
+
+    def _is_known(self, node_id: str) -> bool:
+        """Check if a node is registered, through the cache when possible"""
+        cluster_state = self.redis_client.get_cluster_state()
+        if cluster_state.get_node(node_id) is not None:
+            return True
+        # The node may have been registered through another API worker
+        node = self.redis_client.get_node(node_id)
+        if node is None:
+            return False
+        cluster_state.upsert_node(node)
+        return True
+
+    def flush(self) -> int:
+        """Write all buffered heartbeats to Redis
+
+        Returns:
+            Number of heartbeats flushed
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return 0
+
+        try:
+            self.redis_client.record_heartbeats(
+                [
+                    (node_id, resources, status)
+                    for node_id, (resources, status) in pending.items()
+                ]
+            )
+        except Exception:
+            # Keep unflushed heartbeats unless newer ones arrived meanwhile
+            with self.lock:
+                for node_id, entry in pending.items():
+                    self.pending.setdefault(node_id, entry)
+            raise
+        return len(pending)
+
+
+class HeartbeatSchedule:
+    """
+    Assigns heartbeat intervals and phases to nodes.
+
+    Each node gets a fixed phase within the interval derived from its ID, so
+    nodes started together still spread their heartbeats evenly. When the
+    cluster is large enough that the base interval would exceed target_rate
+    heartbeats per second, the interval doubles until it does not, up to
+    max_interval.
+
+    Attributes:
+        base_interval: Heartbeat interval in seconds for small clusters
+        max_interval: Longest interval handed out, in seconds
+        target_rate: Heartbeats per second the control plane aims to receive
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 30.0,
+        max_interval: float = 120.0,
+        target_rate: float = 100.0,
+    ):
+        """
+        Initialize the heartbeat schedule.
+
+        Args:
+            base_interval: Interval for small clusters (default: 30)
+            max_interval: Longest interval handed out (default: 120)
+            target_rate: Target heartbeats per second (default: 100)
+        """
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.target_rate = target_rate
+
+    def interval(self, node_count: int) -> float:
+        """Get the heartbeat interval for a cluster of the given size"""
+        needed = node_count / self.target_rate
+        if needed <= self.base_interval:
+            return self.base_interval
+        # Step in doublings so intervals only change at a few cluster sizes
+        doublings = math.ceil(math.log2(needed / self.base_interval))
+        return min(self.max_interval, self.base_interval * 2**doublings)
+
+    def next_heartbeat_in(
+        self, node_id: str, node_count: int, now: float
+    ) -> Tuple[float, float]:
+        """Get a node's interval and the delay until its next heartbeat slot
+
+        Returns:
+            (interval, delay) in seconds; the delay is at least one second
+        """
+        interval = self.interval(node_count)
+        phase = zlib.crc32(node_id.encode()) / 2**32 * interval
+        delay = (phase - now) % interval
+        if delay < 1.0:
+            delay += interval
+        return interval, delay
+
+
+class HeartbeatReceiver:
+    """
+    Singleton entry point for node heartbeats.
+
+    Records each heartbeat through the buffer and tells the node when to
+    send its next one. Used by the heartbeat endpoint and by simulated
+    nodes, so both exercise the same path.
+
+    Attributes:
+        buffer: HeartbeatBuffer heartbeats are submitted to
+        schedule: HeartbeatSchedule assigning each node's next slot
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(
+                buffer=HeartbeatBuffer(
+                    flush_interval=float(os.environ.get("HEARTBEAT_FLUSH_INTERVAL", "0"))
+                ),
+                schedule=HeartbeatSchedule(
+                    base_interval=float(os.environ.get("HEARTBEAT_INTERVAL", "30")),
+                    max_interval=float(os.environ.get("HEARTBEAT_MAX_INTERVAL", "120")),
+                    target_rate=float(os.environ.get("HEARTBEAT_TARGET_RATE", "100")),
+                ),
+            )
+        return cls._instance
+
+    def __init__(
+        self,
+        buffer: Optional[HeartbeatBuffer] = None,
+        schedule: Optional[HeartbeatSchedule] = None,
+        clock=time.time,
+    ):
+        """
+        Initialize the heartbeat receiver.
+
+        Args:
+            buffer: Optional HeartbeatBuffer instance (default: write through)
+            schedule: Optional HeartbeatSchedule instance
+            clock: Epoch time source in seconds (default: time.time)
+        """
+        self.buffer = buffer or HeartbeatBuffer()
+        self.schedule = schedule or HeartbeatSchedule()
+        self.clock = clock
+
+    def receive(
+        self, node_id: str, resources: Optional[NodeResources], status: str
+    ) -> Optional[Tuple[float, float]]:
+        """Record a heartbeat and get the node's next heartbeat slot
+
+        Returns:
+            (interval, delay) in seconds, or None if the node is unknown
+        """
+        if not self.buffer.submit(node_id, resources, status):
+            return None
+        return self.schedule.next_heartbeat_in(
+            node_id, self.buffer.redis_client.cluster_state.node_count(), self.clock()
+        )
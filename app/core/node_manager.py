@@ -7,40 +7,64 @@ management and Redis for state persistence.
 
 Key Features:
 - Node creation and deletion
+- Parallel provisioning of node batches
+- Optional warm pool of pre-started containers
 - Resource tracking and updates
 - Container lifecycle management
 - Status management
+- Docker or in-process simulated node backends
 """
 
+import os
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from ..models.node import Node, NodeResources, NodeStatus
 from ..utils.redis_client import RedisClient
 from ..utils.docker_utils import DockerNodeManager
+from ..utils.node_backend import NodeBackend
+from ..utils.simulated_backend import SimulatedNodeBackend
+from .warm_pool import WarmPool
 import random
 
+
+def default_node_backend() -> NodeBackend:
+    """Get the node backend selected by NODE_BACKEND ("docker" or "simulated")"""
+    backend = os.environ.get("NODE_BACKEND", "docker")
+    if backend == "simulated":
+        return SimulatedNodeBackend.get_instance()
+    if backend != "docker":
+        raise ValueError(f"Unknown NODE_BACKEND: {backend}")
+    return DockerNodeManager()
+
+
 class NodeManager:
     """
     Manages node lifecycle and resources in the cluster.
     
     Handles node registration, status updates, resource tracking,
-    and container management through Docker integration.
+    and node lifecycle through a pluggable backend (Docker by default).
     
     Attributes:
         redis_client: Redis client for state persistence
-        docker_manager: Docker client for container management
+        backend: Node backend that starts and stops nodes
+        warm_pool: Pre-started containers claimed before starting new ones,
+            or None when the backend is not Docker
     """
     
-    def __init__(self, redis_client=None, docker_manager=None):
+    def __init__(self, redis_client=None, backend=None, warm_pool_size: int = 0):
         """
-        Initialize NodeManager with optional Redis and Docker clients.
+        Initialize NodeManager with optional Redis client and node backend.
         
         Args:
             redis_client: Optional RedisClient instance
-            docker_manager: Optional DockerNodeManager instance
+            backend: Optional NodeBackend instance (default: from NODE_BACKEND)
+            warm_pool_size: Number of warm containers to keep (default: 0, disabled)
         """
         self.redis_client = redis_client or RedisClient.get_instance()
-        self.docker_manager = docker_manager or DockerNodeManager()
+        self.backend = backend or default_node_backend()
+        self.warm_pool = None
+        if isinstance(self.backend, DockerNodeManager):
+            self.warm_pool = WarmPool(self.backend, warm_pool_size)
 
     def get_node(self, node_id: str) -> Optional[Node]:
         """Get a node by its ID"""
@@ -90,42 +114,95 @@ class NodeManager:
     def create_node_container(
         self, cpu_count: int, memory_mb: Optional[int] = None
     ) -> Dict:
-        """Create a new node as a Docker container"""
+        """Create a new node through the node backend"""
         try:
-            # Create the container
-            container_info = self.docker_manager.create_node_container(
-                cpu_count, memory_mb
-            )
-
-            # Convert MB to bytes for consistent storage
-            memory_bytes = memory_mb * 1024 * 1024 if memory_mb else 0
-            
-            # Create and store the node object
-            node = Node(
-                id=container_info["container_id"],  
-                hostname=container_info["hostname"],
-                ip_address=self._generate_random_ip(),
-                resources=NodeResources(
-                    cpu_count=cpu_count,
-                    memory_total=memory_bytes,
-                    memory_available=memory_bytes,
-                ),
-                status=NodeStatus.ONLINE,
-            )
-            
-            # Store the originally allocated resources separately to prevent overwriting
-            self.redis_client.store_allocated_resources(node.id, {
-                "cpu_count": cpu_count,
-                "memory_total": memory_bytes,
-                "memory_available": memory_bytes
-            })
-            
-            self.redis_client.store_node(node)
-
-            return {"node": node, "container": container_info}
+            container_info = self._start_container(cpu_count, memory_mb)
         except Exception as e:
             print(f"Failed to create node container: {str(e)}")
             raise
+        try:
+            node = self._register_node(container_info, cpu_count, memory_mb)
+            return {"node": node, "container": container_info}
+        except Exception as e:
+            print(f"Failed to register node container: {str(e)}")
+            self._discard_container(container_info)
+            raise
+
+    def create_node_containers(
+        self, specs: List[Tuple[int, Optional[int]]]
+    ) -> List[Dict]:
+        """Create several nodes through the node backend in parallel
+
+        Args:
+            specs: (cpu_count, memory_mb) for each node
+
+        Returns:
+            One result per spec, in order: {"node", "container"} on success or
+            {"error"} on failure
+        """
+        results = []
+        containers = self.backend.run_parallel(self._start_container, specs)
+        for (cpu_count, memory_mb), container_info in zip(specs, containers):
+            if isinstance(container_info, Exception):
+                print(f"Failed to create node container: {str(container_info)}")
+                results.append({"error": str(container_info)})
+                continue
+            try:
+                node = self._register_node(container_info, cpu_count, memory_mb)
+                results.append({"node": node, "container": container_info})
+            except Exception as e:
+                print(f"Failed to register node container: {str(e)}")
+                self._discard_container(container_info)
+                results.append({"error": str(e)})
+        return results
+
+    def _discard_container(self, container_info: Dict):
+        """Remove a started container that could not be registered, best effort"""
+        try:
+            self.backend.delete_node_container(container_info["container_id"])
+        except Exception as e:
+            print(f"Failed to remove unregistered node container: {str(e)}")
+
+    def _start_container(self, cpu_count: int, memory_mb: Optional[int]) -> Dict:
+        """Claim a warm container, or start a new one if the pool is empty"""
+        container_info = None
+        if self.warm_pool and self.warm_pool.is_enabled():
+            container_info = self.warm_pool.claim(cpu_count, memory_mb)
+        if container_info is None:
+            container_info = self.backend.create_node_container(
+                cpu_count, memory_mb
+            )
+        return container_info
+
+    def _register_node(
+        self, container_info: Dict, cpu_count: int, memory_mb: Optional[int]
+    ) -> Node:
+        """Store the node record and allocation for a newly started container"""
+        # Convert MB to bytes for consistent storage
+        memory_bytes = memory_mb * 1024 * 1024 if memory_mb else 0
+        
+        # Create and store the node object
+        node = Node(
+            id=container_info["container_id"],  
+            hostname=container_info["hostname"],
+            ip_address=self._generate_random_ip(),
+            resources=NodeResources(
+                cpu_count=cpu_count,
+                memory_total=memory_bytes,
+                memory_available=memory_bytes,
+            ),
+            status=NodeStatus.ONLINE,
+        )
+        
+        # Store the originally allocated resources separately to prevent overwriting
+        self.redis_client.store_allocated_resources(node.id, {
+            "cpu_count": cpu_count,
+            "memory_total": memory_bytes,
+            "memory_available": memory_bytes
+        })
+        
+        self.redis_client.store_node(node)
+        return node
 
     def stop_node(self, node_id: str) -> bool:
         """Stop a node's container"""
@@ -133,7 +210,7 @@ class NodeManager:
         if not node:
             return False
         # Stop the container
-        if self.docker_manager.stop_node_container(node.id):
+        if self.backend.stop_node_container(node.id):
             # Update node status
             node.status = NodeStatus.OFFLINE
             self.redis_client.store_node(node)
@@ -146,7 +223,7 @@ class NodeManager:
         if not node:
             return False
         # Restart the container
-        if self.docker_manager.restart_node_container(node.id):
+        if self.backend.restart_node_container(node.id):
             # Update node status
             node.status = NodeStatus.ONLINE
             self.redis_client.store_node(node)
@@ -159,8 +236,11 @@ class NodeManager:
         if not node:
             return False
         
-        # First delete the container
-        if not self.docker_manager.delete_node_container(node.id):
+        # Removing the container fires a die event; the flag stops the
+        # events watcher from rescheduling pods that are about to be deleted
+        self.redis_client.mark_node_deleting(node.id)
+        if not self.backend.delete_node_container(node.id):
+            self.redis_client.mark_node_deleting(node.id, deleting=False)
             return False
             
         # Clean up any pods associated with this node
@@ -169,7 +249,6 @@ class NodeManager:
             self.redis_client.delete_pod(pod.id)
             
         # Remove node from Redis
-        self.redis_client.delete(f"node:{node_id}")
-        self.redis_client.get_connection().srem("nodes", node_id)
+        self.redis_client.delete_node(node_id)
             
         return True
@@ -0,0 +1,168 @@
+"""
+Pending Queue Module
+
+Places pods waiting in the Redis pending queue whenever cluster capacity
+changes.
+
+Key Features:
+- Persistent FIFO of pending pods in Redis
+- Batched placement through the scheduler
+- Wake-ups on capacity changes with a periodic fallback
+- Token-bucket rate limit on placements
+"""
+
+import threading
+import time
+from typing import Optional
+from ..models.pod import PodStatus
+from ..utils.redis_client import RedisClient
+from .scheduler import Scheduler
+
+
+class PendingPodQueue:
+    """
+    Singleton drainer for the pending pod queue.
+
+    Pods land in the queue when the scheduler cannot place them. A drain
+    pops a batch, places what fits, and the scheduler appends the rest back
+    to the tail. Draining stops as soon as a batch places nothing, and
+    resumes when the in-memory cluster state reports new free capacity that
+    fits the pod at the head of the queue, when notify() is called, or after
+    idle_interval seconds (which also picks up capacity freed by other API
+    workers and pods stuck behind one that does not fit).
+
+    Attributes:
+        batch_size: Maximum pods popped per batch
+        rate: Pods placed per second
+        idle_interval: Seconds between drains when nothing signals a change
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(
+        self,
+        scheduler: Optional[Scheduler] = None,
+        redis_client: Optional[RedisClient] = None,
+        batch_size: int = 200,
+        rate: float = 500.0,
+        idle_interval: float = 10.0,
+        clock=time.monotonic,
+    ):
+        """
+        Initialize the pending queue.
+
+        Args:
+            scheduler: Optional Scheduler instance
+            redis_client: Optional RedisClient instance
+            batch_size: Maximum pods popped per batch (default: 200)
+            rate: Pods placed per second (default: 500)
+            idle_interval: Seconds between drains without a wake-up (default: 10)
+            clock: Monotonic time source in seconds (default: time.monotonic)
+        """
+        self.scheduler = scheduler or Scheduler()
+        self.redis_client = redis_client or self.scheduler.redis_client
+        self.batch_size = batch_size
+        self.rate = rate
+        self.idle_interval = idle_interval
+        self.clock = clock
+        self.tokens = float(batch_size)
+        self.last_refill = self.clock()
+        self.last_drain = 0.0
+        self.seen_capacity_version = -1
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+
+    def notify(self):
+        """Request a drain on the next check"""
+        self.wakeup.set()
+
+    def should_drain(self) -> bool:
+        """Check if a drain was requested, the idle interval elapsed, or new
+        capacity could fit the pod at the head of the queue"""
+        if self.wakeup.is_set() or self.clock() - self.last_drain >= self.idle_interval:
+            return True
+
+        cluster_state = self.redis_client.cluster_state
+        if cluster_state.capacity_version == self.seen_capacity_version:
+            return False
+        self.seen_capacity_version = cluster_state.capacity_version
+        return self._head_fits()
+
+    def _head_fits(self) -> bool:
+        """Check if any node has room for the pod at the head of the queue"""
+        pod_id = self.redis_client.get_pending_head()
+        if pod_id is None:
+            return False
+        pod = self.redis_client.get_pod(pod_id)
+        if pod is None:
+            # Let a drain clear out the deleted pod
+            return True
+        return (
+            self.redis_client.get_cluster_state().find_best_fit(
+                pod.resources.cpu_cores, pod.resources.memory_mb * 1024 * 1024
+            )
+            is not None
+        )
+
+    def drain(self) -> int:
+        """Place queued pods in batches until one places nothing
+
+        Returns:
+            Number of pods placed
+        """
+        with self.lock:
+            self.wakeup.clear()
+            self.last_drain = self.clock()
+            self.seen_capacity_version = (
+                self.redis_client.get_cluster_state().capacity_version
+            )
+
+            placed = 0
+            while True:
+                count = self._take_tokens(self.batch_size)
+                if not count:
+                    # Rate limited: come back on the next check
+                    self.wakeup.set()
+                    break
+
+                pod_ids = self.redis_client.pop_pending_pods(count)
+                self.tokens += count - len(pod_ids)
+                if not pod_ids:
+                    break
+
+                placed_now = self._place(list(dict.fromkeys(pod_ids)))
+                placed += placed_now
+                if not placed_now:
+                    break
+            return placed
+
+    def _place(self, pod_ids) -> int:
+        """Place popped pods; unplaced ones are requeued by the scheduler"""
+        # Skip pods deleted or placed since they were queued
+        pods = [
+            pod
+            for pod in self.redis_client.get_pods(pod_ids)
+            if pod.status == PodStatus.PENDING and not pod.node_id
+        ]
+        try:
+            self.scheduler.place_pods(pods, queued=True)
+        except Exception:
+            self.redis_client.requeue_pending_pods(pod_ids)
+            raise
+        return sum(1 for pod in pods if pod.status == PodStatus.RUNNING)
+
+    def _take_tokens(self, wanted: int) -> int:
+        """Refill the token bucket and take up to the wanted number of tokens"""
+        now = self.clock()
+        self.tokens = min(
+            float(self.batch_size), self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+        taken = min(int(self.tokens), wanted)
+        self.tokens -= taken
+        return taken
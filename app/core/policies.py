@@ -0,0 +1,139 @@
+"""
+Scheduling Policies Module
+
+Pluggable node-selection policies for the scheduler. Each policy scores
+every schedulable node at once with NumPy array expressions, so a decision
+costs a handful of vector operations rather than a Python loop over nodes.
+
+Key Features:
+- Registry of policies selectable by name
+- Best-fit, worst-fit, first-fit, spread and dominant-resource scoring
+- Vectorized fit checks over CPU and memory
+- Scoring straight over the cluster state's columnar capacity table
+"""
+
+from typing import Dict, Optional
+import numpy as np
+from .capacity_table import NodeCapacityTable
+
+DEFAULT_POLICY = "best-fit"
+
+
+class SchedulingPolicy:
+    """
+    Base class for node-selection policies.
+
+    Subclasses implement score(); the online node with the lowest score among
+    those that fit wins, with ties going to the lower slot.
+
+    Attributes:
+        name: Name the policy is registered and selected under
+        description: One-line summary shown by the API
+    """
+
+    name = ""
+    description = ""
+
+    def score(self, nodes: NodeCapacityTable, cpu: int, memory: int) -> np.ndarray:
+        """Score every node for a pod; lower is better"""
+        raise NotImplementedError
+
+    def select(self, nodes: NodeCapacityTable, cpu: int, memory: int) -> Optional[int]:
+        """Get the slot of the chosen node, or None if no node fits"""
+        if not len(nodes):
+            return None
+        fits = nodes.fits(cpu, memory)
+        scores = np.where(fits, self.score(nodes, cpu, memory), np.inf)
+        position = int(np.argmin(scores))
+        return position if fits[position] else None
+
+
+class BestFitPolicy(SchedulingPolicy):
+    name = "best-fit"
+    description = "Least free CPU left after placement, then least free memory"
+
+    def score(self, nodes, cpu, memory):
+        # Memory left is scaled below one core so CPU always dominates
+        memory_left = (nodes.free_memory - memory) / (nodes.free_memory.max() + 1.0)
+        return (nodes.free_cpu - cpu) + memory_left
+
+
+class WorstFitPolicy(SchedulingPolicy):
+    name = "worst-fit"
+    description = "Most free CPU left after placement, then most free memory"
+
+    def score(self, nodes, cpu, memory):
+        memory_left = (nodes.free_memory - memory) / (nodes.free_memory.max() + 1.0)
+        return -((nodes.free_cpu - cpu) + memory_left)
+
+
+class FirstFitPolicy(SchedulingPolicy):
+    name = "first-fit"
+    description = "Node in the lowest table slot with room"
+
+    def score(self, nodes, cpu, memory):
+        # Slots are handed out in registration order and reused after removals
+        return np.arange(len(nodes), dtype=np.float64)
+
+    def select(self, nodes, cpu, memory):
+        # The first fitting slot needs no scores at all
+        if not len(nodes):
+            return None
+        fits = nodes.fits(cpu, memory)
+        slot = int(np.argmax(fits))
+        return slot if fits[slot] else None
+
+
+class SpreadPolicy(SchedulingPolicy):
+    name = "spread"
+    description = "Fewest pods, then lowest allocated share, to keep pods apart"
+
+    def score(self, nodes, cpu, memory):
+        return nodes.pod_count + _allocated_share(nodes, cpu, memory) / 2
+
+
+class DominantResourcePolicy(SchedulingPolicy):
+    name = "dominant-resource"
+    description = "Lowest dominant CPU or memory share after placement"
+
+    def score(self, nodes, cpu, memory):
+        return _allocated_share(nodes, cpu, memory)
+
+
+def _allocated_share(nodes: NodeCapacityTable, cpu: int, memory: int) -> np.ndarray:
+    """Get each node's larger allocated share of CPU or memory after placement"""
+    cpu_share = 1 - (nodes.free_cpu - cpu) / np.maximum(nodes.cpu_count, 1)
+    memory_share = 1 - (nodes.free_memory - memory) / np.maximum(nodes.memory_total, 1)
+    return np.maximum(cpu_share, memory_share)
+
+
+POLICIES: Dict[str, SchedulingPolicy] = {}
+
+
+def register_policy(policy: SchedulingPolicy):
+    """Make a policy selectable by its name"""
+    POLICIES[policy.name] = policy
+
+
+def get_policy(name: str) -> SchedulingPolicy:
+    """Get a registered policy by name
+
+    Raises:
+        ValueError: If no policy is registered under the name
+    """
+    policy = POLICIES.get(name)
+    if policy is None:
+        raise ValueError(
+            f"Unknown scheduling policy '{name}', expected one of: {', '.join(POLICIES)}"
+        )
+    return policy
+
+
+for _policy in (
+    BestFitPolicy(),
+    WorstFitPolicy(),
+    FirstFitPolicy(),
+    SpreadPolicy(),
+    DominantResourcePolicy(),
+):
+    register_policy(_policy)
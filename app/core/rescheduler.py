@@ -0,0 +1,68 @@
+"""
+Rescheduler Module
+
+Moves pods off nodes that have gone offline and hands them back to the
+scheduler through the pending queue.
+
+Key Features:
+- Bulk eviction of a failed node's pods back to pending
+- Immediate release of the failed node's capacity
+- Rate-limited re-placement through the pending queue
+"""
+
+import logging
+from typing import Optional
+from ..models.pod import PodStatus
+from ..utils.redis_client import RedisClient
+from .pending_queue import PendingPodQueue
+
+
+class PodRescheduler:
+    """
+    Singleton controller that re-places pods from failed nodes.
+
+    Evicted pods are stored as pending and appended to the pending queue in
+    one transaction, which releases their node's capacity straight away. The
+    pending queue then re-places them in rate-limited batches, so a large
+    failure cannot flood the scheduler and Redis.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        pending_queue: Optional[PendingPodQueue] = None,
+    ):
+        """
+        Initialize the rescheduler.
+
+        Args:
+            redis_client: Optional RedisClient instance
+            pending_queue: Optional PendingPodQueue instance
+        """
+        self.pending_queue = pending_queue or PendingPodQueue.get_instance()
+        self.redis_client = redis_client or self.pending_queue.redis_client
+
+    def evict_node(self, node_id: str) -> int:
+        """Move a node's pods back to pending and queue them for placement
+
+        Returns:
+            Number of pods evicted
+        """
+        pods = self.redis_client.get_node_pods(node_id)
+        if not pods:
+            return 0
+
+        for pod in pods:
+            pod.node_id = None
+            pod.status = PodStatus.PENDING
+        self.redis_client.store_pods(pods, enqueue=True)
+        self.pending_queue.notify()
+        logging.info(f"Evicted {len(pods)} pods from node {node_id}")
+        return len(pods)
@@ -4,50 +4,119 @@ Scheduler Module
 
 
 Key Features:
-- Best-fit pod scheduling
+- Pluggable placement policies over CPU and memory, best-fit by default
+- Cluster-wide policy stored in Redis, overridable per pod
 - Resource availability checking
-- Node selection based on optimal resource fit
-"""
+- In-memory cluster state lookups
+- Largest-first placement for pod batches
+- Atomic reservation of placements in Redis
 
-# Best-Fit scheduler
+Environment Variables:
+    SCHEDULER_POLICY: Cluster policy used until one is set through the API
+        (default: best-fit)
+"""
 
+import logging
+import os
+import time
 from typing import Optional, List
-from ..models.node import Node, NodeStatus
-from ..models.pod import Pod
+from ..models.node import Node
+from ..models.pod import Pod, PodStatus
 from ..utils.redis_client import RedisClient
 from .node_manager import NodeManager
+from .policies import DEFAULT_POLICY, BestFitPolicy, SchedulingPolicy, get_policy
 
 
 class Scheduler:
     """
-    Best-fit scheduler for pod placement.
+    Policy-driven scheduler for pod placement.
     
-    Implements scheduling logic to place pods on nodes with the best resource fit,
-    maximizing resource utilization while meeting pod requirements.
+    Places each pod on the node chosen by its scheduling policy: the pod's own
+    policy if it names one, otherwise the cluster policy. Best-fit lookups go
+    through the capacity index kept by the cluster state cache; other policies
+    score its columnar capacity table, covering every node at once.
+
+    Attributes:
+        max_reservation_attempts: Times a pod is re-placed after a conflict
+        policy: Pinned cluster policy name, or None to follow Redis
+        policy_refresh_interval: Seconds between reads of the cluster policy
     """
     
-    def __init__(self):
-        """Initialize scheduler with Redis client and node manager."""
-        self.redis_client = RedisClient.get_instance()
-        self.node_manager = NodeManager(redis_client=self.redis_client)
+    def __init__(
+        self,
+        max_reservation_attempts: int = 3,
+        redis_client: Optional[RedisClient] = None,
+        node_manager: Optional[NodeManager] = None,
+        policy: Optional[str] = None,
+        policy_refresh_interval: float = 5.0,
+    ):
+        """
+        Initialize scheduler with Redis client and node manager.
+
+        Args:
+            max_reservation_attempts: Times a pod is re-placed after losing its
+                node's capacity to a concurrent reservation (default: 3)
+            redis_client: Optional RedisClient instance
+            node_manager: Optional NodeManager instance
+            policy: Cluster policy to always use instead of the one in Redis
+            policy_refresh_interval: Seconds the cluster policy read from
+                Redis is reused (default: 5)
+        """
+        self.redis_client = redis_client or RedisClient.get_instance()
+        self.node_manager = node_manager or NodeManager(redis_client=self.redis_client)
+        self.max_reservation_attempts = max_reservation_attempts
+        self.policy = get_policy(policy).name if policy else None
+        self.policy_refresh_interval = policy_refresh_interval
+        self.cluster_policy = os.environ.get("SCHEDULER_POLICY", DEFAULT_POLICY)
+        self.policy_checked_at: Optional[float] = None
+
+    def get_cluster_policy(self) -> SchedulingPolicy:
+        """Get the cluster-wide policy, re-reading Redis when the cached name expires"""
+        if self.policy:
+            return get_policy(self.policy)
+
+        now = time.monotonic()
+        if (
+            self.policy_checked_at is None
+            or now - self.policy_checked_at >= self.policy_refresh_interval
+        ):
+            self.policy_checked_at = now
+            name = self.redis_client.get_scheduler_policy()
+            if name:
+                self.cluster_policy = name
+        try:
+            return get_policy(self.cluster_policy)
+        except ValueError as e:
+            logging.error(f"{str(e)} - falling back to {DEFAULT_POLICY}")
+            return get_policy(DEFAULT_POLICY)
+
+    def set_cluster_policy(self, name: str) -> SchedulingPolicy:
+        """Store a new cluster-wide policy and use it straight away
+
+        Raises:
+            ValueError: If no policy is registered under the name
+        """
+        policy = get_policy(name)
+        self.redis_client.set_scheduler_policy(policy.name)
+        self.cluster_policy = policy.name
+        self.policy_checked_at = time.monotonic()
+        return policy
+
+    def get_pod_policy(self, pod: Pod) -> SchedulingPolicy:
+        """Get the policy a pod is placed with"""
+        if pod.scheduling_policy:
+            return get_policy(pod.scheduling_policy)
+        return self.get_cluster_policy()
 
     def get_available_nodes(self) -> List[Node]:
         """Get all online nodes"""
-        all_nodes = self.node_manager.get_all_nodes()
-        return [node for node in all_nodes if node.status == NodeStatus.ONLINE]
+        return self.redis_client.get_cluster_state().get_online_nodes()
 
     def can_node_fit_pod(self, node: Node, pod: Pod) -> bool:
         """Check if a node has enough resources for a pod"""
-        # Get existing pods on this node
-        node_pods = self.redis_client.get_node_pods(node.id)
-
-        # Calculate used resources
-        used_cpu = sum(p.resources.cpu_cores for p in node_pods)
-        used_memory = sum(p.resources.memory_mb * 1024 * 1024 for p in node_pods)
-
-        # Check if node can support this pod
-        available_cpu = node.resources.cpu_count - used_cpu
-        available_memory = node.resources.memory_available
+        available_cpu, available_memory = (
+            self.redis_client.get_cluster_state().get_free_resources(node.id)
+        )
 
         return (
             available_cpu >= pod.resources.cpu_cores
@@ -55,28 +124,113 @@ class Scheduler:
         )
 
     def schedule_pod(self, pod: Pod) -> Optional[Node]:
-        """Schedule a pod using Best-Fit algorithm"""
-        available_nodes = self.get_available_nodes()
-        if not available_nodes:
-            return None
-
-        # Find the node with the least remaining resources that can fit the pod
-        best_fit_node = None
-        minimum_remaining_cpu = float("inf")
-
-        for node in available_nodes:
-            if not self.can_node_fit_pod(node, pod):
-                continue
-
-            # Calculate remaining CPU after placing this pod
-            node_pods = self.redis_client.get_node_pods(node.id)
-            used_cpu = sum(p.resources.cpu_cores for p in node_pods)
-            remaining_cpu = (
-                node.resources.cpu_count - used_cpu - pod.resources.cpu_cores
-            )
-
-            if 0 <= remaining_cpu < minimum_remaining_cpu:
-                minimum_remaining_cpu = remaining_cpu
-                best_fit_node = node
-
-        return best_fit_node
+        """Choose a node for a pod with its scheduling policy"""
+        cluster_state = self.redis_client.get_cluster_state()
+        policy = self.get_pod_policy(pod)
+        cpu = pod.resources.cpu_cores
+        memory = pod.resources.memory_mb * 1024 * 1024
+        with cluster_state.lock:
+            node_id = self._select_node(cluster_state, policy, cpu, memory)
+            return cluster_state.get_node(node_id) if node_id else None
+
+    def schedule_pods(self, pods: List[Pod]) -> List[Pod]:
+        """Schedule a batch of pods, largest first
+
+        Pods are placed largest first (CPU, then memory), each on the node
+        chosen by its policy, with earlier placements reserved in the cluster
+        state so later pods see the remaining capacity. With best-fit this is
+        Best-Fit-Decreasing bin packing. Pods are updated in place with their
+        node and status; the caller is responsible for persisting them.
+        """
+        cluster_state = self.redis_client.get_cluster_state()
+        ordered = sorted(
+            pods,
+            key=lambda p: (p.resources.cpu_cores, p.resources.memory_mb),
+            reverse=True,
+        )
+
+        with cluster_state.lock:
+            for pod in ordered:
+                node_id = self._select_node(
+                    cluster_state,
+                    self.get_pod_policy(pod),
+                    pod.resources.cpu_cores,
+                    pod.resources.memory_mb * 1024 * 1024,
+                )
+                if node_id:
+                    pod.node_id = node_id
+                    pod.status = PodStatus.RUNNING
+                    # Reserve the capacity for the rest of the batch
+                    cluster_state.add_pod(pod)
+                else:
+                    pod.node_id = None
+                    pod.status = PodStatus.PENDING
+
+        return pods
+
+    def _select_node(
+        self, cluster_state, policy: SchedulingPolicy, cpu: int, memory: int
+    ) -> Optional[str]:
+        """Get the ID of the node a policy chooses; the caller holds the cache lock"""
+        if isinstance(policy, BestFitPolicy):
+            # The capacity index answers best-fit without scoring every node
+            node = cluster_state.find_best_fit(cpu, memory)
+            return node.id if node else None
+        table = cluster_state.capacity_table
+        slot = policy.select(table, cpu, memory)
+        return None if slot is None else table.node_ids[slot]
+
+    def place_pods(self, pods: List[Pod], queued: bool = False) -> List[Pod]:
+        """Schedule pods and atomically reserve their nodes in Redis
+
+        Placements are planned against the in-memory cluster state, then
+        checked and written by a single Redis script. Pods rejected because
+        another worker claimed the capacity first are re-planned against
+        refreshed node usage. Pods that still cannot be placed are stored as
+        pending and appended to the pending queue.
+
+        Args:
+            pods: Pods to place
+            queued: The pods were popped from the pending queue and are
+                already stored as pending, so unplaced ones are only
+                appended to the queue again by ID
+        """
+        cluster_state = self.redis_client.get_cluster_state()
+        unplaced = list(pods)
+
+        try:
+            for _ in range(self.max_reservation_attempts):
+                self.schedule_pods(unplaced)
+                planned = [pod for pod in unplaced if pod.node_id]
+                if not planned:
+                    break
+
+                reserved = self.redis_client.reserve_pods(planned)
+                rejected = [pod for pod, ok in zip(planned, reserved) if not ok]
+                unplaced = [pod for pod in unplaced if not pod.node_id] + rejected
+                if not rejected:
+                    break
+
+                # Drop the stale reservations and resync the contended nodes
+                for pod in rejected:
+                    cluster_state.remove_pod(pod.id)
+                self.redis_client.sync_node_usage({pod.node_id for pod in rejected})
+
+            # Anything left over waits as a pending pod
+            for pod in unplaced:
+                cluster_state.remove_pod(pod.id)
+                pod.node_id = None
+                pod.status = PodStatus.PENDING
+            if unplaced and queued:
+                # Rewriting unchanged records could also revive deleted pods
+                self.redis_client.requeue_pending_pods(
+                    [pod.id for pod in unplaced], at_tail=True
+                )
+            elif unplaced:
+                self.redis_client.store_pods(unplaced, enqueue=True)
+        except Exception:
+            # Tentative placements may now disagree with Redis
+            cluster_state.invalidate()
+            raise
+
+        return pods
@@ -0,0 +1,450 @@
+"""
+Simulator Module
+
+Discrete-event simulation of the control plane. The real scheduler, pending
+queue, rescheduler, health monitor and cleanup manager run against an
+in-memory store on a virtual clock, so hours of cluster activity replay in
+seconds and scheduling or failure-detection changes can be compared on
+identical workloads.
+
+Key Features:
+- Virtual clock shared by the store, health monitor and pending queue
+- Seeded workload generation with Poisson pod arrivals and node failures
+- Node heartbeats on the intervals and phases handed out by the control plane
+- Crash failures left to the failure detector, graceful ones reported
+  straight to the cleanup manager
+- Wait time, eviction, detection latency and utilisation statistics
+"""
+
+import heapq
+import math
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..models.node import NodeStatus
+from ..models.pod import Pod, PodResources
+from ..models.simulation import (
+    NodeFailure,
+    PodArrival,
+    SimulatedNodeSpec,
+    SimulationResult,
+    Workload,
+)
+from ..utils.cleanup import CleanupManager
+from ..utils.memory_store import InMemoryRedisClient
+from ..utils.node_backend import NodeBackend
+from .health_monitor import HealthMonitorService
+from .heartbeat import HeartbeatSchedule
+from .node_manager import NodeManager
+from .pending_queue import PendingPodQueue
+from .rescheduler import PodRescheduler
+from .scheduler import Scheduler
+
+# Virtual time starts at a fixed epoch so runs are reproducible
+SIMULATION_EPOCH = 1_700_000_000.0
+# Matches the polling interval of the API's pending pod scheduler
+PENDING_POLL_INTERVAL = 0.1
+
+
+class VirtualClock:
+    """Simulated time in epoch seconds, advanced only by the simulator"""
+
+    def __init__(self, start: float = SIMULATION_EPOCH):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class VirtualNodeBackend(NodeBackend):
+    """Node backend whose nodes exist only as events in the simulator"""
+
+    def __init__(self):
+        self.created = 0
+
+    def create_node_container(
+        self, cpu_count: int, memory_mb: Optional[int] = None
+    ) -> Dict:
+        """Name a new virtual node"""
+        self.created += 1
+        node_id = f"vnode-{self.created:05d}"
+        return {"container_id": node_id, "hostname": node_id, "ip_address": "0.0.0.0"}
+
+    def stop_node_container(self, container_id: str) -> bool:
+        return True
+
+    def restart_node_container(self, container_id: str) -> bool:
+        return True
+
+    def delete_node_container(self, container_id: str) -> bool:
+        return True
+
+
+def generate_workload(
+    node_count: int = 100,
+    duration: float = 3600.0,
+    arrival_rate: float = 1.0,
+    mean_pod_duration: float = 600.0,
+    failure_count: int = 0,
+    mean_recovery: Optional[float] = 600.0,
+    graceful_fraction: float = 0.5,
+    seed: Optional[int] = None,
+) -> Workload:
+    """Generate a random workload
+
+    Args:
+        node_count: Nodes registered at the start (default: 100)
+        duration: Seconds over which pods arrive and nodes fail (default: 3600)
+        arrival_rate: Mean pod arrivals per second (default: 1)
+        mean_pod_duration: Mean seconds a pod runs (default: 600)
+        failure_count: Node failures injected (default: 0)
+        mean_recovery: Mean seconds until a failed node returns, or None to
+            keep failed nodes down (default: 600)
+        graceful_fraction: Share of failures reported by the backend
+            (default: 0.5)
+        seed: Random seed for a reproducible workload
+    """
+    rng = random.Random(seed)
+
+    nodes = []
+    for _ in range(node_count):
+        cpu_count = rng.choice((2, 4, 8, 16))
+        nodes.append(SimulatedNodeSpec(cpu_count=cpu_count, memory_mb=cpu_count * 2048))
+
+    pods = []
+    at = rng.expovariate(arrival_rate)
+    while at < duration:
+        cpu_cores = rng.choice((1, 1, 1, 2, 2, 4))
+        pods.append(
+            PodArrival(
+                at=at,
+                cpu_cores=cpu_cores,
+                memory_mb=cpu_cores * rng.choice((256, 512, 1024, 2048)),
+                duration=rng.expovariate(1 / mean_pod_duration),
+            )
+        )
+        at += rng.expovariate(arrival_rate)
+
+    failures = [
+        NodeFailure(
+            at=rng.uniform(0, duration),
+            node=rng.randrange(node_count),
+            recover_after=rng.expovariate(1 / mean_recovery) if mean_recovery else None,
+            graceful=rng.random() < graceful_fraction,
+        )
+        for _ in range(failure_count)
+    ]
+    failures.sort(key=lambda failure: failure.at)
+    return Workload(nodes=nodes, pods=pods, failures=failures)
+
+
+class Simulator:
+    """
+    Replays a workload against the real control-plane components.
+
+    Events (heartbeats, health checks, pod arrivals and completions, node
+    failures and recoveries) are kept in a heap ordered by virtual time.
+    After each event the pending queue is drained if it would be by the API's
+    background task. Placed pods complete after their duration; pods evicted
+    by a failure restart from scratch when placed again.
+
+    Attributes:
+        workload: Workload being replayed
+        clock: Virtual clock shared by every component
+        store: In-memory store standing in for Redis
+        scheduler: Scheduler placing arriving pods
+        pending_queue: Pending queue placing waiting and evicted pods
+        health_monitor: Health monitor running the failure detector
+        cleanup_manager: Cleanup manager handling graceful failures
+        heartbeat_schedule: Source of node heartbeat intervals and phases
+        heartbeat_jitter: Maximum seconds a heartbeat lands after its slot
+    """
+
+    def __init__(
+        self,
+        workload: Workload,
+        check_interval: float = 5.0,
+        heartbeat_timeout: float = 300.0,
+        heartbeat_schedule: Optional[HeartbeatSchedule] = None,
+        heartbeat_jitter: float = 0.5,
+        policy: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the simulator.
+
+        Args:
+            workload: Workload to replay
+            check_interval: Seconds between failure detector checks (default: 5)
+            heartbeat_timeout: Heartbeat timeout backstop in seconds (default: 300)
+            heartbeat_schedule: Optional HeartbeatSchedule for node intervals
+            heartbeat_jitter: Maximum heartbeat delivery delay (default: 0.5)
+            policy: Cluster scheduling policy (default: SCHEDULER_POLICY)
+            seed: Random seed for heartbeat jitter
+        """
+        self.workload = workload
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.store = InMemoryRedisClient(clock=self.clock)
+        self.store.pod_listeners.append(self._on_pod_moved)
+        self.node_manager = NodeManager(
+            redis_client=self.store, backend=VirtualNodeBackend()
+        )
+        self.scheduler = Scheduler(
+            redis_client=self.store, node_manager=self.node_manager, policy=policy
+        )
+        self.pending_queue = PendingPodQueue(
+            scheduler=self.scheduler, redis_client=self.store, clock=self.clock
+        )
+        self.rescheduler = PodRescheduler(
+            redis_client=self.store, pending_queue=self.pending_queue
+        )
+        self.heartbeat_schedule = heartbeat_schedule or HeartbeatSchedule()
+        self.heartbeat_jitter = heartbeat_jitter
+        self.check_interval = check_interval
+        self.health_monitor = HealthMonitorService(
+            check_interval=check_interval,
+            heartbeat_timeout=heartbeat_timeout,
+            rescheduler=self.rescheduler,
+            heartbeat_schedule=self.heartbeat_schedule,
+            redis_client=self.store,
+            node_manager=self.node_manager,
+            clock=self.clock,
+        )
+        self.cleanup_manager = CleanupManager(
+            redis_client=self.store,
+            rescheduler=self.rescheduler,
+            node_manager=self.node_manager,
+        )
+
+        self.events: List[tuple] = []
+        self.sequence = 0
+        self.next_pending_check: Optional[float] = None
+        self.node_ids: List[str] = []
+        # Bumped to cancel a node's outstanding heartbeat chain
+        self.node_generation: Dict[str, int] = {}
+        self.down_nodes = set()
+        self.undetected: Dict[str, float] = {}
+        self.pod_durations: Dict[str, float] = {}
+        self.unplaced_since: Dict[str, float] = {}
+        self.pod_epoch: Dict[str, int] = {}
+        self.wait_times: List[float] = []
+        self.detection_times: List[float] = []
+        self.utilization_samples: List[tuple] = []
+        self.pods_submitted = 0
+        self.pods_completed = 0
+        self.pods_evicted = 0
+        self.failures_injected = 0
+
+    def run(self, duration: Optional[float] = None) -> SimulationResult:
+        """Replay the workload and summarize what happened
+
+        Args:
+            duration: Simulated seconds to run (default: until the last pod
+                arrival or failure)
+        """
+        if duration is None:
+            duration = max(
+                [arrival.at for arrival in self.workload.pods]
+                + [failure.at for failure in self.workload.failures]
+                + [0.0]
+            )
+        started = time.perf_counter()
+        start = self.clock.now
+        end = start + duration
+        self._schedule_workload(start)
+
+        processed = 0
+        events = self.events
+        while events and events[0][0] <= end:
+            at, _, handler, args = heapq.heappop(events)
+            self.clock.now = at
+            handler(*args)
+            self._check_pending()
+            processed += 1
+        self.clock.now = end
+
+        return self._result(duration, time.perf_counter() - started, processed)
+
+    def _push(self, at: float, handler, *args):
+        """Schedule handler(*args) at virtual time at"""
+        self.sequence += 1
+        heapq.heappush(self.events, (at, self.sequence, handler, args))
+
+    def _schedule_workload(self, start: float):
+        """Register the workload's nodes and queue its arrivals and failures"""
+        for spec in self.workload.nodes:
+            node = self.node_manager.create_node_container(
+                spec.cpu_count, spec.memory_mb
+            )["node"]
+            self.node_ids.append(node.id)
+            self.node_generation[node.id] = 0
+            self._push(start + self.rng.uniform(0, 1), self._heartbeat, node.id, 0)
+
+        for index, arrival in enumerate(self.workload.pods):
+            self._push(start + arrival.at, self._arrive, index, arrival)
+        for failure in self.workload.failures:
+            self._push(start + failure.at, self._fail, failure)
+        self._push(start + self.check_interval, self._check_health)
+
+    def _heartbeat(self, node_id: str, generation: int):
+        """Deliver a liveness heartbeat and schedule the node's next one"""
+        if self.node_generation[node_id] != generation:
+            return
+        now = self.clock.now
+        self.store.record_heartbeats([(node_id, None, "online")])
+        _, delay = self.heartbeat_schedule.next_heartbeat_in(
+            node_id, self.store.cluster_state.node_count(), now
+        )
+        self._push(
+            now + delay + self.rng.uniform(0, self.heartbeat_jitter),
+            self._heartbeat,
+            node_id,
+            generation,
+        )
+
+    def _check_health(self):
+        """Run the failure detector and sample cluster utilisation"""
+        now = self.clock.now
+        self.health_monitor.check_nodes_health()
+
+        for node_id, failed_at in list(self.undetected.items()):
+            node = self.store.get_node(node_id)
+            if node is None or node.status == NodeStatus.OFFLINE:
+                self.detection_times.append(now - failed_at)
+                del self.undetected[node_id]
+
+        summary = self.store.cluster_state.get_cluster_summary()
+        self.utilization_samples.append(
+            (summary["average_cpu_utilization"], summary["average_memory_utilization"])
+        )
+        self._push(now + self.check_interval, self._check_health)
+
+    def _arrive(self, index: int, arrival: PodArrival):
+        """Submit a pod through the scheduler"""
+        now = self.clock.now
+        pod = Pod(
+            id=f"sim-pod-{index:07d}",
+            name=f"sim-pod-{index}",
+            resources=PodResources(
+                cpu_cores=arrival.cpu_cores, memory_mb=arrival.memory_mb
+            ),
+            created_at=datetime.fromtimestamp(now),
+        )
+        self.pods_submitted += 1
+        self.pod_durations[pod.id] = arrival.duration
+        self.unplaced_since[pod.id] = now
+        self.scheduler.place_pods([pod])
+
+    def _on_pod_moved(self, pod: Pod, previous_node_id: Optional[str]):
+        """Track placements and evictions as the store sees them"""
+        if pod.id not in self.pod_durations:
+            return
+        now = self.clock.now
+        # Any completion scheduled for the previous placement is now stale
+        epoch = self.pod_epoch.get(pod.id, 0) + 1
+        self.pod_epoch[pod.id] = epoch
+        if previous_node_id:
+            self.pods_evicted += 1
+        if pod.node_id:
+            submitted = self.unplaced_since.pop(pod.id, None)
+            if submitted is not None:
+                self.wait_times.append(now - submitted)
+            self._push(now + self.pod_durations[pod.id], self._complete, pod.id, epoch)
+        elif previous_node_id:
+            # An evicted pod waits again until it is placed elsewhere
+            self.unplaced_since[pod.id] = now
+
+    def _complete(self, pod_id: str, epoch: int):
+        """Remove a pod that ran for its full duration"""
+        if self.pod_epoch.get(pod_id) != epoch:
+            return
+        self.store.delete_pod(pod_id)
+        del self.pod_durations[pod_id]
+        del self.pod_epoch[pod_id]
+        self.pods_completed += 1
+
+    def _fail(self, failure: NodeFailure):
+        """Take a node down, either silently or through the cleanup manager"""
+        node_id = self.node_ids[failure.node]
+        if node_id in self.down_nodes:
+            return
+        now = self.clock.now
+        self.failures_injected += 1
+        self.down_nodes.add(node_id)
+        self.node_generation[node_id] += 1
+        if failure.graceful:
+            self.cleanup_manager.cleanup_node(node_id)
+        else:
+            self.undetected[node_id] = now
+        if failure.recover_after:
+            self._push(now + failure.recover_after, self._recover, node_id)
+
+    def _recover(self, node_id: str):
+        """Bring a failed node back; its first heartbeat sets it online"""
+        self.down_nodes.discard(node_id)
+        # A node back before it was noticed counts as undetected
+        self.undetected.pop(node_id, None)
+        self.node_generation[node_id] += 1
+        self._push(
+            self.clock.now + self.rng.uniform(0, 1),
+            self._heartbeat,
+            node_id,
+            self.node_generation[node_id],
+        )
+
+    def _check_pending(self):
+        """Drain the pending queue when the API's background task would"""
+        if not self.store.get_pending_count():
+            return
+        queue = self.pending_queue
+        if queue.should_drain():
+            queue.drain()
+            if not self.store.get_pending_count():
+                return
+
+        # Make sure the run wakes up for the next drain: the next poll if
+        # rate limited, otherwise when the idle interval runs out
+        now = self.clock.now
+        due = now + PENDING_POLL_INTERVAL
+        if not queue.wakeup.is_set():
+            due = max(due, queue.last_drain + queue.idle_interval)
+        if self.next_pending_check is None or not now < self.next_pending_check <= due:
+            self.next_pending_check = due
+            self._push(due, lambda: None)
+
+    def _result(
+        self, simulated: float, wall: float, processed: int
+    ) -> SimulationResult:
+        """Summarize the run"""
+        waits = sorted(self.wait_times)
+        detections = self.detection_times
+        samples = self.utilization_samples
+        pending = sum(1 for pod in self.store.get_all_pods() if not pod.node_id)
+        return SimulationResult(
+            simulated_seconds=simulated,
+            wall_seconds=wall,
+            speedup=simulated / wall if wall else 0.0,
+            events=processed,
+            pods_submitted=self.pods_submitted,
+            pods_completed=self.pods_completed,
+            pods_evicted=self.pods_evicted,
+            pods_pending=pending,
+            mean_wait_seconds=sum(waits) / len(waits) if waits else 0.0,
+            p99_wait_seconds=(
+                waits[max(0, math.ceil(0.99 * len(waits)) - 1)] if waits else 0.0
+            ),
+            failures_injected=self.failures_injected,
+            failures_detected=len(detections),
+            mean_detection_seconds=(
+                sum(detections) / len(detections) if detections else None
+            ),
+            max_detection_seconds=max(detections) if detections else None,
+            average_cpu_utilization=(
+                sum(cpu for cpu, _ in samples) / len(samples) if samples else 0.0
+            ),
+            average_memory_utilization=(
+                sum(memory for _, memory in samples) / len(samples) if samples else 0.0
+            ),
+        )
@@ -0,0 +1,117 @@
+"""
+Warm Pool Module
+
+Keeps a number of node containers started ahead of time so that node
+registration only has to apply resource limits instead of starting a
+container.
+
+Key Features:
+- Configurable pool of idle, pre-started node containers
+- Claims that resource-limit a warm container in place
+- Background refill back up to the target size
+- Adoption of warm containers left over from a previous run
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional
+from ..utils.docker_utils import DockerNodeManager
+
+
+class WarmPool:
+    """
+    Pool of pre-started node containers.
+
+    Claims take the oldest warm container; when the pool is empty the caller
+    falls back to starting a container cold. Refills run outside the claim
+    path so registration never waits on a container start.
+
+    Attributes:
+        size: Number of warm containers to keep; 0 disables the pool
+        idle: IDs of warm containers ready to be claimed
+        starting: Number of warm containers currently being started
+    """
+
+    def __init__(self, docker_manager: Optional[DockerNodeManager] = None, size: int = 0):
+        """
+        Initialize the warm pool.
+
+        Args:
+            docker_manager: Optional DockerNodeManager instance
+            size: Number of warm containers to keep (default: 0, disabled)
+        """
+        self.docker_manager = docker_manager or DockerNodeManager()
+        self.size = size
+        self.idle = deque()
+        self.starting = 0
+        self.lock = threading.Lock()
+
+    def is_enabled(self) -> bool:
+        """Check if warm containers are kept at all"""
+        return self.size > 0
+
+    def adopt(self) -> int:
+        """Take over warm containers that are already running
+
+        Returns:
+            Number of containers adopted
+        """
+        container_ids = self.docker_manager.list_warm_containers()
+        with self.lock:
+            known = set(self.idle)
+            adopted = [cid for cid in container_ids if cid not in known]
+            self.idle.extend(adopted)
+        return len(adopted)
+
+    def claim(self, cpu_count: int, memory_mb: Optional[int] = None) -> Optional[Dict]:
+        """Resource-limit a warm container and hand it out as a node
+
+        Returns:
+            Container info, or None if no warm container could be claimed
+        """
+        while True:
+            with self.lock:
+                if not self.idle:
+                    return None
+                container_id = self.idle.popleft()
+            try:
+                return self.docker_manager.claim_warm_container(
+                    container_id, cpu_count, memory_mb
+                )
+            except Exception as e:
+                logging.warning(f"Discarding warm container {container_id}: {str(e)}")
+                self.docker_manager.delete_node_container(container_id)
+
+    def deficit(self) -> int:
+        """Get the number of containers needed to reach the target size"""
+        with self.lock:
+            return max(0, self.size - len(self.idle) - self.starting)
+
+    def refill(self) -> int:
+        """Start warm containers until the pool reaches its target size
+
+        Returns:
+            Number of containers started
+        """
+        with self.lock:
+            count = max(0, self.size - len(self.idle) - self.starting)
+            self.starting += count
+        if not count:
+            return 0
+
+        started = 0
+        try:
+            for container_id in self.docker_manager.run_parallel(
+                self.docker_manager.create_warm_container, [()] * count
+            ):
+                if isinstance(container_id, Exception):
+                    logging.error(f"Failed to start warm container: {str(container_id)}")
+                    continue
+                with self.lock:
+                    self.idle.append(container_id)
+                started += 1
+        finally:
+            with self.lock:
+                self.starting -= count
+        return started
@@ -2,37 +2,83 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
 import logging
-from .api import nodes, pods, health, host
+import os
+from .api import nodes, pods, health, host, metrics, scheduler
+from .core.container_events import ContainerEventWatcher
+from .core.heartbeat import HeartbeatBuffer
+from .core.pending_queue import PendingPodQueue
+from .core.warm_pool import WarmPool
 from .core.health_monitor import HealthMonitorService
 from .utils.redis_client import RedisHostResourceMonitor
 from .utils.cleanup import CleanupManager
+from .utils.docker_utils import DockerNodeManager
+from .utils.executors import run_blocking, run_docker, shutdown_executors
 from contextlib import asynccontextmanager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    health_monitor = HealthMonitorService()
+    health_monitor = HealthMonitorService(
+        heartbeat_timeout=float(os.environ.get("HEARTBEAT_TIMEOUT", "300")),
+        heartbeat_schedule=health.heartbeat_schedule,
+    )
     host_monitor = RedisHostResourceMonitor()
+    pending_queue = PendingPodQueue.get_instance()
     cleanup_manager = CleanupManager()
+    event_watcher = None
+    if isinstance(nodes.node_manager.backend, DockerNodeManager):
+        event_watcher = ContainerEventWatcher(
+            docker_manager=nodes.node_manager.backend,
+            cleanup_manager=cleanup_manager,
+        )
+
+    # Repair usage counters that drifted while the API was down
+    corrected = await run_blocking(health_monitor.redis_client.reconcile_node_usage)
+    if corrected:
+        logging.info(f"Reconciled resource usage for {len(corrected)} nodes")
+    await run_blocking(health_monitor.redis_client.rebuild_heartbeat_index)
+    await run_blocking(health_monitor.redis_client.rebuild_pending_queue)
 
     # Start background tasks
-    host_monitor_task = asyncio.create_task(run_host_monitor(host_monitor))
-    health_monitor_task = asyncio.create_task(run_health_monitor(health_monitor))
+    background_tasks = [
+        asyncio.create_task(run_host_monitor(host_monitor)),
+        asyncio.create_task(run_health_monitor(health_monitor)),
+        asyncio.create_task(
+            run_failure_detector(
+                health_monitor,
+                float(os.environ.get("FAILURE_CHECK_INTERVAL", "1")),
+            )
+        ),
+        asyncio.create_task(run_pending_scheduler(pending_queue)),
+    ]
+    if health.heartbeat_buffer.is_enabled():
+        background_tasks.append(
+            asyncio.create_task(run_heartbeat_flusher(health.heartbeat_buffer))
+        )
+    warm_pool = nodes.node_manager.warm_pool
+    if warm_pool and warm_pool.is_enabled():
+        adopted = await run_docker(warm_pool.adopt)
+        if adopted:
+            logging.info(f"Adopted {adopted} warm node containers")
+        background_tasks.append(asyncio.create_task(run_warm_pool_refill(warm_pool)))
+    if event_watcher:
+        event_watcher.start()
     logging.info("Started resource monitoring services")
 
     yield
 
     # Shutdown: Clean up resources and cancel background tasks
     logging.info("Starting cleanup process...")
-    cleanup_manager.cleanup_stale_resources()
-    host_monitor_task.cancel()
-    health_monitor_task.cancel()
-    try:
-        await host_monitor_task
-        await health_monitor_task
-    except asyncio.CancelledError:
-        pass
+    if event_watcher:
+        event_watcher.stop()
+    await run_blocking(cleanup_manager.cleanup_stale_resources)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if health.heartbeat_buffer.is_enabled():
+        await run_blocking(health.heartbeat_buffer.flush)
+    shutdown_executors()
     logging.info("Cleanup completed")
 
 
@@ -57,6 +103,8 @@ app.include_router(nodes.router, prefix="/nodes", tags=["nodes"])
 app.include_router(pods.router, prefix="/pods", tags=["pods"])
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(host.router, prefix="/host", tags=["host"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(scheduler.router, prefix="/scheduler", tags=["scheduler"])
 
 # Configure logging
 logging.basicConfig(
@@ -68,7 +116,7 @@ async def run_host_monitor(host_monitor: RedisHostResourceMonitor):
     """Run host resource monitoring in the background"""
     while True:
         try:
-            host_monitor.update_host_resources()
+            await run_blocking(host_monitor.update_host_resources)
             await asyncio.sleep(30)  # Update every 30 seconds
         except Exception as e:
             logging.error(f"Error in host monitor: {str(e)}")
@@ -79,13 +127,68 @@ async def run_health_monitor(health_monitor: HealthMonitorService):
     """Run cluster health monitoring in the background"""
     while True:
         try:
-            health_monitor.check_cluster_health()
+            await run_blocking(health_monitor.check_cluster_health)
             await asyncio.sleep(60)  # Check every minute
         except Exception as e:
             logging.error(f"Error in health monitor: {str(e)}")
             await asyncio.sleep(5)
 
 
+async def run_failure_detector(health_monitor: HealthMonitorService, interval: float):
+    """Detect nodes that stopped sending heartbeats in the background"""
+    while True:
+        try:
+            await run_blocking(health_monitor.check_nodes_health)
+            await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in failure detector: {str(e)}")
+            await asyncio.sleep(5)
+
+
+async def run_pending_scheduler(pending_queue: PendingPodQueue):
+    """Place pending pods in the background whenever capacity frees up"""
+    while True:
+        try:
+            # should_drain may read the queue head from Redis
+            if await run_blocking(pending_queue.should_drain):
+                await run_blocking(pending_queue.drain)
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error in pending pod scheduler: {str(e)}")
+            await asyncio.sleep(5)
+
+
+async def run_heartbeat_flusher(heartbeat_buffer: HeartbeatBuffer):
+    """Flush buffered heartbeats to Redis in the background"""
+    while True:
+        try:
+            await asyncio.sleep(heartbeat_buffer.flush_interval)
+            await run_blocking(heartbeat_buffer.flush)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error flushing heartbeats: {str(e)}")
+            await asyncio.sleep(1)
+
+
+async def run_warm_pool_refill(warm_pool: WarmPool):
+    """Keep the warm pool of node containers topped up in the background"""
+    while True:
+        try:
+            if warm_pool.deficit():
+                await run_docker(warm_pool.refill)
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error refilling warm pool: {str(e)}")
+            await asyncio.sleep(5)
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
@@ -12,7 +12,7 @@ Key Features:
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -20,6 +20,7 @@ import uuid
 
 class NodeStatus(str, Enum):
     ONLINE = "online"
+    SUSPECT = "suspect"
     OFFLINE = "offline"
 
 
@@ -27,6 +28,7 @@ class NodeResources(BaseModel):
     cpu_count: int
     memory_total: int  # In bytes
     memory_available: int  # In bytes
+    cpu_utilization: Optional[float] = None  # Percent of cpu_count in use, if measured
 
 
 class Node(BaseModel):
@@ -47,3 +49,8 @@ class Node(BaseModel):
 class NodeRegistration(BaseModel):
     cpu_count: int
     memory_mb: Optional[int] = None
+
+
+class NodeBatchRegistration(BaseModel):
+    """Request body for registering several nodes at once"""
+    nodes: List[NodeRegistration] = Field(..., min_length=1)
@@ -9,10 +9,11 @@ Key Features:
 - Resource requirement specification
 - Creation timestamps
 - Node assignment tracking
+- Optional per-pod scheduling policy
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 import uuid
 from datetime import datetime
@@ -42,9 +43,15 @@ class Pod(BaseModel):
     node_id: Optional[str] = None
     status: PodStatus = PodStatus.PENDING
     resources: PodResources
+    scheduling_policy: Optional[str] = None  # Cluster policy when unset
     created_at: datetime = Field(default_factory=datetime.now)
 
 
 class PodCreation(BaseModel):
     name: str
     resources: PodResources
+    scheduling_policy: Optional[str] = None
+
+
+class PodBatchCreation(BaseModel):
+    pods: List[PodCreation] = Field(..., min_length=1)
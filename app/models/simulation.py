@@ -0,0 +1,68 @@
+"""
+Simulation Model Module
+
+Defines the workloads replayed by the cluster simulator and the results it
+reports.
+
+Key Features:
+- Node, pod arrival and node failure descriptions
+- Times in seconds from the start of the simulation
+- Summary statistics for scheduling and failure detection
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class SimulatedNodeSpec(BaseModel):
+    cpu_count: int = Field(..., ge=1)
+    memory_mb: int = Field(..., ge=0)
+
+
+class PodArrival(BaseModel):
+    at: float = Field(..., ge=0, description="Seconds from the start of the run")
+    cpu_cores: int = Field(..., ge=1)
+    memory_mb: int = Field(..., ge=0)
+    duration: float = Field(..., gt=0, description="Seconds the pod runs once placed")
+
+
+class NodeFailure(BaseModel):
+    at: float = Field(..., ge=0, description="Seconds from the start of the run")
+    node: int = Field(..., ge=0, description="Index into the workload's nodes")
+    recover_after: Optional[float] = Field(
+        None, gt=0, description="Seconds until the node comes back, if ever"
+    )
+    graceful: bool = Field(
+        False, description="Reported by the node backend rather than left to detection"
+    )
+
+
+class Workload(BaseModel):
+    """
+    A reproducible cluster scenario.
+
+    Nodes are registered at time zero, then pod arrivals and node failures
+    are replayed at their given times.
+    """
+    nodes: List[SimulatedNodeSpec] = Field(..., min_length=1)
+    pods: List[PodArrival] = []
+    failures: List[NodeFailure] = []
+
+
+class SimulationResult(BaseModel):
+    simulated_seconds: float
+    wall_seconds: float
+    speedup: float
+    events: int
+    pods_submitted: int
+    pods_completed: int
+    pods_evicted: int
+    pods_pending: int
+    mean_wait_seconds: float
+    p99_wait_seconds: float
+    failures_injected: int
+    failures_detected: int
+    mean_detection_seconds: Optional[float] = None
+    max_detection_seconds: Optional[float] = None
+    average_cpu_utilization: float
+    average_memory_utilization: float
@@ -3,33 +3,37 @@ from typing import Optional
 from .redis_client import RedisClient
 from ..models.node import NodeStatus
 from ..core.node_manager import NodeManager
+from ..core.rescheduler import PodRescheduler
 
 logger = logging.getLogger(__name__)
 
 
 class CleanupManager:
-    def __init__(self, redis_client: Optional[RedisClient] = None):
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        rescheduler: Optional[PodRescheduler] = None,
+        node_manager: Optional[NodeManager] = None,
+    ):
         self.redis_client = redis_client or RedisClient.get_instance()
-        self.node_manager = NodeManager(redis_client=self.redis_client)
+        self.node_manager = node_manager or NodeManager(redis_client=self.redis_client)
+        self.rescheduler = rescheduler or PodRescheduler.get_instance()
 
     def cleanup_node(self, node_id: str) -> bool:
         """Clean up node data and related resources"""
         try:
-            # Get node's pods
-            node_pods = self.redis_client.get_node_pods(node_id)
-
-            # Clean up pods
-            for pod in node_pods:
-                self.redis_client.delete_pod(pod.id)
-                logger.info(f"Cleaned up pod {pod.id} from node {node_id}")
-
-            # Remove node from Redis
+            # Take the node out of scheduling before moving its pods
             node = self.node_manager.get_node(node_id)
             if node:
                 node.status = NodeStatus.OFFLINE
                 self.redis_client.store_node(node)
                 logger.info(f"Node {node_id} marked as offline")
 
+            # Send the node's pods back through the scheduler
+            evicted = self.rescheduler.evict_node(node_id)
+            if evicted:
+                logger.info(f"Rescheduling {evicted} pods from node {node_id}")
+
             return True
         except Exception as e:
             logger.error(f"Error cleaning up node {node_id}: {str(e)}")
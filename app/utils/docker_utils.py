@@ -9,6 +9,8 @@ Key Features:
 - Resource constraint configuration
 - Network management
 - Container health monitoring
+- Parallel container provisioning
+- Pre-started warm containers claimed on demand
 """
 
 # Node container management
@@ -16,11 +18,16 @@ Key Features:
 import docker
 import uuid
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import os
+from .node_backend import NodeBackend
 
+NODE_NAME_PREFIX = "nexus-node-"
+WARM_NAME_PREFIX = "nexus-warm-"
+NODE_ROLE_LABEL = "nexuscore.role"
 
-class DockerNodeManager:
+
+class DockerNodeManager(NodeBackend):
     """
     Manages Docker containers that simulate cluster nodes.
     
@@ -48,33 +55,16 @@ class DockerNodeManager:
             cpu_count: Number of CPU cores to allocate
             memory_mb: Memory limit in MB (optional)
         """
-        node_name = f"nexus-node-{str(uuid.uuid4())[:8]}"
+        node_name = f"{NODE_NAME_PREFIX}{str(uuid.uuid4())[:8]}"
         
         # Ensure proper resource constraints
         nano_cpus = int(cpu_count * 1e9)  # Convert CPU count to nano CPUs
         memory_bytes = memory_mb * 1024 * 1024 if memory_mb else None
 
         # Container configuration
-        container_options = {
-            "image": "nexuscore-node:latest",
-            "name": node_name,
-            "detach": True,
-            "environment": {
-                "NODE_CPU_COUNT": str(cpu_count),
-                "NODE_ID": node_name,
-                "API_URL": os.environ.get(
-"NODE_API_URL", "http://host.docker.internal:8000"
-),
-                "PYTHONUNBUFFERED": "1",
-                "LOG_LEVEL": "INFO",
-            },
-            "network": self.network_name,
-            "nano_cpus": nano_cpus,  # Set CPU limit using nano CPUs
-            "log_config": {
-                "type": "json-file",
-                "config": {"max-size": "10m", "max-file": "3"},
-            }
-        }
+        container_options = self._container_options(node_name)
+        container_options["environment"]["NODE_CPU_COUNT"] = str(cpu_count)
+        container_options["nano_cpus"] = nano_cpus  # Set CPU limit using nano CPUs
 
         # Set memory constraints if specified
         if memory_bytes:
@@ -83,22 +73,8 @@ class DockerNodeManager:
             container_options["environment"]["NODE_MEMORY_MB"] = str(memory_mb)
 
         try:
-            # Try to remove any existing container with the same name
-            try:
-                old_container = self.client.containers.get(node_name)
-                old_container.remove(force=True)
-            except:
-                pass
-
             container = self.client.containers.run(**container_options)
-            container.reload()
-
-            # Wait briefly and check container is actually running
-            time.sleep(2)
-            container.reload()
-            if container.status != "running":
-                logs = container.logs().decode("utf-8")
-                raise Exception(f"Container failed to start. Logs: {logs}")
+            self._wait_until_running(container)
 
             ip_address = container.attrs["NetworkSettings"]["Networks"][
                 self.network_name
@@ -114,6 +90,116 @@ class DockerNodeManager:
             print(f"Error creating container: {str(e)}")
             raise
 
+    def create_warm_container(self) -> str:
+        """Start an idle node container without resource limits
+
+        Returns:
+            ID of the running container
+        """
+        options = self._container_options(
+            f"{WARM_NAME_PREFIX}{str(uuid.uuid4())[:8]}"
+        )
+        container = self.client.containers.run(**options)
+        try:
+            self._wait_until_running(container)
+        except Exception:
+            container.remove(force=True)
+            raise
+        return container.id
+
+    def list_warm_containers(self) -> List[str]:
+        """Get the IDs of running warm containers, removing any that stopped"""
+        container_ids = []
+        for container in self.client.containers.list(
+            all=True, filters={"name": WARM_NAME_PREFIX}
+        ):
+            if not container.name.startswith(WARM_NAME_PREFIX):
+                continue
+            if container.status == "running":
+                container_ids.append(container.id)
+            else:
+                container.remove(force=True)
+        return container_ids
+
+    def claim_warm_container(
+        self, container_id: str, cpu_count: int, memory_mb: Optional[int] = None
+    ) -> Dict:
+        """Turn a warm container into a node by applying its resource limits
+
+        Args:
+            container_id: ID of a running warm container
+            cpu_count: Number of CPU cores to allocate
+            memory_mb: Memory limit in MB (optional)
+        """
+        container = self.client.containers.get(container_id)
+        limits = {"cpu_period": 100000, "cpu_quota": int(cpu_count * 100000)}
+        if memory_mb:
+            limits["mem_limit"] = memory_mb * 1024 * 1024
+            limits["memswap_limit"] = memory_mb * 1024 * 1024  # Disable swap
+        container.update(**limits)
+
+        node_name = NODE_NAME_PREFIX + container.name[len(WARM_NAME_PREFIX):]
+        container.rename(node_name)
+        container.reload()
+        if container.status != "running":
+            raise Exception(f"Warm container {container_id} is no longer running")
+
+        ip_address = container.attrs["NetworkSettings"]["Networks"][
+            self.network_name
+        ]["IPAddress"]
+        print(f"Claimed warm container {node_name} with IP {ip_address}")
+        return {
+            "container_id": container.id,
+            "hostname": node_name,
+            "ip_address": ip_address,
+        }
+
+    def _container_options(self, name: str) -> Dict:
+        """Build the common run options for a node container"""
+        return {
+            "image": "nexuscore-node:latest",
+            "name": name,
+            "detach": True,
+            "labels": {NODE_ROLE_LABEL: "node"},
+            "environment": {
+                "NODE_ID": name,
+                "API_URL": os.environ.get(
+                    "NODE_API_URL", "http://host.docker.internal:8000"
+                ),
+                "PYTHONUNBUFFERED": "1",
+                "LOG_LEVEL": "INFO",
+            },
+            "network": self.network_name,
+            "log_config": {
+                "type": "json-file",
+                "config": {"max-size": "10m", "max-file": "3"},
+            },
+        }
+
+    def _wait_until_running(
+        self, container, timeout: float = 30.0, initial_delay: float = 0.05
+    ):
+        """Poll a container with exponential backoff until it is running
+
+        Raises:
+            Exception: If the container exits or is not running within timeout
+        """
+        delay = initial_delay
+        deadline = time.monotonic() + timeout
+        while True:
+            container.reload()
+            if container.status == "running":
+                return
+            if container.status in ("exited", "dead"):
+                logs = container.logs().decode("utf-8")
+                raise Exception(f"Container failed to start. Logs: {logs}")
+            if time.monotonic() >= deadline:
+                raise Exception(
+                    f"Container not running after {timeout}s (status: {container.status})"
+                )
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
     def stop_node_container(self, container_id: str) -> bool:
         """Stop a node container"""
         try:
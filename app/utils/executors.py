@@ -0,0 +1,76 @@
+"""
+Executors Module
+
+Bounded thread pools for running blocking Redis and Docker calls from async
+API handlers without stalling the event loop.
+
+Key Features:
+- Separate pools for storage and container operations
+- Pool sizes configurable through environment variables
+- Awaitable helpers for use in FastAPI handlers
+- Pools created on first use, so the app can be started again after a
+  shutdown in the same process
+
+Docker calls get their own small pool so that slow container starts cannot
+use up the threads that serve heartbeats and other Redis-backed requests.
+
+Environment Variables:
+    REDIS_EXECUTOR_WORKERS: Threads for Redis-backed work (default: 32)
+    DOCKER_EXECUTOR_WORKERS: Threads for Docker SDK calls (default: 8)
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+EXECUTOR_WORKERS = {
+    "redis": ("REDIS_EXECUTOR_WORKERS", "32"),
+    "docker": ("DOCKER_EXECUTOR_WORKERS", "8"),
+}
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    """Get the "redis" or "docker" thread pool, creating it if needed"""
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            variable, default = EXECUTOR_WORKERS[kind]
+            executor = _executors[kind] = ThreadPoolExecutor(
+                max_workers=int(os.environ.get(variable, default)),
+                thread_name_prefix=f"nexuscore-{kind}",
+            )
+        return executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking Redis-backed call on the storage thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor("redis"), functools.partial(func, *args, **kwargs)
+    )
+
+
+async def run_docker(func, *args, **kwargs):
+    """Run a blocking Docker SDK call on the container thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor("docker"), functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_executors():
+    """Stop both thread pools, waiting for running calls to finish
+
+    The next call that needs a pool creates a fresh one.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
@@ -14,6 +14,10 @@ class HostResourceMonitor:
             memory_available=psutil.virtual_memory().available,
         )
 
+    def cpu_utilization(self) -> float:
+        """Get host CPU utilisation in percent since the previous call"""
+        return psutil.cpu_percent(interval=None)
+
     def update_metrics(self) -> HostResource:
         """Collect metrics and return as HostResources object"""
         return self.collect_metrics()
@@ -0,0 +1,354 @@
+"""
+Memory Store Module
+
+In-process stand-in for RedisClient used by the cluster simulator. It keeps
+the same records and applies the same rules as the Redis scripts, but in
+plain dictionaries and on an injectable clock.
+
+Key Features:
+- Drop-in RedisClient replacement for nodes, pods, heartbeats and the
+  pending queue
+- Same reservation, usage counter and heartbeat semantics as the Lua scripts
+- Timestamps taken from a caller-supplied clock
+- Listeners notified whenever a pod is assigned to or released from a node
+"""
+
+import heapq
+import time
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+from ..models.node import Node, NodeStatus
+from ..models.pod import Pod, PodStatus
+from ..core.cluster_state import ClusterStateCache
+from .redis_client import RedisClient
+
+
+class InMemoryRedisClient(RedisClient):
+    """
+    RedisClient backed by in-process dictionaries.
+
+    Records are copied on the way in and out, so callers can mutate what
+    they read exactly as they would a freshly deserialized Redis value.
+    Only the storage methods are overridden; caching, scheduling and health
+    logic built on RedisClient run unchanged.
+
+    Attributes:
+        clock: Callable returning the current time in epoch seconds
+        pod_listeners: Callables invoked as listener(pod, previous_node_id)
+            after a stored pod's node assignment changes
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Initialize an empty store.
+
+        Args:
+            clock: Source of the current time in epoch seconds
+                (default: time.time)
+        """
+        self.redis = None
+        self.metrics = None
+        self.cluster_state = ClusterStateCache()
+        self.clock = clock
+        self.pod_listeners: List[Callable] = []
+        self.node_records: Dict[str, Node] = {}
+        self.allocated: Dict[str, Dict] = {}
+        self.deleting: Set[str] = set()
+        self.pod_records: Dict[str, Pod] = {}
+        # Pod IDs per node in insertion order, so evictions replay identically
+        self.node_pods: Dict[str, Dict[str, None]] = {}
+        self.usage: Dict[str, List[int]] = {}
+        self.pending = deque()
+        self.scheduler_policy: Optional[str] = None
+        # Heartbeat index: latest score per node, a min-heap for staleness
+        # and an arrival-ordered log for range reads. Entries superseded by
+        # a newer heartbeat are skipped lazily.
+        self.heartbeat_scores: Dict[str, float] = {}
+        self.heartbeat_heap: List[tuple] = []
+        self.heartbeat_log: List[tuple] = []
+
+    def get_connection(self):
+        """There is no Redis connection behind the memory store"""
+        return None
+
+    def store_node(self, node: Node):
+        """Store node information"""
+        self.node_records[node.id] = node.model_copy()
+        self.cluster_state.upsert_node(node)
+        return True
+
+    def get_node(self, node_id: str) -> Optional[Node]:
+        """Get node information"""
+        node = self.node_records.get(node_id)
+        return node.model_copy() if node else None
+
+    def get_all_nodes(self, batch_size: Optional[int] = None) -> List[Node]:
+        """Get all nodes"""
+        return [node.model_copy() for node in self.node_records.values()]
+
+    def delete_node(self, node_id: str) -> bool:
+        """Delete a node"""
+        self.heartbeat_scores.pop(node_id, None)
+        self.usage.pop(node_id, None)
+        self.deleting.discard(node_id)
+        deleted = self.node_records.pop(node_id, None) is not None
+        self.cluster_state.remove_node(node_id)
+        return deleted
+
+    def mark_node_deleting(self, node_id: str, deleting: bool = True, ttl: int = 300):
+        """Flag a node whose container is being removed, or clear the flag"""
+        if deleting:
+            self.deleting.add(node_id)
+        else:
+            self.deleting.discard(node_id)
+
+    def is_node_deleting(self, node_id: str) -> bool:
+        """Check if a node's container is being removed"""
+        return node_id in self.deleting
+
+    def store_allocated_resources(self, node_id: str, resources: Dict):
+        """Store the originally allocated resources for a node"""
+        self.allocated[node_id] = dict(resources)
+
+    def get_allocated_resources(self, node_id: str) -> Optional[Dict]:
+        """Get the originally allocated resources for a node"""
+        allocated = self.allocated.get(node_id)
+        return dict(allocated) if allocated else None
+
+    def record_heartbeats(self, heartbeats: list) -> List[bool]:
+        """Record node heartbeats, applying the allocation clamp like the script"""
+        now = self.clock()
+        timestamp = datetime.fromtimestamp(now)
+        recorded = []
+        for node_id, resources, status in heartbeats:
+            node = self.node_records.get(node_id)
+            if not node:
+                recorded.append(False)
+                continue
+            update = {"last_heartbeat": timestamp}
+            if resources:
+                resources = resources.model_copy()
+                allocated = self.allocated.get(node_id)
+                if allocated:
+                    resources.cpu_count = allocated.get("cpu_count", resources.cpu_count)
+                    resources.memory_total = allocated.get(
+                        "memory_total", resources.memory_total
+                    )
+                    resources.memory_available = min(
+                        resources.memory_available, resources.memory_total
+                    )
+                update["resources"] = resources
+            if status == "online":
+                update["status"] = NodeStatus.ONLINE
+            node = self.node_records[node_id] = node.model_copy(update=update)
+
+            self.heartbeat_scores[node_id] = now
+            heapq.heappush(self.heartbeat_heap, (now, node_id))
+            self.heartbeat_log.append((now, node_id))
+            self.cluster_state.apply_heartbeat(
+                node_id, node.resources, node.status.value, timestamp
+            )
+            recorded.append(True)
+        return recorded
+
+    def pop_stale_nodes(self, cutoff: float) -> List[str]:
+        """Remove and return nodes whose last heartbeat is at or before cutoff"""
+        stale = []
+        heap = self.heartbeat_heap
+        while heap and heap[0][0] <= cutoff:
+            score, node_id = heapq.heappop(heap)
+            if self.heartbeat_scores.get(node_id) == score:
+                del self.heartbeat_scores[node_id]
+                stale.append(node_id)
+        return stale
+
+    def get_heartbeats_since(self, since: float) -> List[tuple]:
+        """Get (node_id, heartbeat time) for nodes that heartbeated after since"""
+        log = self.heartbeat_log
+        start = bisect_right(log, (since, "\uffff"))
+        # Older entries can never be requested again by a forward-moving reader
+        del log[:start]
+        return [
+            (node_id, score)
+            for score, node_id in log
+            if self.heartbeat_scores.get(node_id) == score
+        ]
+
+    def rebuild_heartbeat_index(self) -> int:
+        """Add live nodes missing from the heartbeat index"""
+        added = 0
+        for node in self.node_records.values():
+            if (
+                node.last_heartbeat
+                and node.status != NodeStatus.OFFLINE
+                and node.id not in self.heartbeat_scores
+            ):
+                score = node.last_heartbeat.timestamp()
+                self.heartbeat_scores[node.id] = score
+                heapq.heappush(self.heartbeat_heap, (score, node.id))
+                added += 1
+        return added
+
+    def store_pods(self, pods: list, enqueue: bool = False):
+        """Store several pods, keeping node usage counters in sync"""
+        for pod in pods:
+            self._assign(pod)
+            self.cluster_state.add_pod(pod)
+        if enqueue:
+            self.pending.extend(pod.id for pod in pods)
+        return True
+
+    def reserve_pods(self, pods: list) -> List[bool]:
+        """Store pods whose assigned node still has room for them"""
+        reserved = []
+        for pod in pods:
+            ok = not pod.node_id or self._node_fits(
+                pod.node_id, pod.resources.cpu_cores, pod.resources.memory_mb * 1048576
+            )
+            if ok:
+                self._assign(pod)
+                self.cluster_state.add_pod(pod)
+            reserved.append(ok)
+        return reserved
+
+    def get_node_usage(self, node_id: str) -> Dict[str, int]:
+        """Get CPU cores and memory bytes reserved by pods on a node"""
+        used_cpu, used_memory = self.usage.get(node_id, (0, 0))
+        return {"cpu": used_cpu, "memory": used_memory}
+
+    def get_nodes_usage(self, node_ids) -> Dict[str, Dict[str, int]]:
+        """Get reserved CPU cores and memory bytes for many nodes"""
+        return {node_id: self.get_node_usage(node_id) for node_id in node_ids}
+
+    def reconcile_node_usage(self) -> List[str]:
+        """Usage counters are only changed alongside pods, so they never drift"""
+        return []
+
+    def sync_node_usage(self, node_ids):
+        """Refresh the cached nodes and usage totals for the given nodes"""
+        for node_id in node_ids:
+            node = self.node_records.get(node_id)
+            if not node:
+                self.cluster_state.remove_node(node_id)
+                continue
+            self.cluster_state.upsert_node(node)
+            used_cpu, used_memory = self.usage.get(node_id, (0, 0))
+            self.cluster_state.set_used_resources(node_id, used_cpu, used_memory)
+
+    def pop_pending_pods(self, count: int) -> List[str]:
+        """Remove and return up to count pod IDs from the head of the pending queue"""
+        pending = self.pending
+        return [pending.popleft() for _ in range(min(count, len(pending)))]
+
+    def requeue_pending_pods(self, pod_ids: List[str], at_tail: bool = False):
+        """Put pod IDs back in the pending queue, keeping their order"""
+        if at_tail:
+            self.pending.extend(pod_ids)
+        else:
+            self.pending.extendleft(reversed(pod_ids))
+
+    def get_pending_head(self) -> Optional[str]:
+        """Get the pod ID at the head of the pending queue without removing it"""
+        return self.pending[0] if self.pending else None
+
+    def get_pending_count(self) -> int:
+        """Get the number of pod IDs in the pending queue"""
+        return len(self.pending)
+
+    def rebuild_pending_queue(self) -> int:
+        """Append pending pods that are missing from the pending queue"""
+        queued = set(self.pending)
+        missing = [
+            pod_id
+            for pod_id, pod in self.pod_records.items()
+            if pod.status == PodStatus.PENDING and pod_id not in queued
+        ]
+        self.pending.extend(missing)
+        return len(missing)
+
+    def get_scheduler_policy(self) -> Optional[str]:
+        """Get the cluster-wide scheduling policy name, if one has been set"""
+        return self.scheduler_policy
+
+    def set_scheduler_policy(self, name: str):
+        """Set the cluster-wide scheduling policy name"""
+        self.scheduler_policy = name
+
+    def get_pod(self, pod_id: str):
+        """Get pod information"""
+        pod = self.pod_records.get(pod_id)
+        return pod.model_copy() if pod else None
+
+    def get_pods(self, pod_ids, batch_size: Optional[int] = None) -> list:
+        """Get several pods by ID, skipping missing ones"""
+        return [
+            self.pod_records[pod_id].model_copy()
+            for pod_id in pod_ids
+            if pod_id in self.pod_records
+        ]
+
+    def get_all_pods(self, batch_size: Optional[int] = None) -> list:
+        """Get all pods"""
+        return [pod.model_copy() for pod in self.pod_records.values()]
+
+    def get_node_pods(self, node_id: str, batch_size: Optional[int] = None) -> list:
+        """Get all pods assigned to a specific node"""
+        return self.get_pods(self.node_pods.get(node_id, ()))
+
+    def delete_pod(self, pod_id: str) -> bool:
+        """Delete a pod, releasing its node's resources"""
+        pod = self.pod_records.get(pod_id)
+        if not pod:
+            return False
+        self._release(pod)
+        del self.pod_records[pod_id]
+        self.cluster_state.remove_pod(pod_id)
+        return True
+
+    def delete(self, key: str) -> bool:
+        """There are no raw keys in the memory store"""
+        return False
+
+    def _node_fits(self, node_id: str, cpu: int, memory: int) -> bool:
+        """Check a node's free capacity the same way the reservation script does"""
+        node = self.node_records.get(node_id)
+        if not node or node.status != NodeStatus.ONLINE:
+            return False
+        resources = node.resources
+        used_cpu, used_memory = self.usage.get(node_id, (0, 0))
+        free_cpu = resources.cpu_count - used_cpu
+        if resources.cpu_utilization is not None:
+            busy = int(resources.cpu_count * resources.cpu_utilization / 100)
+            free_cpu = min(free_cpu, resources.cpu_count - busy)
+        free_memory = min(
+            resources.memory_available, resources.memory_total - used_memory
+        )
+        return free_cpu >= cpu and free_memory >= memory
+
+    def _assign(self, pod: Pod):
+        """Store a pod, moving its reservation to its new node"""
+        previous = self.pod_records.get(pod.id)
+        previous_node_id = previous.node_id if previous else None
+        if previous:
+            self._release(previous)
+        self.pod_records[pod.id] = pod.model_copy()
+        if pod.node_id:
+            self.node_pods.setdefault(pod.node_id, {})[pod.id] = None
+            usage = self.usage.setdefault(pod.node_id, [0, 0])
+            usage[0] += pod.resources.cpu_cores
+            usage[1] += pod.resources.memory_mb * 1048576
+        if pod.node_id != previous_node_id:
+            for listener in self.pod_listeners:
+                listener(pod, previous_node_id)
+
+    def _release(self, pod: Pod):
+        """Release a stored pod's reservation on its node"""
+        if not pod.node_id:
+            return
+        self.node_pods.get(pod.node_id, {}).pop(pod.id, None)
+        usage = self.usage.get(pod.node_id)
+        if usage:
+            usage[0] -= pod.resources.cpu_cores
+            usage[1] -= pod.resources.memory_mb * 1048576
@@ -0,0 +1,135 @@
+"""
+Metrics Store Module
+
+Bounded time-series storage in Redis for node and host utilisation, kept
+alongside cluster state without an external time-series database.
+
+Key Features:
+- Raw ring buffer of the latest samples per series
+- Rolled-up 1m, 5m and 1h buckets with averages and maxima
+- Memory bounded by a fixed slot count per resolution
+- Range queries served from the finest resolution that covers them
+"""
+
+import time
+from typing import Dict, List, Optional
+from . import redis_scripts
+
+# (resolution seconds, slots): one day of minutes, a week of five-minute
+# buckets and a month of hours
+ROLLUPS = ((60, 1440), (300, 2016), (3600, 720))
+RAW_SAMPLES = 240
+# Ranges up to this many seconds are answered with raw samples
+RAW_RANGE = 600
+
+
+class MetricsStore:
+    """
+    Time-series store for CPU and memory utilisation percentages.
+
+    Each sample is written in one script call that appends it to the raw
+    ring buffer and folds it into the current bucket of every rollup.
+
+    Attributes:
+        rollups: (resolution, slots) pairs kept per series
+        raw_samples: Raw samples kept per series
+    """
+
+    def __init__(self, redis_connection, rollups=ROLLUPS, raw_samples=RAW_SAMPLES):
+        """
+        Initialize the metrics store.
+
+        Args:
+            redis_connection: Redis connection to store series in
+            rollups: (resolution, slots) pairs (default: 1m, 5m and 1h)
+            raw_samples: Raw samples kept per series (default: 240)
+        """
+        self.redis = redis_connection
+        self.rollups = rollups
+        self.raw_samples = raw_samples
+        self._record_script = self.redis.register_script(redis_scripts.RECORD_METRICS)
+
+    def record(
+        self,
+        series: str,
+        timestamp: float,
+        cpu_percent: Optional[float],
+        memory_percent: Optional[float],
+        pipe=None,
+    ):
+        """Record one sample, optionally as part of an existing pipeline"""
+        args = [
+            series,
+            timestamp,
+            "" if cpu_percent is None else round(cpu_percent, 2),
+            "" if memory_percent is None else round(memory_percent, 2),
+        ]
+        self._record_script(
+            args=args + self.retention_args(), client=pipe or self.redis
+        )
+
+    def retention_args(self) -> List:
+        """Get the raw sample count and rollup pairs the recording scripts take"""
+        args = [self.raw_samples]
+        for resolution, slots in self.rollups:
+            args.extend([resolution, slots])
+        return args
+
+    def query(self, series: str, range_seconds: float, now: Optional[float] = None) -> Dict:
+        """Get a series' points over the last range_seconds
+
+        Returns:
+            Dict with the resolution used (0 for raw samples) and the points,
+            oldest first
+        """
+        now = now or time.time()
+        since = now - range_seconds
+        if range_seconds <= RAW_RANGE:
+            return {"resolution": 0, "points": self._raw_points(series, since)}
+
+        resolution = next(
+            (res for res, slots in self.rollups if res * slots >= range_seconds),
+            self.rollups[-1][0],
+        )
+        buckets = self.redis.hvals(f"metrics:{series}:{resolution}")
+        points = []
+        for bucket in buckets:
+            start, samples, cpu_n, cpu_sum, cpu_max, mem_n, mem_sum, mem_max = (
+                float(field) for field in bucket.decode().split(",")
+            )
+            if start + resolution <= since:
+                continue
+            points.append(
+                {
+                    "timestamp": start,
+                    "samples": int(samples),
+                    "cpu_avg": cpu_sum / cpu_n if cpu_n else None,
+                    "cpu_max": cpu_max if cpu_n else None,
+                    "memory_avg": mem_sum / mem_n if mem_n else None,
+                    "memory_max": mem_max if mem_n else None,
+                }
+            )
+        points.sort(key=lambda point: point["timestamp"])
+        return {"resolution": resolution, "points": points}
+
+    def _raw_points(self, series: str, since: float) -> List[Dict]:
+        """Get raw samples newer than since, oldest first"""
+        points = []
+        for entry in self.redis.lrange(f"metrics:{series}:raw", 0, -1):
+            timestamp, cpu, memory = entry.decode().split(",")
+            if float(timestamp) < since:
+                break
+            cpu = float(cpu) if cpu else None
+            memory = float(memory) if memory else None
+            points.append(
+                {
+                    "timestamp": float(timestamp),
+                    "samples": 1,
+                    "cpu_avg": cpu,
+                    "cpu_max": cpu,
+                    "memory_avg": memory,
+                    "memory_max": memory,
+                }
+            )
+        points.reverse()
+        return points
@@ -0,0 +1,85 @@
+"""
+Node Backend Module
+
+Defines the interface NodeManager uses to start, stop and remove the
+processes that act as cluster nodes, so that real containers can be swapped
+for lighter stand-ins.
+
+Key Features:
+- Common lifecycle operations for node implementations
+- Parallel creation shared by all backends
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+
+class NodeBackend(ABC):
+    """
+    Base class for node implementations.
+
+    A backend starts something that behaves like a node (sends heartbeats
+    to the control plane) and returns its container_id, hostname and
+    ip_address. The container_id doubles as the node ID.
+    """
+
+    @abstractmethod
+    def create_node_container(
+        self, cpu_count: int, memory_mb: Optional[int] = None
+    ) -> Dict:
+        """Start a node with the given resources
+
+        Args:
+            cpu_count: Number of CPU cores to allocate
+            memory_mb: Memory limit in MB (optional)
+        """
+
+    @abstractmethod
+    def stop_node_container(self, container_id: str) -> bool:
+        """Stop a node"""
+
+    @abstractmethod
+    def restart_node_container(self, container_id: str) -> bool:
+        """Restart a node"""
+
+    @abstractmethod
+    def delete_node_container(self, container_id: str) -> bool:
+        """Stop a node and remove it"""
+
+    def create_node_containers(
+        self, specs: List[Tuple[int, Optional[int]]], max_workers: int = 8
+    ) -> List[Union[Dict, Exception]]:
+        """Create several nodes concurrently
+
+        Args:
+            specs: (cpu_count, memory_mb) for each node
+            max_workers: Maximum nodes started at the same time
+
+        Returns:
+            Container info for each spec, in order, or the exception raised
+            while creating it
+        """
+        return self.run_parallel(self.create_node_container, specs, max_workers)
+
+    def run_parallel(
+        self, func, args_list: List[Tuple], max_workers: int = 8
+    ) -> List[Union[object, Exception]]:
+        """Call func once per argument tuple on a thread pool
+
+        Returns:
+            Results in argument order, with exceptions returned in place
+        """
+
+        def call(args):
+            try:
+                return func(*args)
+            except Exception as e:
+                return e
+
+        if not args_list:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(args_list))
+        ) as executor:
+            return list(executor.map(call, args_list))
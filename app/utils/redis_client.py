@@ -8,17 +8,31 @@ Key Features:
 - Singleton Redis client instance
 - Node and pod state management
 - Resource allocation tracking
+- Atomic pod reservation via Lua scripts
 - Health metrics storage
+- Utilisation history for nodes and the host
 """
 
+import os
 import redis
 import time
 import json
 from datetime import datetime
 from typing import Optional, List, Dict
-from ..models.node import Node, NodeResources
+from ..models.node import Node, NodeResources, NodeStatus
 from ..models.host import HostResource
 from ..utils.host_client import HostResourceMonitor
+from ..core.cluster_state import ClusterStateCache
+from .metrics_store import MetricsStore
+from . import redis_scripts
+
+
+def _memory_percent(memory_total: int, memory_available: int) -> Optional[float]:
+    """Get the percentage of memory in use, or None if the total is unknown"""
+    if memory_total <= 0:
+        return None
+    used = memory_total - min(memory_available, memory_total)
+    return used / memory_total * 100
 
 
 class RedisClient:
@@ -37,20 +51,63 @@ class RedisClient:
             cls._instance = cls()
         return cls._instance
 
-    def __init__(self, host="localhost", port=6379, db=0):
-        if RedisClient._pool is None:
-            RedisClient._pool = redis.ConnectionPool(host=host, port=port, db=db)
-        self.redis = redis.Redis(connection_pool=RedisClient._pool)
+    def __init__(self, host="localhost", port=6379, db=0, connection=None):
+        """
+        Initialize the client.
+
+        Args:
+            host: Redis host for the shared connection pool
+            port: Redis port for the shared connection pool
+            db: Redis database for the shared connection pool
+            connection: Optional Redis connection to use instead of the pool,
+                such as a fakeredis instance for benchmarks
+        """
+        if connection is None:
+            if RedisClient._pool is None:
+                # Blocking pool: API worker threads wait for a free connection
+                # instead of failing when every connection is in use
+                RedisClient._pool = redis.BlockingConnectionPool(
+                    host=host,
+                    port=port,
+                    db=db,
+                    max_connections=int(os.environ.get("REDIS_MAX_CONNECTIONS", "64")),
+                )
+            connection = redis.Redis(connection_pool=RedisClient._pool)
+        self.redis = connection
+        self.cluster_state = ClusterStateCache()
+        self.metrics = MetricsStore(self.redis)
+        self._store_pods_script = self.redis.register_script(redis_scripts.STORE_PODS)
+        self._reserve_pods_script = self.redis.register_script(
+            redis_scripts.RESERVE_PODS
+        )
+        self._delete_pod_script = self.redis.register_script(redis_scripts.DELETE_POD)
+        self._reconcile_usage_script = self.redis.register_script(
+            redis_scripts.RECONCILE_NODE_USAGE
+        )
+        self._record_heartbeat_script = self.redis.register_script(
+            redis_scripts.RECORD_HEARTBEAT
+        )
 
     def get_connection(self):
         """Get the Redis connection"""
         return self.redis
 
+    def get_cluster_state(self) -> ClusterStateCache:
+        """Get the in-memory cluster state, loading it from Redis on first use"""
+        if not self.cluster_state.is_loaded():
+            self.refresh_cluster_state()
+        return self.cluster_state
+
+    def refresh_cluster_state(self):
+        """Reload the in-memory cluster state from Redis"""
+        self.cluster_state.load(self.get_all_nodes(), self.get_all_pods())
+
     def store_node(self, node: Node):
         """Store node information in Redis"""
         node_key = f"node:{node.id}"
         self.redis.set(node_key, node.model_dump_json())
         self.redis.sadd("nodes", node.id)
+        self.cluster_state.upsert_node(node)
         return True
 
     def get_node(self, node_id: str) -> Optional[Node]:
@@ -61,15 +118,36 @@ class RedisClient:
             return Node.model_validate_json(node_data)
         return None
 
-    def get_all_nodes(self) -> List[Node]:
+    def get_all_nodes(self, batch_size: Optional[int] = None) -> List[Node]:
         """Get all nodes from Redis"""
-        nodes = []
         node_ids = self.redis.smembers("nodes")
-        for node_id in node_ids:
-            node = self.get_node(node_id.decode())
-            if node:
-                nodes.append(node)
-        return nodes
+        return self._get_many("node", node_ids, Node, batch_size)
+
+    def delete_node(self, node_id: str) -> bool:
+        """Delete a node from Redis"""
+        self.redis.srem("nodes", node_id)
+        self.redis.zrem("nodes:heartbeats", node_id)
+        self.redis.delete(f"node:{node_id}:used", f"node:{node_id}:deleting")
+        deleted = bool(self.redis.delete(f"node:{node_id}"))
+        self.cluster_state.remove_node(node_id)
+        return deleted
+
+    def mark_node_deleting(self, node_id: str, deleting: bool = True, ttl: int = 300):
+        """Flag a node whose container is being removed, or clear the flag
+
+        Args:
+            node_id: Node to flag
+            deleting: Set the flag if True, clear it if False
+            ttl: Seconds before the flag expires on its own (default: 300)
+        """
+        if deleting:
+            self.redis.set(f"node:{node_id}:deleting", 1, ex=ttl)
+        else:
+            self.redis.delete(f"node:{node_id}:deleting")
+
+    def is_node_deleting(self, node_id: str) -> bool:
+        """Check if a node's container is being removed"""
+        return bool(self.redis.exists(f"node:{node_id}:deleting"))
 
     def store_allocated_resources(self, node_id: str, resources: Dict):
         """Store the originally allocated resources for a node"""
@@ -103,15 +181,288 @@ class RedisClient:
             return True
         return False
 
+    def record_heartbeat(
+        self,
+        node_id: str,
+        resources: Optional[NodeResources] = None,
+        status: str = "online",
+    ) -> bool:
+        """Record a node heartbeat in a single round trip
+
+        Returns:
+            False if the node is not registered
+        """
+        return self.record_heartbeats([(node_id, resources, status)])[0]
+
+    def record_heartbeats(self, heartbeats: list) -> List[bool]:
+        """Record many node heartbeats with one pipelined round trip
+
+        Each heartbeat is applied server-side by a Lua script, so the node
+        record is never parsed or re-serialized by the API. The script also
+        adds a utilisation sample from the stored resources to the node's
+        history, so liveness-only heartbeats keep the history of stable
+        nodes free of gaps.
+
+        Args:
+            heartbeats: (node_id, resources, status) tuples, where resources
+                is a NodeResources or None for a liveness-only heartbeat
+
+        Returns:
+            One flag per heartbeat, False for nodes that are not registered
+        """
+        timestamp = datetime.now()
+        retention_args = self.metrics.retention_args()
+        pipe = self.redis.pipeline(transaction=False)
+        for node_id, resources, status in heartbeats:
+            self._record_heartbeat_script(
+                args=[
+                    node_id,
+                    timestamp.isoformat(),
+                    status,
+                    resources.model_dump_json() if resources else "",
+                    timestamp.timestamp(),
+                    *retention_args,
+                ],
+                client=pipe,
+            )
+        results = pipe.execute()
+
+        recorded = []
+        for (node_id, _, _), result in zip(heartbeats, results):
+            if result:
+                cpu_count, memory_total, memory_available, status, utilization = result
+                resources = NodeResources(
+                    cpu_count=cpu_count,
+                    memory_total=memory_total,
+                    memory_available=memory_available,
+                    cpu_utilization=float(utilization) if utilization else None,
+                )
+                self.cluster_state.apply_heartbeat(
+                    node_id, resources, status.decode(), timestamp
+                )
+            recorded.append(bool(result))
+        return recorded
+
+    def pop_stale_nodes(self, cutoff: float) -> List[str]:
+        """Remove and return nodes whose last heartbeat is older than cutoff
+
+        Nodes re-enter the heartbeat index on their next heartbeat, so each
+        stale node is reported once.
+
+        Args:
+            cutoff: Epoch seconds; heartbeats at or before this are stale
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zrangebyscore("nodes:heartbeats", "-inf", cutoff)
+        pipe.zremrangebyscore("nodes:heartbeats", "-inf", cutoff)
+        stale, _ = pipe.execute()
+        return [node_id.decode() for node_id in stale]
+
+    def get_heartbeats_since(self, since: float) -> List[tuple]:
+        """Get (node_id, heartbeat time) for nodes that heartbeated after since"""
+        return [
+            (node_id.decode(), score)
+            for node_id, score in self.redis.zrangebyscore(
+                "nodes:heartbeats", f"({since}", "+inf", withscores=True
+            )
+        ]
+
+    def rebuild_heartbeat_index(self) -> int:
+        """Add live nodes missing from the heartbeat index
+
+        Covers nodes whose last heartbeat predates the index. Nodes already
+        in the index keep their score.
+
+        Returns:
+            Number of nodes added
+        """
+        scores = {
+            node.id: node.last_heartbeat.timestamp()
+            for node in self.get_all_nodes()
+            if node.last_heartbeat and node.status != NodeStatus.OFFLINE
+        }
+        if not scores:
+            return 0
+        return self.redis.zadd("nodes:heartbeats", scores, nx=True)
+
     def store_pod(self, pod):
         """Store pod information in Redis"""
-        pod_key = f"pod:{pod.id}"
-        self.redis.set(pod_key, pod.model_dump_json())
-        self.redis.sadd("pods", pod.id)
-        if pod.node_id:
-            self.redis.sadd(f"node:{pod.node_id}:pods", pod.id)
+        return self.store_pods([pod])
+
+    def store_pods(self, pods: list, enqueue: bool = False):
+        """Store several pods atomically, keeping node usage counters in sync
+
+        Args:
+            pods: Pods to store
+            enqueue: Also append the pods to the pending queue in the same
+                transaction
+        """
+        if enqueue:
+            pipe = self.redis.pipeline(transaction=True)
+            self._store_pods_script(args=self._pod_script_args(pods), client=pipe)
+            pipe.rpush("pods:pending", *[pod.id for pod in pods])
+            pipe.execute()
+        else:
+            self._store_pods_script(args=self._pod_script_args(pods))
+        for pod in pods:
+            self.cluster_state.add_pod(pod)
         return True
 
+    def reserve_pods(self, pods: list) -> List[bool]:
+        """Atomically store pods whose assigned node still has room for them
+
+        The capacity check and the write run as one Lua script, so concurrent
+        API workers cannot over-commit a node. Pods without a node are stored
+        unconditionally.
+
+        Returns:
+            One flag per pod, True if it was stored
+        """
+        results = self._reserve_pods_script(args=self._pod_script_args(pods))
+        reserved = [bool(result) for result in results]
+        for pod, ok in zip(pods, reserved):
+            if ok:
+                self.cluster_state.add_pod(pod)
+        return reserved
+
+    def get_node_usage(self, node_id: str) -> Dict[str, int]:
+        """Get CPU cores and memory bytes reserved by pods on a node"""
+        used_cpu, used_memory = self.redis.hmget(
+            f"node:{node_id}:used", "cpu", "memory"
+        )
+        return {"cpu": int(used_cpu or 0), "memory": int(used_memory or 0)}
+
+    def get_nodes_usage(self, node_ids) -> Dict[str, Dict[str, int]]:
+        """Get reserved CPU cores and memory bytes for many nodes in one round trip"""
+        node_ids = list(node_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        for node_id in node_ids:
+            pipe.hmget(f"node:{node_id}:used", "cpu", "memory")
+        return {
+            node_id: {"cpu": int(used_cpu or 0), "memory": int(used_memory or 0)}
+            for node_id, (used_cpu, used_memory) in zip(node_ids, pipe.execute())
+        }
+
+    def reconcile_node_usage(self) -> List[str]:
+        """Rebuild every node's usage counters from its assigned pods
+
+        Counters are maintained incrementally by the pod scripts; this repairs
+        drift from writes made outside them (or before they existed).
+
+        Returns:
+            IDs of nodes whose counters were corrected
+        """
+        node_ids = [node_id.decode() for node_id in self.redis.smembers("nodes")]
+        pipe = self.redis.pipeline(transaction=False)
+        for node_id in node_ids:
+            self._reconcile_usage_script(args=[node_id], client=pipe)
+        results = pipe.execute()
+
+        corrected = []
+        for node_id, (used_cpu, used_memory, changed) in zip(node_ids, results):
+            if changed:
+                corrected.append(node_id)
+                self.cluster_state.set_used_resources(node_id, used_cpu, used_memory)
+        return corrected
+
+    def sync_node_usage(self, node_ids):
+        """Refresh the cached nodes and usage totals for the given nodes"""
+        node_ids = list(node_ids)
+        pipe = self.redis.pipeline(transaction=False)
+        for node_id in node_ids:
+            pipe.get(f"node:{node_id}")
+            pipe.hmget(f"node:{node_id}:used", "cpu", "memory")
+        results = pipe.execute()
+
+        for node_id, node_data, (used_cpu, used_memory) in zip(
+            node_ids, results[::2], results[1::2]
+        ):
+            if not node_data:
+                self.cluster_state.remove_node(node_id)
+                continue
+            self.cluster_state.upsert_node(Node.model_validate_json(node_data))
+            self.cluster_state.set_used_resources(
+                node_id, int(used_cpu or 0), int(used_memory or 0)
+            )
+
+    def _pod_script_args(self, pods: list) -> list:
+        """Flatten pods into the argument groups expected by the pod scripts"""
+        args = []
+        for pod in pods:
+            args.extend(
+                [
+                    pod.id,
+                    pod.node_id or "",
+                    pod.resources.cpu_cores,
+                    pod.resources.memory_mb * 1024 * 1024,
+                    pod.model_dump_json(),
+                ]
+            )
+        return args
+
+    def pop_pending_pods(self, count: int) -> List[str]:
+        """Remove and return up to count pod IDs from the head of the pending queue"""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.lrange("pods:pending", 0, count - 1)
+        pipe.ltrim("pods:pending", count, -1)
+        pod_ids, _ = pipe.execute()
+        return [pod_id.decode() for pod_id in pod_ids]
+
+    def requeue_pending_pods(self, pod_ids: List[str], at_tail: bool = False):
+        """Put pod IDs back in the pending queue, keeping their order
+
+        Args:
+            pod_ids: Pod IDs to requeue
+            at_tail: Append to the tail instead of the head (default: False)
+        """
+        if not pod_ids:
+            return
+        if at_tail:
+            self.redis.rpush("pods:pending", *pod_ids)
+        else:
+            self.redis.lpush("pods:pending", *reversed(pod_ids))
+
+    def get_pending_head(self) -> Optional[str]:
+        """Get the pod ID at the head of the pending queue without removing it"""
+        pod_id = self.redis.lindex("pods:pending", 0)
+        return pod_id.decode() if pod_id else None
+
+    def get_pending_count(self) -> int:
+        """Get the number of pod IDs in the pending queue"""
+        return self.redis.llen("pods:pending")
+
+    def rebuild_pending_queue(self) -> int:
+        """Append pending pods that are missing from the pending queue
+
+        Covers pods whose IDs were popped by a process that stopped before
+        placing or requeueing them.
+
+        Returns:
+            Number of pods added to the queue
+        """
+        from ..models.pod import PodStatus
+
+        queued = {
+            pod_id.decode() for pod_id in self.redis.lrange("pods:pending", 0, -1)
+        }
+        missing = [
+            pod.id
+            for pod in self.get_all_pods()
+            if pod.status == PodStatus.PENDING and pod.id not in queued
+        ]
+        if missing:
+            self.redis.rpush("pods:pending", *missing)
+        return len(missing)
+
+    def get_scheduler_policy(self) -> Optional[str]:
+        """Get the cluster-wide scheduling policy name, if one has been set"""
+        policy = self.redis.get("scheduler:policy")
+        return policy.decode() if policy else None
+
+    def set_scheduler_policy(self, name: str):
+        """Set the cluster-wide scheduling policy name"""
+        self.redis.set("scheduler:policy", name)
+
     def get_pod(self, pod_id: str):
         """Get pod information from Redis"""
         pod_key = f"pod:{pod_id}"
@@ -122,35 +473,62 @@ class RedisClient:
             return Pod.model_validate_json(pod_data)
         return None
 
-    def get_all_pods(self) -> list:
+    def get_pods(self, pod_ids, batch_size: Optional[int] = None) -> list:
+        """Get several pods by ID in one round trip, skipping missing ones"""
+        from ..models.pod import Pod
+
+        return self._get_many("pod", pod_ids, Pod, batch_size)
+
+    def get_all_pods(self, batch_size: Optional[int] = None) -> list:
         """Get all pods from Redis"""
-        pods = []
+        from ..models.pod import Pod
+
         pod_ids = self.redis.smembers("pods")
-        for pod_id in pod_ids:
-            pod = self.get_pod(pod_id.decode())
-            if pod:
-                pods.append(pod)
-        return pods
+        return self._get_many("pod", pod_ids, Pod, batch_size)
 
-    def get_node_pods(self, node_id: str) -> list:
+    def get_node_pods(self, node_id: str, batch_size: Optional[int] = None) -> list:
         """Get all pods assigned to a specific node"""
-        pods = []
+        from ..models.pod import Pod
+
         pod_ids = self.redis.smembers(f"node:{node_id}:pods")
-        for pod_id in pod_ids:
-            pod = self.get_pod(pod_id.decode())
-            if pod:
-                pods.append(pod)
-        return pods
+        return self._get_many("pod", pod_ids, Pod, batch_size)
+
+    def _get_many(
+        self, prefix: str, ids, model, batch_size: Optional[int] = None
+    ) -> list:
+        """Fetch and deserialize many JSON records in a single round trip
+
+        Args:
+            prefix: Key prefix, records are stored under "{prefix}:{id}"
+            ids: Record IDs as returned by SMEMBERS
+            model: Pydantic model used to deserialize each record
+            batch_size: Maximum keys per MGET (default: all keys in one MGET)
+        """
+        keys = [
+            f"{prefix}:{_id.decode() if isinstance(_id, bytes) else _id}"
+            for _id in ids
+        ]
+        if not keys:
+            return []
+        batch_size = batch_size or len(keys)
+
+        # Split huge sets into several MGETs sent together in one pipeline
+        pipe = self.redis.pipeline(transaction=False)
+        for start in range(0, len(keys), batch_size):
+            pipe.mget(keys[start : start + batch_size])
+
+        return [
+            model.model_validate_json(value)
+            for values in pipe.execute()
+            for value in values
+            if value
+        ]
 
     def delete_pod(self, pod_id: str) -> bool:
         """Delete a pod from Redis"""
-        pod = self.get_pod(pod_id)
-        if not pod:
+        if not self._delete_pod_script(args=[pod_id]):
             return False
-        if pod.node_id:
-            self.redis.srem(f"node:{pod.node_id}:pods", pod_id)
-        self.redis.srem("pods", pod_id)
-        self.redis.delete(f"pod:{pod_id}")
+        self.cluster_state.remove_pod(pod_id)
         return True
 
     def delete(self, key: str) -> bool:
@@ -176,10 +554,18 @@ class RedisHostResourceMonitor:
     def update_host_resources(self):
         """Collect and store host resources in Redis"""
         metrics = self.host_resource_monitor.update_metrics()
-        self.redis_client.get_connection().set(
-            "host:resources", metrics.model_dump_json()
+        now = time.time()
+        pipe = self.redis_client.get_connection().pipeline(transaction=False)
+        pipe.set("host:resources", metrics.model_dump_json())
+        pipe.set("host:last_update", str(now))
+        self.redis_client.metrics.record(
+            "host",
+            now,
+            self.host_resource_monitor.cpu_utilization(),
+            _memory_percent(metrics.memory_total, metrics.memory_available),
+            pipe=pipe,
         )
-        self.redis_client.get_connection().set("host:last_update", str(time.time()))
+        pipe.execute()
         return metrics
 
     def update_limits(self, cpu_limit: float, memory_limit: float):
@@ -0,0 +1,266 @@
+"""
+Redis Scripts Module
+
+Lua scripts executed server-side by RedisClient so that multi-key updates
+to cluster state happen atomically.
+
+Key Features:
+- Atomic pod reservation with node capacity checks
+- Pod upserts and deletes that keep per-node usage counters in sync
+- Usage counter reconciliation
+- Single round trip heartbeat updates
+- Fixed-size time-series ring buffers with rolled-up buckets
+
+Pod scripts take their arguments as repeated groups of
+(pod_id, node_id, cpu_cores, memory_bytes, pod_json), with an empty
+node_id for pods that are not assigned to a node.
+"""
+
+# Helpers shared by the pod scripts. Usage counters live in the
+# "node:{id}:used" hash with "cpu" (cores) and "memory" (bytes) fields.
+_POD_HELPERS = """
+local function release_pod(pod_id)
+    local data = redis.call('GET', 'pod:' .. pod_id)
+    if not data then
+        return false
+    end
+    local pod = cjson.decode(data)
+    if type(pod.node_id) == 'string' then
+        local used_key = 'node:' .. pod.node_id .. ':used'
+        redis.call('SREM', 'node:' .. pod.node_id .. ':pods', pod_id)
+        redis.call('HINCRBY', used_key, 'cpu', -pod.resources.cpu_cores)
+        redis.call('HINCRBY', used_key, 'memory', -pod.resources.memory_mb * 1048576)
+    end
+    return true
+end
+
+local function assign_pod(pod_id, node_id, cpu, memory, pod_json)
+    redis.call('SET', 'pod:' .. pod_id, pod_json)
+    redis.call('SADD', 'pods', pod_id)
+    if node_id ~= '' then
+        local used_key = 'node:' .. node_id .. ':used'
+        redis.call('SADD', 'node:' .. node_id .. ':pods', pod_id)
+        redis.call('HINCRBY', used_key, 'cpu', cpu)
+        redis.call('HINCRBY', used_key, 'memory', memory)
+    end
+end
+"""
+
+# Store pods unconditionally, moving usage off any node they were on before.
+STORE_PODS = _POD_HELPERS + """
+for i = 1, #ARGV, 5 do
+    release_pod(ARGV[i])
+    assign_pod(ARGV[i], ARGV[i + 1], tonumber(ARGV[i + 2]), tonumber(ARGV[i + 3]), ARGV[i + 4])
+end
+return #ARGV / 5
+"""
+
+# Store each pod only if its node is online and still has room for it.
+# Returns one flag per pod: 1 if it was reserved, 0 if it was rejected.
+RESERVE_PODS = _POD_HELPERS + """
+local function node_fits(node_id, cpu, memory)
+    local data = redis.call('GET', 'node:' .. node_id)
+    if not data then
+        return false
+    end
+    local node = cjson.decode(data)
+    if node.status ~= 'online' then
+        return false
+    end
+    local used = redis.call('HMGET', 'node:' .. node_id .. ':used', 'cpu', 'memory')
+    local used_cpu = tonumber(used[1]) or 0
+    local used_memory = tonumber(used[2]) or 0
+    local free_memory = math.min(
+        node.resources.memory_available,
+        node.resources.memory_total - used_memory
+    )
+    local free_cpu = node.resources.cpu_count - used_cpu
+    local utilization = node.resources.cpu_utilization
+    if type(utilization) == 'number' then
+        local busy = math.floor(node.resources.cpu_count * utilization / 100)
+        free_cpu = math.min(free_cpu, node.resources.cpu_count - busy)
+    end
+    return free_cpu >= cpu and free_memory >= memory
+end
+
+local results = {}
+for i = 1, #ARGV, 5 do
+    local pod_id, node_id = ARGV[i], ARGV[i + 1]
+    local cpu, memory = tonumber(ARGV[i + 2]), tonumber(ARGV[i + 3])
+    local reserved = 0
+    if node_id == '' or node_fits(node_id, cpu, memory) then
+        release_pod(pod_id)
+        assign_pod(pod_id, node_id, cpu, memory, ARGV[i + 4])
+        reserved = 1
+    end
+    results[#results + 1] = reserved
+end
+return results
+"""
+
+# Delete a pod and release its usage. Returns 1 if the pod existed.
+DELETE_POD = _POD_HELPERS + """
+local pod_id = ARGV[1]
+if not release_pod(pod_id) then
+    return 0
+end
+redis.call('SREM', 'pods', pod_id)
+redis.call('DEL', 'pod:' .. pod_id)
+return 1
+"""
+
+# Recompute a node's usage counters from the pods assigned to it, dropping
+# pod IDs whose pod record no longer exists. Returns {cpu, memory, changed}.
+RECONCILE_NODE_USAGE = """
+local node_id = ARGV[1]
+local pods_key = 'node:' .. node_id .. ':pods'
+local used_key = 'node:' .. node_id .. ':used'
+local cpu, memory = 0, 0
+for _, pod_id in ipairs(redis.call('SMEMBERS', pods_key)) do
+    local data = redis.call('GET', 'pod:' .. pod_id)
+    if data then
+        local pod = cjson.decode(data)
+        cpu = cpu + pod.resources.cpu_cores
+        memory = memory + pod.resources.memory_mb * 1048576
+    else
+        redis.call('SREM', pods_key, pod_id)
+    end
+end
+local used = redis.call('HMGET', used_key, 'cpu', 'memory')
+local changed = 0
+if (tonumber(used[1]) or 0) ~= cpu or (tonumber(used[2]) or 0) ~= memory then
+    redis.call('HSET', used_key, 'cpu', cpu, 'memory', memory)
+    changed = 1
+end
+return {cpu, memory, changed}
+"""
+
+# Defines record_sample(series, timestamp, cpu, memory, first), where
+# timestamp, cpu and memory are strings (empty meaning "not measured") and
+# ARGV[first] onwards holds the raw sample count, then (resolution seconds,
+# slot count) pairs. Each rollup is a hash of slot -> "start,samples,
+# cpu_samples,cpu_sum,cpu_max,memory_samples,memory_sum,memory_max", where a
+# slot is reused once its bucket falls out of retention. Shared by
+# RECORD_METRICS and RECORD_HEARTBEAT.
+RECORD_SAMPLE_FUNCTION = """
+local function add(count, total, maximum, value)
+    if not value then
+        return count, total, maximum
+    end
+    if count == 0 or value > maximum then
+        maximum = value
+    end
+    return count + 1, total + value, maximum
+end
+
+local function record_sample(series, timestamp_text, cpu_text, memory_text, first)
+    local prefix = 'metrics:' .. series
+    local timestamp = tonumber(timestamp_text)
+    local cpu = tonumber(cpu_text)
+    local memory = tonumber(memory_text)
+    local raw_key = prefix .. ':raw'
+    redis.call('LPUSH', raw_key, timestamp_text .. ',' .. cpu_text .. ',' .. memory_text)
+    redis.call('LTRIM', raw_key, 0, tonumber(ARGV[first]) - 1)
+
+    local retention = 0
+    for i = first + 1, #ARGV, 2 do
+        local resolution, slots = tonumber(ARGV[i]), tonumber(ARGV[i + 1])
+        local key = prefix .. ':' .. ARGV[i]
+        local start = math.floor(timestamp / resolution) * resolution
+        local slot = tostring((start / resolution) % slots)
+
+        local b = {start, 0, 0, 0, 0, 0, 0, 0}
+        local bucket = redis.call('HGET', key, slot)
+        if bucket then
+            local fields = {}
+            for field in string.gmatch(bucket, '[^,]+') do
+                fields[#fields + 1] = tonumber(field)
+            end
+            if fields[1] == start then
+                b = fields
+            end
+        end
+        b[2] = b[2] + 1
+        b[3], b[4], b[5] = add(b[3], b[4], b[5], cpu)
+        b[6], b[7], b[8] = add(b[6], b[7], b[8], memory)
+        for j = 1, 8 do
+            b[j] = tostring(b[j])
+        end
+        redis.call('HSET', key, slot, table.concat(b, ','))
+        redis.call('EXPIRE', key, resolution * slots)
+        retention = math.max(retention, resolution * slots)
+    end
+    -- Series of deleted nodes disappear once nothing in them is retained
+    redis.call('EXPIRE', raw_key, retention)
+end
+"""
+
+# Apply a heartbeat to a node record in one round trip.
+# ARGV: node_id, last_heartbeat (ISO timestamp), status, resources JSON
+# (empty string for a liveness-only heartbeat), heartbeat epoch seconds,
+# then the metrics raw sample count and rollup pairs as for RECORD_METRICS.
+# Reported CPU count and total memory are replaced by the node's originally
+# allocated values, and the node's score in the "nodes:heartbeats" sorted set
+# is set to the heartbeat time. A utilisation sample from the stored
+# resources is added to the node's metrics, liveness-only heartbeats
+# included. Returns {cpu_count, memory_total, memory_available, status,
+# cpu_utilization as a string, empty if not measured}, or nil for an unknown
+# node.
+RECORD_HEARTBEAT = RECORD_SAMPLE_FUNCTION + """
+local node_key = 'node:' .. ARGV[1]
+local data = redis.call('GET', node_key)
+if not data then
+    return nil
+end
+local node = cjson.decode(data)
+if ARGV[4] ~= '' then
+    local resources = cjson.decode(ARGV[4])
+    local allocated = redis.call('GET', node_key .. ':allocated')
+    if allocated then
+        allocated = cjson.decode(allocated)
+        resources.cpu_count = allocated.cpu_count or resources.cpu_count
+        resources.memory_total = allocated.memory_total or resources.memory_total
+        if resources.memory_available > resources.memory_total then
+            resources.memory_available = resources.memory_total
+        end
+    end
+    node.resources = resources
+end
+node.last_heartbeat = ARGV[2]
+if ARGV[3] == 'online' then
+    node.status = 'online'
+end
+redis.call('SET', node_key, cjson.encode(node))
+redis.call('ZADD', 'nodes:heartbeats', ARGV[5], ARGV[1])
+-- Floats would be truncated in the reply, so utilisation goes back as a string
+local utilization = node.resources.cpu_utilization
+if type(utilization) ~= 'number' then
+    utilization = ''
+end
+local memory = ''
+local memory_total = node.resources.memory_total
+if memory_total > 0 then
+    local used = memory_total - math.min(node.resources.memory_available, memory_total)
+    memory = tostring(math.floor(used / memory_total * 10000 + 0.5) / 100)
+end
+local cpu = ''
+if utilization ~= '' then
+    cpu = tostring(math.floor(utilization * 100 + 0.5) / 100)
+end
+record_sample(ARGV[1], ARGV[5], cpu, memory, 6)
+return {
+    node.resources.cpu_count,
+    node.resources.memory_total,
+    node.resources.memory_available,
+    node.status,
+    tostring(utilization)
+}
+"""
+
+# ARGV: series, timestamp, cpu percent, memory percent, raw sample count,
+# then (resolution seconds, slot count) pairs. Empty values mean "not
+# measured".
+RECORD_METRICS = RECORD_SAMPLE_FUNCTION + """
+record_sample(ARGV[1], ARGV[2], ARGV[3], ARGV[4], 5)
+return 1
+"""
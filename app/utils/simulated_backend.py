@@ -0,0 +1,277 @@
+"""
+Simulated Backend Module
+
+In-process node backend for scale testing. Each node is an asyncio task
+that behaves like the heartbeat client in a node container, so thousands of
+nodes can run on one machine without Docker.
+
+Key Features:
+- Lightweight nodes as asyncio tasks on a dedicated event loop thread
+- Heartbeats handled by the control plane's heartbeat receiver, buffering
+  included, as if they arrived at the heartbeat endpoint
+- Liveness-only heartbeats unless resources moved, like the node client
+- Heartbeat interval and phase assigned by the control plane
+- Random and targeted failure injection
+
+Environment Variables:
+    SIM_HEARTBEAT_INTERVAL: Seconds between heartbeats until the control
+        plane assigns an interval (default: 30)
+    SIM_FAILURE_RATE: Chance per heartbeat that a node crashes (default: 0)
+    SIM_LATENCY: Mean heartbeat delivery latency in seconds (default: 0)
+    HEARTBEAT_DELTA_THRESHOLD: Fraction of total memory or of CPU that usage
+        must move by before resources are reported again (default: 0.05)
+    HEARTBEAT_FULL_REPORT_INTERVAL: Maximum seconds between full resource
+        reports (default: 300)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from ..core.heartbeat import HeartbeatReceiver
+from ..models.node import NodeResources
+from .node_backend import NodeBackend
+
+
+class SimulatedNode:
+    """
+    State of one simulated node.
+
+    Attributes:
+        container_id: Node ID, in place of a container ID
+        cpu_count: CPU cores reported by the node
+        memory_total: Memory in bytes reported by the node
+        memory_usage: Baseline fraction of memory in use
+        cpu_utilization: Baseline CPU utilisation percent
+        task: Heartbeat task while the node is running
+        failed: Whether the node crashed through failure injection
+        last_reported: Resources in the last acknowledged full report
+        last_full_report: Monotonic time of the last acknowledged full report
+    """
+
+    def __init__(self, container_id: str, cpu_count: int, memory_total: int):
+        self.container_id = container_id
+        self.cpu_count = cpu_count
+        self.memory_total = memory_total
+        self.memory_usage = random.uniform(0.1, 0.4)
+        self.cpu_utilization = random.uniform(0, 30)
+        self.task: Optional[asyncio.Task] = None
+        self.failed = False
+        self.last_reported: Optional[NodeResources] = None
+        self.last_full_report = 0.0
+
+
+class SimulatedNodeBackend(NodeBackend):
+    """
+    Singleton backend running simulated nodes on a background event loop.
+
+    Nodes hand their heartbeats to the heartbeat receiver off the loop, so
+    slow Redis calls never delay other nodes, and sleep until the slot it
+    assigns. Resources are only sent when they moved by delta_threshold or
+    full_report_interval elapsed, as the node client does.
+
+    Attributes:
+        heartbeat_interval: Seconds between heartbeats until the control
+            plane assigns an interval, and while a node is unknown to it
+        failure_rate: Chance per heartbeat that a node crashes
+        latency: Mean delay in seconds before a heartbeat is delivered
+        delta_threshold: Fraction of memory or CPU usage must move by to be
+            reported again
+        full_report_interval: Maximum seconds between full resource reports
+        nodes: Simulated nodes keyed by node ID
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(
+                heartbeat_interval=float(os.environ.get("SIM_HEARTBEAT_INTERVAL", "30")),
+                failure_rate=float(os.environ.get("SIM_FAILURE_RATE", "0")),
+                latency=float(os.environ.get("SIM_LATENCY", "0")),
+                delta_threshold=float(
+                    os.environ.get("HEARTBEAT_DELTA_THRESHOLD", "0.05")
+                ),
+                full_report_interval=float(
+                    os.environ.get("HEARTBEAT_FULL_REPORT_INTERVAL", "300")
+                ),
+            )
+        return cls._instance
+
+    def __init__(
+        self,
+        receiver: Optional[HeartbeatReceiver] = None,
+        heartbeat_interval: float = 30.0,
+        failure_rate: float = 0.0,
+        latency: float = 0.0,
+        delta_threshold: float = 0.05,
+        full_report_interval: float = 300.0,
+    ):
+        """
+        Initialize the simulated backend.
+
+        Args:
+            receiver: Optional HeartbeatReceiver instance
+            heartbeat_interval: Seconds between heartbeats until the control
+                plane assigns an interval (default: 30)
+            failure_rate: Chance per heartbeat of a crash (default: 0)
+            latency: Mean heartbeat delivery latency in seconds (default: 0)
+            delta_threshold: Fraction of memory or CPU usage must move by to
+                be reported again (default: 0.05)
+            full_report_interval: Maximum seconds between full resource
+                reports (default: 300)
+        """
+        self.receiver = receiver
+        self.heartbeat_interval = heartbeat_interval
+        self.failure_rate = failure_rate
+        self.latency = latency
+        self.delta_threshold = delta_threshold
+        self.full_report_interval = full_report_interval
+        self.nodes: Dict[str, SimulatedNode] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.lock = threading.Lock()
+
+    def create_node_container(
+        self, cpu_count: int, memory_mb: Optional[int] = None
+    ) -> Dict:
+        """Start a simulated node"""
+        suffix = str(uuid.uuid4())[:8]
+        node = SimulatedNode(
+            f"sim-{uuid.uuid4().hex}",
+            cpu_count,
+            memory_mb * 1024 * 1024 if memory_mb else 0,
+        )
+        with self.lock:
+            self.nodes[node.container_id] = node
+        self._call(self._start, node)
+        return {
+            "container_id": node.container_id,
+            "hostname": f"nexus-sim-{suffix}",
+            "ip_address": f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}",
+        }
+
+    def stop_node_container(self, container_id: str) -> bool:
+        """Stop a simulated node's heartbeats"""
+        node = self.nodes.get(container_id)
+        if not node:
+            return False
+        self._call(self._stop, node)
+        return True
+
+    def restart_node_container(self, container_id: str) -> bool:
+        """Restart a simulated node, clearing any injected failure"""
+        node = self.nodes.get(container_id)
+        if not node:
+            return False
+        node.failed = False
+        self._call(self._stop, node)
+        self._call(self._start, node)
+        return True
+
+    def delete_node_container(self, container_id: str) -> bool:
+        """Stop a simulated node and forget it"""
+        with self.lock:
+            node = self.nodes.pop(container_id, None)
+        if not node:
+            return False
+        self._call(self._stop, node)
+        return True
+
+    def fail_node(self, container_id: str) -> bool:
+        """Crash a node: it stops sending heartbeats without any notice"""
+        node = self.nodes.get(container_id)
+        if not node:
+            return False
+        node.failed = True
+        self._call(self._stop, node)
+        return True
+
+    def _call(self, func, *args):
+        """Run a function on the simulation loop, starting the loop if needed"""
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._run_loop, name="nexuscore-simulation", daemon=True
+                ).start()
+        self.loop.call_soon_threadsafe(func, *args)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _start(self, node: SimulatedNode):
+        if node.task is None or node.task.done():
+            node.task = self.loop.create_task(self._run_node(node))
+
+    def _stop(self, node: SimulatedNode):
+        if node.task is not None:
+            node.task.cancel()
+            node.task = None
+
+    async def _run_node(self, node: SimulatedNode):
+        """Send heartbeats like a node's heartbeat client"""
+        if self.receiver is None:
+            # Not built in get_instance, which runs when NodeManager is imported
+            self.receiver = HeartbeatReceiver.get_instance()
+        # Nodes created together should not all beat at the same moment
+        await asyncio.sleep(random.uniform(0, min(1.0, self.heartbeat_interval)))
+        while True:
+            if self.failure_rate and random.random() < self.failure_rate:
+                node.failed = True
+                node.task = None
+                logging.info(f"Simulated node {node.container_id} crashed")
+                return
+            if self.latency:
+                await asyncio.sleep(random.expovariate(1 / self.latency))
+            await asyncio.sleep(await self._heartbeat(node))
+
+    async def _heartbeat(self, node: SimulatedNode) -> float:
+        """Deliver one heartbeat and get the seconds until the next one"""
+        resources = self._sample(node)
+        report = resources if self._resources_changed(node, resources) else None
+        try:
+            slot = await self.loop.run_in_executor(
+                None, self.receiver.receive, node.container_id, report, "online"
+            )
+        except Exception as e:
+            logging.error(f"Error delivering simulated heartbeat: {str(e)}")
+            slot = None
+        if slot is None:
+            # Report full resources once the control plane accepts the node
+            node.last_reported = None
+            return self.heartbeat_interval
+        if report is not None:
+            node.last_reported = report
+            node.last_full_report = time.monotonic()
+        return slot[1]
+
+    def _resources_changed(self, node: SimulatedNode, resources: NodeResources) -> bool:
+        """Check if resources moved enough since the last report to resend them"""
+        last = node.last_reported
+        if (
+            last is None
+            or time.monotonic() - node.last_full_report >= self.full_report_interval
+        ):
+            return True
+        moved = abs(resources.cpu_utilization - last.cpu_utilization)
+        if moved > self.delta_threshold * 100:
+            return True
+        moved = abs(resources.memory_available - last.memory_available)
+        return moved > self.delta_threshold * max(resources.memory_total, 1)
+
+    def _sample(self, node: SimulatedNode) -> NodeResources:
+        """Generate the resources a node reports in a heartbeat"""
+        memory_usage = min(1.0, max(0.0, node.memory_usage + random.gauss(0, 0.02)))
+        return NodeResources(
+            cpu_count=node.cpu_count,
+            memory_total=node.memory_total,
+            memory_available=int(node.memory_total * (1 - memory_usage)),
+            cpu_utilization=round(
+                min(100.0, max(0.0, node.cpu_utilization + random.gauss(0, 2))), 1
+            ),
+        )
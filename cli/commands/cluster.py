@@ -55,17 +55,30 @@ def cluster_health(format: str):
             node_rows = []
 
             for node in nodes:
-                if node["status"] == "online":
+                # Suspect nodes missed heartbeats and are not scheduled on
+                if node["status"] in ("online", "suspect"):
                     memory_usage = (1 - (node["resources"]["memory_available"] / node["resources"]["memory_total"])) * 100
+                    status = node["status"]
+                    if status == "suspect":
+                        status = "suspect (not ready)"
                     node_rows.append([
                         node["id"][:8] + "...",
-                        node["status"],
+                        status,
                         f"{(node['resources']['cpu_count'])}",
                         f"{memory_usage:.1f}%"
                     ])
 
             print_table(node_headers, node_rows)
 
+            counts = {}
+            for node in nodes:
+                counts[node["status"]] = counts.get(node["status"], 0) + 1
+            click.echo(
+                f"\nNodes: {counts.get('online', 0)} online, "
+                f"{counts.get('suspect', 0)} suspect (not ready), "
+                f"{counts.get('offline', 0)} offline"
+            )
+
     except Exception as e:
         click.echo(click.style(f"❌ Error: {str(e)}", fg="red"))
 
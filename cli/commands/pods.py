@@ -27,9 +27,12 @@ def create_pod(name: str, cpu: int, memory: int):
             }
         )
         
-        if response.status_code == 201:
+        if response.status_code in (201, 202):
             pod = response.json()
-            click.echo(click.style("✅ Pod created successfully!", fg="green"))
+            if response.status_code == 201:
+                click.echo(click.style("✅ Pod created successfully!", fg="green"))
+            else:
+                click.echo(click.style("⏳ Pod queued until a node has room", fg="yellow"))
             click.echo(f"Pod ID: {pod['id']}")
             click.echo(f"Name: {pod['name']}")
             click.echo(f"Status: {pod['status']}")
@@ -5,7 +5,9 @@ This module implements the heartbeat system for NexusCore nodes. Each node in th
 runs this client to:
 
 1. Register itself with the main API service
-2. Periodically send resource metrics (CPU, memory) to the control plane
+2. Periodically send resource metrics (CPU, memory) to the control plane,
+   read from the container's cgroup v2 files when available so they reflect
+   the container's limits and usage rather than the host
 3. Report its operational status (online/offline)
 4. Handle graceful shutdown when the container is stopped
 
@@ -16,9 +18,12 @@ The heartbeat system is critical for:
 - Enabling graceful node decommissioning
 
 Communication Protocol:
-- RESTful API calls to the central NexusCore API
-- JSON payloads containing node metrics
+- RESTful API calls to the central NexusCore API over a keep-alive session
+- JSON payloads containing node metrics, omitted when they have not changed
+  much since the last report
 - Configurable heartbeat interval (default: 30s)
+- Exponential backoff with jitter while the API is unreachable
+- Interval and phase assigned by the API in each heartbeat response
 
 Usage:
     client = HeartbeatClient(node_id="node-123", api_url="http://api:8000")
@@ -28,10 +33,19 @@ Environment Variables:
     NODE_ID: Unique identifier for this node
     API_URL: URL of the NexusCore API service
     LOG_LEVEL: Logging verbosity (default: INFO)
+    HEARTBEAT_DELTA_THRESHOLD: Fraction of total memory that available memory
+        must move by before resources are reported again (default: 0.05)
+    HEARTBEAT_FULL_REPORT_INTERVAL: Maximum seconds between full resource
+        reports (default: 300)
+    HEARTBEAT_MAX_BACKOFF: Maximum seconds between retries while heartbeats
+        fail; kept below the API's heartbeat timeout (default: 240)
+    CGROUP_ROOT: Mount point of the container's cgroup v2 hierarchy
+        (default: /sys/fs/cgroup)
 """
 
 import time
 import os
+import random
 import requests
 import psutil
 import logging
@@ -45,6 +59,21 @@ class HeartbeatClient:
         self.api_url = api_url
         self.is_running = True
         self.container_id = self._get_container_id()  # Get container ID
+        self.session = requests.Session()  # Reuse one connection for all heartbeats
+        self.delta_threshold = float(
+            os.environ.get("HEARTBEAT_DELTA_THRESHOLD", "0.05")
+        )
+        self.full_report_interval = float(
+            os.environ.get("HEARTBEAT_FULL_REPORT_INTERVAL", "300")
+        )
+        self.max_backoff = float(os.environ.get("HEARTBEAT_MAX_BACKOFF", "240"))
+        self.last_reported = None  # Resources in the last acknowledged report
+        self.last_full_report = 0.0
+        self.registered = True  # False while the API does not know this node
+        self.next_delay = None  # Seconds until the next heartbeat, set by the API
+        self.assigned_interval = None  # Heartbeat interval, set by the API
+        self.cgroup_root = os.environ.get("CGROUP_ROOT", "/sys/fs/cgroup")
+        self.last_cpu_sample = None  # (monotonic time, cgroup CPU usage in usec)
 
         # Setup logging
         logging.basicConfig(
@@ -71,13 +100,87 @@ class HeartbeatClient:
         # Fallback to HOSTNAME or node_id if not in Docker
         return os.environ.get("HOSTNAME", self.node_id)
 
+    def _read_cgroup(self, name: str):
+        """Read a cgroup v2 interface file, or None if it does not exist"""
+        try:
+            with open(os.path.join(self.cgroup_root, name), "r") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _cgroup_cpu_limit(self):
+        """Get the container's CPU limit in cores from cpu.max, if it has one"""
+        cpu_max = self._read_cgroup("cpu.max")
+        if not cpu_max:
+            return None
+        quota, period = cpu_max.split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+
+    def _cgroup_memory(self):
+        """Get (total, available) memory in bytes from the memory controller
+
+        Reclaimable page cache (inactive_file) is counted as available, as
+        docker stats does.
+        """
+        current = self._read_cgroup("memory.current")
+        if current is None:
+            return None
+        limit = self._read_cgroup("memory.max")
+        total = (
+            psutil.virtual_memory().total
+            if limit in (None, "max")
+            else int(limit)
+        )
+
+        inactive_file = 0
+        for line in (self._read_cgroup("memory.stat") or "").splitlines():
+            key, value = line.split()
+            if key == "inactive_file":
+                inactive_file = int(value)
+                break
+        used = max(0, int(current) - inactive_file)
+        return total, max(0, total - used)
+
+    def _cgroup_cpu_utilization(self, cpu_limit: float):
+        """Get the percentage of the CPU limit used since the previous sample"""
+        cpu_stat = self._read_cgroup("cpu.stat")
+        if cpu_stat is None:
+            return None
+        usage_usec = 0
+        for line in cpu_stat.splitlines():
+            key, value = line.split()
+            if key == "usage_usec":
+                usage_usec = int(value)
+                break
+
+        now = time.monotonic()
+        previous, self.last_cpu_sample = self.last_cpu_sample, (now, usage_usec)
+        if previous is None or now <= previous[0]:
+            return None
+        busy = (usage_usec - previous[1]) / 1e6 / (now - previous[0])
+        return round(min(100.0, max(0.0, busy / cpu_limit * 100)), 1)
+
     def collect_metrics(self) -> dict:
-        """Collect current system metrics"""
+        """Collect current metrics, preferring cgroup figures over the host view"""
+        cpu_limit = self._cgroup_cpu_limit() or psutil.cpu_count()
+        cpu_utilization = self._cgroup_cpu_utilization(cpu_limit)
+        if cpu_utilization is None and self.last_cpu_sample is None:
+            # No cgroup v2 CPU accounting: fall back to host-wide utilisation
+            cpu_utilization = psutil.cpu_percent(interval=None)
+
+        memory = self._cgroup_memory()
+        if memory is None:
+            host_memory = psutil.virtual_memory()
+            memory = (host_memory.total, host_memory.available)
+
         metrics = {
             "resources": {
-                "cpu_count": psutil.cpu_count(),
-                "memory_total": psutil.virtual_memory().total,
-                "memory_available": psutil.virtual_memory().available,
+                "cpu_count": max(1, round(cpu_limit)),
+                "memory_total": memory[0],
+                "memory_available": memory[1],
+                "cpu_utilization": cpu_utilization,
             },
             "status": "online",
             "container_id": self.container_id,  # Include container ID in metrics
@@ -85,32 +188,67 @@ class HeartbeatClient:
         self.logger.debug(f"Collected metrics: {metrics}")
         return metrics
 
+    def _resources_changed(self, resources: dict) -> bool:
+        """Check if resources moved enough since the last report to resend them"""
+        last = self.last_reported
+        if last is None or time.monotonic() - self.last_full_report >= self.full_report_interval:
+            return True
+        if (
+            resources["cpu_count"] != last["cpu_count"]
+            or resources["memory_total"] != last["memory_total"]
+        ):
+            return True
+        if (resources["cpu_utilization"] is None) != (last["cpu_utilization"] is None):
+            return True
+        if (
+            resources["cpu_utilization"] is not None
+            and abs(resources["cpu_utilization"] - last["cpu_utilization"])
+            > self.delta_threshold * 100
+        ):
+            return True
+        moved = abs(resources["memory_available"] - last["memory_available"])
+        return moved > self.delta_threshold * max(resources["memory_total"], 1)
+
     def send_heartbeat(self) -> bool:
-        """Send a heartbeat with current metrics to the API"""
+        """Send a heartbeat to the API, with metrics only if they changed"""
         try:
             metrics = self.collect_metrics()
+            resources = metrics["resources"]
+            if not self._resources_changed(resources):
+                # Liveness only: the API keeps the last reported resources
+                metrics.pop("resources")
             self.logger.debug(
                 f"Sending heartbeat to {self.api_url}/health/heartbeat/{self.container_id}"
             )
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/health/heartbeat/{self.container_id}",  # Use container_id in URL
                 json=metrics,
                 timeout=5,
             )
 
+            self.registered = response.status_code != 404
             if response.status_code == 200:
-                self.logger.info(
+                if "resources" in metrics:
+                    self.last_reported = resources
+                    self.last_full_report = time.monotonic()
+                body = response.json()
+                self.next_delay = body.get("next_heartbeat_in")
+                self.assigned_interval = body.get("interval")
+                self.logger.debug(
                     f"Heartbeat sent successfully (Container: {self.container_id})"
                 )
                 return True
             else:
+                # Report full resources once the API accepts heartbeats again
+                self.last_reported = None
                 self.logger.error(
                     f"Failed to send heartbeat: Status {response.status_code} - {response.text}"
                 )
                 return False
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Network error sending heartbeat: {str(e)}")
+            self.last_reported = None
             return False
         except Exception as e:
             self.logger.error(f"Unexpected error sending heartbeat: {str(e)}")
@@ -129,22 +267,43 @@ class HeartbeatClient:
             try:
                 if self.send_heartbeat():
                     consecutive_failures = 0
+                    # Follow the slot assigned by the API, if it sent one
+                    time.sleep(
+                        self.next_delay if self.next_delay is not None else interval
+                    )
                 else:
                     consecutive_failures += 1
                     if consecutive_failures > 3:
                         self.logger.warning(
                             f"Multiple consecutive heartbeat failures: {consecutive_failures}"
                         )
-                time.sleep(interval)
+                    if self.registered:
+                        time.sleep(self._backoff_delay(consecutive_failures, interval))
+                    else:
+                        # Not registered yet (e.g. a warm container): keep polling
+                        time.sleep(interval)
             except Exception as e:
                 self.logger.error(f"Error in heartbeat loop: {str(e)}")
                 time.sleep(5)
 
+    def _backoff_delay(self, failures: int, interval: float) -> float:
+        """Get the retry delay after consecutive failures, with jitter
+
+        The first retry comes one to two heartbeat intervals (as assigned by
+        the API, if it sent one) after the failure, and the window doubles
+        with each further failure up to max_backoff. A struggling API thus
+        sees fewer heartbeats than usual, and a recovering one is not hit by
+        every node at the same moment.
+        """
+        base = self.assigned_interval or interval
+        delay = min(self.max_backoff, base * 2.0**failures)
+        return max(base, random.uniform(delay / 2, delay))
+
     def cleanup(self):
         """Cleanup resources before shutdown"""
         try:
             self.logger.info(f"Cleaning up resources for container {self.container_id}")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_url}/nodes/{self.container_id}/shutdown",  # Use container_id
                 timeout=5,
             )
@@ -0,0 +1,273 @@
+"""
+Scheduler Benchmark for NexusCore
+
+Generates a synthetic cluster and pod stream, then measures the scheduler
+in two phases:
+
+- schedule: Scheduler.schedule_pod decisions against the in-memory cluster
+  state, with each placement reserved in the cache
+- place: Scheduler.place_pods, including the atomic reservation in the
+  storage layer and pending-queue writes for pods that do not fit
+
+Reports throughput, p50/p99 latency and packing efficiency per scheduling
+policy. Runs are seeded, so results saved with --output serve as a baseline
+for later changes.
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import random
+import argparse
+from typing import Dict, List
+
+# Add project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.node_manager import NodeManager
+from app.core.policies import POLICIES
+from app.core.scheduler import Scheduler
+from app.core.simulator import VirtualNodeBackend
+from app.models.pod import Pod, PodResources, PodStatus
+from app.utils.memory_store import InMemoryRedisClient
+from app.utils.redis_client import RedisClient
+
+
+def parse_sizes(value: str) -> List[int]:
+    """Parse a comma-separated list of sizes; repeats weight a size"""
+    return [int(size) for size in value.split(",")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the NexusCore scheduler")
+    parser.add_argument("--nodes", type=int, default=1000, help="Nodes in the cluster")
+    parser.add_argument("--pods", type=int, default=3000, help="Pods to schedule")
+    parser.add_argument("--node-cpus", type=parse_sizes, default=[2, 4, 8, 16],
+                        help="Node CPU counts to draw from")
+    parser.add_argument("--node-memory-per-cpu", type=int, default=2048,
+                        help="Node memory in MB per CPU")
+    parser.add_argument("--pod-cpus", type=parse_sizes, default=[1, 1, 1, 2, 2, 4],
+                        help="Pod CPU requests to draw from")
+    parser.add_argument("--pod-memory-per-cpu", type=parse_sizes,
+                        default=[256, 512, 1024, 2048],
+                        help="Pod memory in MB per requested CPU to draw from")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Pods per place_pods call in the place phase")
+    parser.add_argument("--phase", choices=["schedule", "place", "both"], default="both")
+    parser.add_argument("--policy", default="best-fit",
+                        help=f"Scheduling policy, comma-separated list, or 'all' "
+                             f"({', '.join(POLICIES)})")
+    parser.add_argument("--store", choices=["memory", "fakeredis", "redis"], default="memory",
+                        help="Storage layer: in-process store, fakeredis, or a Redis server")
+    parser.add_argument("--redis-host", default="localhost")
+    parser.add_argument("--redis-port", type=int, default=6379)
+    parser.add_argument("--redis-db", type=int, default=15,
+                        help="Database to benchmark in; it is flushed between runs")
+    parser.add_argument("--flush", action="store_true",
+                        help="Allow flushing a non-empty Redis database")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", help="Save results as JSON to this file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def generate_nodes(args, rng: random.Random) -> List[tuple]:
+    """Generate (cpu_count, memory_mb) for each node"""
+    specs = []
+    for _ in range(args.nodes):
+        cpu_count = rng.choice(args.node_cpus)
+        specs.append((cpu_count, cpu_count * args.node_memory_per_cpu))
+    return specs
+
+
+def generate_pods(args, rng: random.Random) -> List[PodResources]:
+    """Generate the resource requests of the pod stream"""
+    requests = []
+    for _ in range(args.pods):
+        cpu_cores = rng.choice(args.pod_cpus)
+        requests.append(
+            PodResources(
+                cpu_cores=cpu_cores,
+                memory_mb=cpu_cores * rng.choice(args.pod_memory_per_cpu),
+            )
+        )
+    return requests
+
+
+def make_store(args):
+    """Create an empty storage layer for one run"""
+    if args.store == "memory":
+        return InMemoryRedisClient()
+
+    if args.store == "fakeredis":
+        try:
+            import fakeredis
+        except ImportError:
+            sys.exit("--store fakeredis needs the fakeredis and lupa packages")
+        return RedisClient(connection=fakeredis.FakeRedis())
+
+    # main() has checked the database was empty or --flush was given, and
+    # the previous run's data is always cleared
+    connection = redis_connection(args)
+    connection.flushdb()
+    return RedisClient(connection=connection)
+
+
+def redis_connection(args):
+    """Connect to the Redis database the benchmark runs in"""
+    import redis
+
+    return redis.Redis(host=args.redis_host, port=args.redis_port, db=args.redis_db)
+
+
+def build_cluster(args, node_specs: List[tuple], policy: str):
+    """Register the synthetic nodes and create a scheduler over them"""
+    store = make_store(args)
+    node_manager = NodeManager(redis_client=store, backend=VirtualNodeBackend())
+    for cpu_count, memory_mb in node_specs:
+        node_manager.create_node_container(cpu_count, memory_mb)
+    scheduler = Scheduler(redis_client=store, node_manager=node_manager, policy=policy)
+    return store, scheduler
+
+
+def make_pods(requests: List[PodResources], policy: str) -> List[Pod]:
+    return [
+        Pod(id=f"bench-{policy}-{i}", name=f"bench-{i}", resources=resources)
+        for i, resources in enumerate(requests)
+    ]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def packing(store) -> Dict[str, float]:
+    """Measure how tightly placed pods fill the nodes they landed on"""
+    cluster_state = store.get_cluster_state()
+    used_nodes = [
+        node for node in cluster_state.nodes.values()
+        if cluster_state.pod_counts.get(node.id)
+    ]
+    used_cpu = sum(cluster_state.used_cpu.get(node.id, 0) for node in used_nodes)
+    used_memory = sum(cluster_state.used_memory.get(node.id, 0) for node in used_nodes)
+    cpu_capacity = sum(node.resources.cpu_count for node in used_nodes)
+    memory_capacity = sum(node.resources.memory_total for node in used_nodes)
+    return {
+        "nodes_used": len(used_nodes),
+        "cpu_packing": used_cpu / cpu_capacity * 100 if cpu_capacity else 0.0,
+        "memory_packing": used_memory / memory_capacity * 100 if memory_capacity else 0.0,
+    }
+
+
+def summarize(latencies: List[float], pods: List[Pod], elapsed: float, store) -> Dict:
+    latencies = sorted(latencies)
+    placed = sum(1 for pod in pods if pod.status == PodStatus.RUNNING)
+    return {
+        "pods": len(pods),
+        "placed": placed,
+        "throughput": len(pods) / elapsed if elapsed else 0.0,
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "max_us": latencies[-1] * 1e6 if latencies else 0.0,
+        **packing(store),
+    }
+
+
+def run_schedule_phase(args, node_specs, requests, policy: str) -> Dict:
+    """Time scheduling decisions alone, reserving each placement in the cache"""
+    store, scheduler = build_cluster(args, node_specs, policy)
+    cluster_state = store.get_cluster_state()
+    pods = make_pods(requests, policy)
+
+    latencies = []
+    timer = time.perf_counter
+    started = timer()
+    for pod in pods:
+        before = timer()
+        node = scheduler.schedule_pod(pod)
+        latencies.append(timer() - before)
+        if node:
+            pod.node_id = node.id
+            pod.status = PodStatus.RUNNING
+            cluster_state.add_pod(pod)
+    elapsed = timer() - started
+    return summarize(latencies, pods, elapsed, store)
+
+
+def run_place_phase(args, node_specs, requests, policy: str) -> Dict:
+    """Time placement including the reservation in the storage layer"""
+    store, scheduler = build_cluster(args, node_specs, policy)
+    pods = make_pods(requests, policy)
+
+    latencies = []
+    timer = time.perf_counter
+    started = timer()
+    for i in range(0, len(pods), args.batch_size):
+        before = timer()
+        scheduler.place_pods(pods[i : i + args.batch_size])
+        latencies.append(timer() - before)
+    elapsed = timer() - started
+    result = summarize(latencies, pods, elapsed, store)
+    result["batch_size"] = args.batch_size
+    return result
+
+
+def print_result(phase: str, result: Dict):
+    print(f"  {phase:<9} {result['throughput']:>10.0f} pods/s  "
+          f"p50 {result['p50_us']:>8.1f}us  p99 {result['p99_us']:>9.1f}us  "
+          f"placed {result['placed']}/{result['pods']}  "
+          f"nodes {result['nodes_used']}  "
+          f"packing cpu {result['cpu_packing']:.1f}% mem {result['memory_packing']:.1f}%")
+
+
+def main():
+    args = parse_args()
+    if args.batch_size < 1:
+        sys.exit("--batch-size must be at least 1")
+    policies = list(POLICIES) if args.policy == "all" else args.policy.split(",")
+    for policy in policies:
+        if policy not in POLICIES:
+            sys.exit(f"Unknown scheduling policy '{policy}'")
+
+    if args.store == "redis" and not args.flush and redis_connection(args).dbsize():
+        sys.exit(
+            f"Redis database {args.redis_db} is not empty; pass --flush to clear it "
+            f"or choose another --redis-db"
+        )
+
+    rng = random.Random(args.seed)
+    node_specs = generate_nodes(args, rng)
+    requests = generate_pods(args, rng)
+    phases = ["schedule", "place"] if args.phase == "both" else [args.phase]
+    runners = {"schedule": run_schedule_phase, "place": run_place_phase}
+
+    results = {
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "json", "flush")
+        },
+        "results": {},
+    }
+    for policy in policies:
+        results["results"][policy] = {}
+        if not args.json:
+            print(f"== {policy} ({args.nodes} nodes, {args.pods} pods, {args.store} store) ==")
+        for phase in phases:
+            result = runners[phase](args, node_specs, requests, policy)
+            results["results"][policy][phase] = result
+            if not args.json:
+                print_result(phase, result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -51,6 +51,31 @@ def create_node(cpu_count: int, memory_mb: int) -> Dict:
         logging.error(f"Error creating node: {str(e)}")
         return None
 
+def create_nodes_batch(node_specs: List[Dict]) -> List[Dict]:
+    """Create many nodes with a single batch request"""
+    try:
+        response = requests.post(
+            f"{API_BASE_URL}/nodes/batch",
+            json={
+                "nodes": [
+                    {"cpu_count": spec["cpu"], "memory_mb": spec["memory"]}
+                    for spec in node_specs
+                ]
+            }
+        )
+        if response.status_code == 201:
+            result = response.json()
+            for error in result["errors"]:
+                logging.error(f"Failed to create node: {error}")
+            logging.info(f"Created {len(result['nodes'])} nodes in one batch")
+            return result["nodes"]
+        else:
+            logging.error(f"Failed to create node batch: {response.text}")
+            return []
+    except Exception as e:
+        logging.error(f"Error creating node batch: {str(e)}")
+        return []
+
 def create_pod(name: str, cpu_cores: int, memory_mb: int) -> Dict:
     """Create a new pod with specified resource requirements"""
     try:
@@ -64,9 +89,9 @@ def create_pod(name: str, cpu_cores: int, memory_mb: int) -> Dict:
                 }
             }
         )
-        if response.status_code == 201:
+        if response.status_code in (201, 202):
             pod_data = response.json()
-            logging.info(f"Created pod {pod_data['id']} with {cpu_cores} cores and {memory_mb}MB memory")
+            logging.info(f"Created pod {pod_data['id']} with {cpu_cores} cores and {memory_mb}MB memory ({pod_data['status']})")
             return pod_data
         else:
             logging.error(f"Failed to create pod: {response.text}")
@@ -75,6 +100,36 @@ def create_pod(name: str, cpu_cores: int, memory_mb: int) -> Dict:
         logging.error(f"Error creating pod: {str(e)}")
         return None
 
+def create_pods_batch(pod_specs: List[Dict]) -> List[Dict]:
+    """Create many pods with a single batch request"""
+    try:
+        response = requests.post(
+            f"{API_BASE_URL}/pods/batch",
+            json={
+                "pods": [
+                    {
+                        "name": spec["name"],
+                        "resources": {
+                            "cpu_cores": spec["cpu"],
+                            "memory_mb": spec["memory"]
+                        }
+                    }
+                    for spec in pod_specs
+                ]
+            }
+        )
+        if response.status_code == 201:
+            pods = response.json()
+            scheduled = [pod for pod in pods if pod["status"] == "running"]
+            logging.info(f"Created {len(pods)} pods in one batch, {len(scheduled)} scheduled")
+            return pods
+        else:
+            logging.error(f"Failed to create pod batch: {response.text}")
+            return []
+    except Exception as e:
+        logging.error(f"Error creating pod batch: {str(e)}")
+        return []
+
 def delete_all_nodes() -> None:
     """Delete all nodes in the cluster"""
     try:
@@ -138,29 +193,19 @@ def main():
     # Create nodes
     global created_nodes
     logging.info("Starting node creation...")
-    for i in range(5):
-        config = random.choice(node_configs)
-        node = create_node(config["cpu"], config["memory"])
-        if node:
-            created_nodes.append(node)
-        time.sleep(2)  # Delay between node creation
+    node_specs = [random.choice(node_configs) for _ in range(5)]
+    created_nodes.extend(create_nodes_batch(node_specs))
 
     logging.info(f"Created {len(created_nodes)} nodes")
     time.sleep(10)  # Wait for nodes to initialize
 
     # Create pods
-    pods = []
     logging.info("Starting pod creation...")
+    pod_specs = []
     for i in range(10):  # Create more pods than nodes to test scheduling
         config = random.choice(pod_configs)
-        pod = create_pod(
-            f"test-pod-{i}",
-            config["cpu"],
-            config["memory"]
-        )
-        if pod:
-            pods.append(pod)
-        time.sleep(1)  # Delay between pod creation
+        pod_specs.append({"name": f"test-pod-{i}", **config})
+    pods = create_pods_batch(pod_specs)
 
     logging.info(f"Created {len(pods)} pods")
 
@@ -0,0 +1,173 @@
+"""
+Memory Store Parity Tests
+
+InMemoryRedisClient re-implements the Lua scripts behind RedisClient for the
+simulator. These tests replay one operation sequence through both stores,
+the Redis one backed by fakeredis, and check that pods, usage counters,
+node records, the pending queue and the heartbeat index stay identical.
+
+Requires the fakeredis and lupa packages.
+"""
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.core.node_manager import NodeManager
+from app.core.simulator import VirtualNodeBackend
+from app.models.node import NodeResources, NodeStatus
+from app.models.pod import Pod, PodResources, PodStatus
+from app.utils.memory_store import InMemoryRedisClient
+from app.utils.redis_client import RedisClient
+
+NODE_IDS = ["vnode-00001", "vnode-00002", "vnode-00003"]
+POD_IDS = [f"pod-{i}" for i in range(9)]
+GIB = 1024 * 1024 * 1024
+
+
+def make_pod(index, cpu_cores, memory_mb, node_id=None):
+    return Pod(
+        id=f"pod-{index}",
+        name=f"pod-{index}",
+        resources=PodResources(cpu_cores=cpu_cores, memory_mb=memory_mb),
+        node_id=node_id,
+        status=PodStatus.RUNNING if node_id else PodStatus.PENDING,
+    )
+
+
+def snapshot(store):
+    """Capture everything the simulator reads back from a store"""
+    nodes = {}
+    for node_id in NODE_IDS:
+        node = store.get_node(node_id)
+        nodes[node_id] = node and (node.status, node.resources.model_dump())
+    return {
+        "nodes": nodes,
+        "pods": {
+            pod.id: (pod.node_id, pod.status) for pod in store.get_pods(POD_IDS)
+        },
+        "node_pods": {
+            node_id: sorted(pod.id for pod in store.get_node_pods(node_id))
+            for node_id in NODE_IDS
+        },
+        "usage": store.get_nodes_usage(NODE_IDS),
+        "pending": (store.get_pending_count(), store.get_pending_head()),
+        "heartbeats": sorted(node_id for node_id, _ in store.get_heartbeats_since(0)),
+    }
+
+
+def replay(store):
+    """Run the operation sequence, returning each step's result and state"""
+    steps = []
+
+    def step(name, result=None):
+        steps.append((name, result, snapshot(store)))
+
+    node_manager = NodeManager(redis_client=store, backend=VirtualNodeBackend())
+    for cpu_count, memory_mb in [(2, 1024), (4, 2048), (1, 512)]:
+        node_manager.create_node_container(cpu_count, memory_mb)
+    store.record_heartbeats([(node_id, None, "online") for node_id in NODE_IDS])
+    step("register")
+
+    step(
+        "store and queue pending pods",
+        store.store_pods([make_pod(0, 1, 256), make_pod(1, 8, 256)], enqueue=True),
+    )
+    step(
+        "store a running pod",
+        store.store_pods([make_pod(2, 1, 256, "vnode-00001")]),
+    )
+
+    step(
+        "reserve against pod usage",
+        store.reserve_pods(
+            [
+                make_pod(3, 1, 256, "vnode-00001"),
+                make_pod(4, 1, 256, "vnode-00001"),  # CPU exhausted
+                make_pod(5, 1, 1024, "vnode-00003"),  # memory exceeds the node
+                make_pod(6, 1, 128),  # unassigned pods are always accepted
+            ]
+        ),
+    )
+
+    step(
+        "heartbeats with resources, liveness and unknown nodes",
+        store.record_heartbeats(
+            [
+                (
+                    "vnode-00002",
+                    NodeResources(
+                        cpu_count=16,  # clamped to the allocation
+                        memory_total=4 * GIB,
+                        memory_available=4 * GIB,  # clamped to the allocation
+                        cpu_utilization=80.0,
+                    ),
+                    "online",
+                ),
+                ("vnode-00001", None, "online"),
+                ("vnode-99999", None, "online"),
+            ]
+        ),
+    )
+
+    step(
+        "reserve against reported utilisation",
+        store.reserve_pods(
+            [
+                make_pod(7, 2, 256, "vnode-00002"),  # only one core is idle
+                make_pod(8, 1, 256, "vnode-00002"),
+            ]
+        ),
+    )
+
+    offline = store.get_node("vnode-00003")
+    offline.status = NodeStatus.OFFLINE
+    store.store_node(offline)
+    step(
+        "reserve on an offline node",
+        store.reserve_pods([make_pod(5, 1, 128, "vnode-00003")]),
+    )
+    step(
+        "non-online heartbeat keeps the node offline",
+        store.record_heartbeats([("vnode-00003", None, "offline")]),
+    )
+    step(
+        "online heartbeat brings the node back",
+        store.record_heartbeats([("vnode-00003", None, "online")]),
+    )
+
+    step(
+        "move a pod between nodes",
+        store.store_pods([make_pod(2, 1, 256, "vnode-00002")]),
+    )
+    step("delete a pod", store.delete_pod("pod-3"))
+    step("delete a missing pod", store.delete_pod("pod-3"))
+
+    popped = store.pop_pending_pods(2)
+    step("pop pending pods", popped)
+    store.requeue_pending_pods(popped[:1])
+    store.requeue_pending_pods(popped[1:], at_tail=True)
+    step("requeue pending pods")
+
+    step("delete a node", store.delete_node("vnode-00003"))
+    step("pop stale nodes", sorted(store.pop_stale_nodes(float("inf"))))
+    step(
+        "heartbeat after the index was emptied",
+        store.record_heartbeats([("vnode-00001", None, "online")]),
+    )
+    return steps
+
+
+def test_memory_store_matches_redis_scripts():
+    redis_steps = replay(RedisClient(connection=fakeredis.FakeRedis()))
+    memory_steps = replay(InMemoryRedisClient())
+
+    assert [name for name, _, _ in memory_steps] == [
+        name for name, _, _ in redis_steps
+    ]
+    for (name, redis_result, redis_state), (_, memory_result, memory_state) in zip(
+        redis_steps, memory_steps
+    ):
+        assert memory_result == redis_result, name
+        assert memory_state == redis_state, name